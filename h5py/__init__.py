@@ -42,13 +42,15 @@ _register_lzf()
 
 from . import h5a, h5d, h5ds, h5f, h5fd, h5g, h5r, h5s, h5t, h5p, h5z
 
-from ._hl import filters
+from ._hl import filters, filepool, index
 from ._hl.base import is_hdf5, HLObject, Empty
 from ._hl.files import File
 from ._hl.group import Group, SoftLink, ExternalLink, HardLink
 from ._hl.dataset import Dataset
 from ._hl.datatype import Datatype
 from ._hl.attrs import AttributeManager
+from ._hl.filepool import FilePool, open_pooled
+from ._hl.vds import VirtualSource, VirtualLayout
 
 from .h5 import get_config
 from .h5r import Reference, RegionReference
@@ -16,7 +16,8 @@
 from h5r cimport Reference, RegionReference, hobj_ref_t, hdset_reg_ref_t
 from h5t cimport H5PY_OBJ, typewrap, py_create, TypeID
 cimport numpy as np
-from libc.stdlib cimport realloc
+from libc.stdlib cimport realloc, calloc
+from libc.string cimport memcmp
 
 # Initialization
 np.import_array()
@@ -152,6 +153,140 @@ cdef herr_t init_generic(hid_t src, hid_t dst, void** priv) except -1:
 
     return 0
 
+# =============================================================================
+# String interning
+#
+# While interning is switched on, vlen strings read with the same contents
+# are all converted to the same Python object.  Strings seen so far live in
+# an open-addressing hash table keyed on the C string and its character set
+# (ASCII strings become bytes, UTF-8 ones unicode), which holds a copy of
+# each string and a reference to its object.
+
+ctypedef struct intern_entry_t:
+    size_t hash
+    size_t length
+    int cset
+    char* key       # NULL for an empty slot
+    PyObject* obj
+
+cdef intern_entry_t* intern_table = NULL
+cdef size_t intern_slots = 0     # Always a power of 2
+cdef size_t intern_used = 0
+cdef int intern_depth = 0
+
+cdef size_t hash_string(char* s, int cset, size_t* length):
+    # FNV-1a over the character set and string, also measuring the string
+    cdef size_t h = (2166136261u ^ <unsigned char>cset) * 16777619u
+    cdef size_t n = 0
+    if s != NULL:
+        while s[n] != 0:
+            h = (h ^ <unsigned char>s[n]) * 16777619u
+            n += 1
+    length[0] = n
+    return h
+
+cdef intern_entry_t* intern_find(char* s, int cset, size_t length, size_t h):
+    # Slot holding this string, or the empty slot where it belongs
+    cdef size_t mask = intern_slots - 1
+    cdef size_t i = h & mask
+    cdef intern_entry_t* entry
+    while True:
+        entry = intern_table + i
+        if entry.key == NULL:
+            return entry
+        if entry.hash == h and entry.length == length and entry.cset == cset and \
+           (length == 0 or memcmp(entry.key, s, length) == 0):
+            return entry
+        i = (i + 1) & mask
+
+cdef int intern_grow() except -1:
+    cdef intern_entry_t* old_table = intern_table
+    cdef size_t old_slots = intern_slots
+    cdef size_t i
+    cdef intern_entry_t* entry
+    global intern_table, intern_slots
+
+    intern_slots = old_slots*2 if old_slots else 256
+    intern_table = <intern_entry_t*>calloc(intern_slots, sizeof(intern_entry_t))
+    if intern_table == NULL:
+        intern_table = old_table
+        intern_slots = old_slots
+        raise MemoryError("Failed to allocate string table")
+
+    for i from 0 <= i < old_slots:
+        if old_table[i].key != NULL:
+            entry = intern_find(old_table[i].key, old_table[i].cset,
+                                old_table[i].length, old_table[i].hash)
+            entry[0] = old_table[i]
+    free(old_table)
+    return 0
+
+cdef PyObject* intern_vlen2str(char* s, int cset) except NULL:
+    # New reference to the (shared) object for a C string
+    cdef size_t length
+    cdef size_t h = hash_string(s, cset, &length)
+    cdef intern_entry_t* entry
+    cdef PyObject* obj
+    global intern_used
+
+    if (intern_used + 1)*2 > intern_slots:
+        intern_grow()
+
+    entry = intern_find(s, cset, length, h)
+    if entry.key != NULL:
+        Py_INCREF(entry.obj)
+        return entry.obj
+
+    if s == NULL:
+        s = ""
+    if cset == H5T_CSET_UTF8:
+        obj = PyUnicode_DecodeUTF8(s, length, NULL)
+    else:
+        obj = PyBytes_FromString(s)
+
+    entry.key = <char*>malloc(length + 1)
+    if entry.key == NULL:
+        Py_DECREF(obj)
+        raise MemoryError("Failed to allocate string table entry")
+    if length:
+        memcpy(entry.key, s, length)
+    entry.key[length] = 0
+    entry.hash = h
+    entry.length = length
+    entry.cset = cset
+    entry.obj = obj
+    Py_INCREF(obj)      # One reference for the table, one for the caller
+    intern_used += 1
+    return obj
+
+def start_interning():
+    """ Start sharing Python objects between equal vlen strings read.
+
+    Calls may be nested; the table of strings is kept until the matching
+    number of calls to stop_interning().
+    """
+    global intern_depth
+    intern_depth += 1
+
+def stop_interning():
+    """ Stop sharing vlen string objects and release the table of strings
+    once the outermost call to start_interning() is matched.
+    """
+    cdef size_t i
+    global intern_depth, intern_table, intern_slots, intern_used
+    if intern_depth == 0:
+        return
+    intern_depth -= 1
+    if intern_depth > 0:
+        return
+    for i from 0 <= i < intern_slots:
+        if intern_table[i].key != NULL:
+            free(intern_table[i].key)
+            Py_DECREF(intern_table[i].obj)
+    free(intern_table)
+    intern_table = NULL
+    intern_slots = intern_used = 0
+
 # =============================================================================
 # Vlen string conversion
 
@@ -165,7 +300,9 @@ cdef int conv_vlen2str(void* ipt, void* opt, void* bkg, void* priv) except -1:
 
     # When reading we identify H5T_CSET_ASCII as a byte string and
     # H5T_CSET_UTF8 as a utf8-encoded unicode string
-    if sizes.cset == H5T_CSET_ASCII:
+    if intern_depth > 0:
+        temp_obj = intern_vlen2str(buf_cstring[0], sizes.cset)
+    elif sizes.cset == H5T_CSET_ASCII:
         if buf_cstring[0] == NULL:
             temp_obj = PyBytes_FromString("")
         else:
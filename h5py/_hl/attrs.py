@@ -56,25 +56,62 @@ class AttributeManager(base.MutableMappingHDF5, base.CommonStateObject):
         """ Read the value of an attribute.
         """
         attr = h5a.open(self._id, self._e(name))
+        return self._read(attr)
 
-        if is_empty_dataspace(attr):
+    @with_phil
+    def read_all(self):
+        """ Read every attribute into a dictionary mapping names to values.
+
+        Attributes are read as they are visited, in a single pass, and the
+        memory type for each distinct file type is only built once.  This
+        is faster than dict(obj.attrs) for objects with many
+        attributes.
+        """
+        types = {}
+        out = {}
+
+        def read_cb(name):
+            """ Callback to read each attribute """
+            attr = h5a.open(self._id, name)
+            out[self._d(name)] = self._read(attr, types)
+
+        h5a.iterate(self._id, read_cb)
+        return out
+
+    @staticmethod
+    def _read(attr, types=None):
+        """ Read an open attribute.
+
+        "types" is an optional dictionary caching the dtype and memory type
+        to use for each (transient) file type, keyed on its encoding.
+        """
+        space = attr.get_space()
+        if space.get_simple_extent_type() == h5s.NULL:
             return Empty(attr.dtype)
 
-        dtype = readtime_dtype(attr.dtype, [])
-        shape = attr.shape
-        
-        # Do this first, as we'll be fiddling with the dtype for top-level
-        # array types
-        htype = h5t.py_create(dtype)
+        tid = attr.get_type()
+        key = None
+        if types is not None and not tid.committed():
+            key = tid.encode()
+        if key is not None and key in types:
+            dtype, htype = types[key]
+        else:
+            dtype = readtime_dtype(tid.dtype, [])
+            # Do this first, as we'll be fiddling with the dtype for
+            # top-level array types
+            htype = h5t.py_create(dtype)
+            if key is not None:
+                types[key] = (dtype, htype)
+        shape = space.get_simple_extent_dims()
 
         # NumPy doesn't support top-level array types, so we have to "fake"
         # the correct type and shape for the array.  For example, consider
         # attr.shape == (5,) and attr.dtype == '(3,)f'. Then:
         if dtype.subdtype is not None:
             subdtype, subshape = dtype.subdtype
-            shape = attr.shape + subshape   # (5, 3)
+            shape = shape + subshape        # (5, 3)
             dtype = subdtype                # 'f'
-            
+
         arr = numpy.ndarray(shape, dtype=dtype, order='C')
         attr.read(arr, mtype=htype)
 
@@ -181,32 +218,42 @@ class AttributeManager(base.MutableMappingHDF5, base.CommonStateObject):
 
             # This mess exists because you can't overwrite attributes in HDF5.
             # So we write to a temporary attribute first, and then rename.
-            
-            tempname = uuid.uuid4().hex
+            # Attributes which don't exist yet are created in place.
+
+            exists = h5a.exists(self._id, self._e(name))
+            if exists:
+                tempname = self._e(uuid.uuid4().hex)
+            else:
+                tempname = self._e(name)
 
+            attr = h5a.create(self._id, tempname, htype, space)
             try:
-                attr = h5a.create(self._id, self._e(tempname), htype, space)
+                if not isinstance(data, Empty):
+                    attr.write(data, mtype=htype2)
             except:
+                attr.close()
+                h5a.delete(self._id, tempname)
                 raise
-            else:
+
+            if exists:
                 try:
-                    if not isinstance(data, Empty):
-                        attr.write(data, mtype=htype2)
+                    # No atomic rename in HDF5 :(
+                    h5a.delete(self._id, self._e(name))
+                    h5a.rename(self._id, tempname, self._e(name))
                 except:
                     attr.close()
-                    h5a.delete(self._id, self._e(tempname))
+                    h5a.delete(self._id, tempname)
                     raise
-                else:
-                    try:
-                        # No atomic rename in HDF5 :(
-                        if h5a.exists(self._id, self._e(name)):
-                            h5a.delete(self._id, self._e(name))
-                        h5a.rename(self._id, self._e(tempname), self._e(name))
-                    except:
-                        attr.close()
-                        h5a.delete(self._id, self._e(tempname))
-                        raise
-                        
+
+    def update(self, *args, **kwds):
+        """ Set several attributes at once, as for dict.update().
+
+        Values are stored as for obj.attrs[name] = value.  The global lock
+        is taken once for the whole batch.
+        """
+        with phil:
+            base.MutableMappingHDF5.update(self, *args, **kwds)
+
     def modify(self, name, value):
         """ Change the value of an attribute while preserving its type.
 
@@ -15,6 +15,7 @@ from __future__ import absolute_import
 
 import posixpath
 import os
+import weakref
 import six
 from collections import (Mapping, MutableMapping, KeysView, 
                          ValuesView, ItemsView)
@@ -78,6 +79,54 @@ dlapl = default_lapl()
 dlcpl = default_lcpl()
 
 
+# Options given to File which apply to objects created anywhere in the
+# file, keyed by file number.  Entries live as long as the File object
+# holding them.
+_file_settings = weakref.WeakValueDictionary()
+
+
+class FileSettings(object):
+
+    """
+        File-wide creation settings (see File's auto_compact_threshold).
+    """
+
+    def __init__(self, fid, auto_compact_threshold=0):
+        self.auto_compact_threshold = auto_compact_threshold
+        self.fileno = fid.fileno
+        _file_settings[self.fileno] = self
+
+    def detach(self):
+        """ Stop applying these settings to the file """
+        if _file_settings.get(self.fileno) is self:
+            del _file_settings[self.fileno]
+
+
+def file_settings(oid):
+    """ FileSettings for the file containing "oid", or None """
+    if len(_file_settings) == 0:
+        return None
+    return _file_settings.get(oid.fileno)
+
+
+def storage_thresholds(value, name):
+    """ Validate a link_storage or attr_storage argument.
+
+    Returns the (max_compact, min_dense) thresholds it stands for: "dense"
+    means dense storage from the start, and a 2-tuple is taken as explicit
+    thresholds.
+    """
+    if value == 'dense':
+        return (0, 0)
+    try:
+        max_compact, min_dense = (int(x) for x in value)
+    except (TypeError, ValueError):
+        raise ValueError('"%s" must be "dense" or a 2-tuple (max_compact, min_dense)' % name)
+    if max_compact < 0 or min_dense < 0 or min_dense > max_compact + 1:
+        raise ValueError('"%s" thresholds must satisfy 0 <= min_dense <= max_compact + 1' % name)
+    return (max_compact, min_dense)
+
+
 def is_empty_dataspace(obj):
     """ Check if an object's dataspace is empty """
     if obj.get_space().get_simple_extent_type() == h5s.NULL:
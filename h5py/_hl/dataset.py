@@ -15,20 +15,32 @@ from __future__ import absolute_import
 
 import posixpath as pp
 import sys
+from collections import OrderedDict
 
 import six
 from six.moves import xrange    # pylint: disable=redefined-builtin
 
 import numpy
 
-from .. import h5, h5s, h5t, h5r, h5d, h5p, h5fd
+from .. import h5, h5s, h5t, h5r, h5d, h5p, h5fd, _conv
 from .base import HLObject, phil, with_phil, Empty, is_empty_dataspace
+from .base import storage_thresholds
 from . import filters
 from . import selections as sel
 from . import selections2 as sel2
 from .datatype import Datatype
+from .vds import vds_support, VDSReader
 
 _LEGACY_GZIP_COMPRESSION_VALS = frozenset(range(10))
+
+_ALLOC_TIMES = {'late': h5d.ALLOC_TIME_LATE,
+                'incr': h5d.ALLOC_TIME_INCR,
+                'early': h5d.ALLOC_TIME_EARLY}
+
+_FILL_TIMES = {'never': h5d.FILL_TIME_NEVER,
+               'alloc': h5d.FILL_TIME_ALLOC,
+               'ifset': h5d.FILL_TIME_IFSET}
+
 MPI = h5.get_config().mpi
 
 def readtime_dtype(basetype, names):
@@ -47,15 +59,100 @@ def readtime_dtype(basetype, names):
     return numpy.dtype([(name, basetype.fields[name][0]) for name in names])
 
 
-def make_new_dset(parent, shape=None, dtype=None, data=None,
-                 chunks=None, compression=None, shuffle=None,
-                    fletcher32=None, maxshape=None, compression_opts=None,
-                  fillvalue=None, scaleoffset=None, track_times=None):
+def _divisor_at_least(n, lower):
+    """ Smallest divisor of n which is >= lower, or None """
+    best = None
+    i = 1
+    while i*i <= n:
+        if n % i == 0:
+            for d in (i, n // i):
+                if d >= lower and (best is None or d < best):
+                    best = d
+        i += 1
+    return best
+
+
+def strided_mspace(arr, rank=0):
+    """ Describe a possibly non-contiguous array to HDF5.
+
+    Returns (mspace, buf).  "buf" is a C-contiguous 1D view of the memory
+    spanned by "arr", and "mspace" a hyperslab selection picking out the
+    elements of "arr" from it, in order.  The space is padded with leading
+    axes of length 1 up to "rank".
+
+    Returns None if the strides of "arr" can't be expressed as a hyperslab
+    (negative or overlapping strides, or ones which aren't a multiple of
+    the item size).
+    """
+    itemsize = arr.dtype.itemsize
+    counts = list(arr.shape)
+    dims = [1]*arr.ndim
+    steps = [1]*arr.ndim
+
+    # Axes of length 1 don't affect the layout, so only the others are
+    # fitted.  For axis k, elements are "steps[k]" apart in a C-ordered
+    # space of shape "dims", so the element stride of axis k is
+    # steps[k]*prod(dims[k+1:]).
+    active = [ax for ax in range(arr.ndim) if counts[ax] > 1]
+    strides = []
+    for ax in active:
+        stride = arr.strides[ax]
+        if stride <= 0 or stride % itemsize:
+            return None
+        strides.append(stride // itemsize)
+
+    inner = 1
+    span = 1
+    for pos in range(len(active) - 1, -1, -1):
+        ax = active[pos]
+        if strides[pos] % inner:
+            return None
+        step = strides[pos] // inner
+        needed = (counts[ax] - 1)*step + 1
+        if pos == 0:
+            dim = needed
+        elif strides[pos - 1] % inner:
+            return None
+        else:
+            dim = _divisor_at_least(strides[pos - 1] // inner, needed)
+            if dim is None:
+                return None
+        dims[ax] = dim
+        steps[ax] = step
+        inner *= dim
+        span += (counts[ax] - 1)*strides[pos]
+
+    pad = [1]*(rank - arr.ndim)
+    mspace = h5s.create_simple(tuple(pad + dims))
+    mspace.select_hyperslab((0,)*len(pad + dims), tuple(pad + counts),
+                            tuple(pad + steps))
+    buf = numpy.lib.stride_tricks.as_strided(arr, shape=(span,),
+                                             strides=(itemsize,))
+    return mspace, buf
+
+
+def make_new_dset(parent, shape=None, dtype=None, data=None, **kwds):
     """ Return a new low-level dataset identifier
 
-    Only creates anonymous datasets.
+    Only creates anonymous datasets.  Keywords are as for make_dset_template.
     """
+    shape, data = check_dset_data(shape, dtype, data)
+    tid, sid, dcpl = make_dset_template(shape, dtype, data, **kwds)
+
+    dset_id = h5d.create(parent.id, None, tid, sid, dcpl=dcpl)
+
+    if (data is not None) and (not isinstance(data, Empty)):
+        dset_id.write(h5s.ALL, h5s.ALL, data)
+
+    return dset_id
+
 
+def check_dset_data(shape, dtype, data):
+    """ Convert data for a new dataset to an array, and check its shape
+
+    Returns (shape, data).  If neither shape nor data is given, data
+    becomes an Empty placeholder of the given dtype.
+    """
     # Convert data to a C-contiguous ndarray
     if data is not None and not isinstance(data, Empty):
         from . import base
@@ -73,6 +170,29 @@ def make_new_dset(parent, shape=None, dtype=None, data=None,
         if data is not None and (numpy.product(shape) != numpy.product(data.shape)):
             raise ValueError("Shape tuple is incompatible with data")
 
+    return shape, data
+
+
+def make_dset_template(shape, dtype, data=None,
+                       chunks=None, compression=None, shuffle=None,
+                       fletcher32=None, maxshape=None, compression_opts=None,
+                       fillvalue=None, scaleoffset=None, track_times=None,
+                       attr_storage=None, layout=None, compact_threshold=0,
+                       alloc_time=None, fill_time=None, track_order=None):
+    """ Build the parts needed to create a dataset
+
+    Returns (TypeID, SpaceID, PropDCID) for a dataset of the given shape
+    and dtype ("data", as returned by check_dset_data, supplies the dtype
+    if it is None).  These can be reused for any number of datasets with
+    the same shape, dtype and options.
+
+    Without an explicit "layout", datasets of at most "compact_threshold"
+    bytes which need neither chunks nor a variable-length type are made
+    compact, unless an "alloc_time" other than 'early' is given.
+    """
+    if alloc_time is not None and alloc_time not in _ALLOC_TIMES:
+        raise ValueError('alloc_time must be "late", "incr" or "early", not %r' % (alloc_time,))
+
     tmp_shape = maxshape if maxshape is not None else shape
     # Validate chunk shape
     if isinstance(chunks, tuple) and any(
@@ -125,6 +245,36 @@ def make_new_dset(parent, shape=None, dtype=None, data=None,
     elif track_times is not None:
         raise TypeError("track_times must be either True or False")
 
+    if track_order:
+        dcpl.set_attr_creation_order(h5p.CRT_ORDER_TRACKED | h5p.CRT_ORDER_INDEXED)
+
+    if attr_storage is not None:
+        dcpl.set_attr_phase_change(*storage_thresholds(attr_storage, 'attr_storage'))
+
+    if layout is None and compact_threshold and not isinstance(data, Empty) \
+       and dcpl.get_layout() == h5d.CONTIGUOUS and not dtype.hasobject \
+       and alloc_time in (None, 'early') \
+       and numpy.product(shape) * tid.get_size() <= compact_threshold:
+        layout = 'compact'
+
+    if layout is not None:
+        if layout not in ('compact', 'contiguous'):
+            raise ValueError('Layout must be "compact" or "contiguous", not %r' % (layout,))
+        if dcpl.get_layout() == h5d.CHUNKED:
+            raise ValueError("%s layout can't be used with chunking, filters or maxshape" % layout.capitalize())
+        if layout == 'compact':
+            if alloc_time not in (None, 'early'):
+                raise ValueError('Compact layout requires alloc_time "early", not %r' % (alloc_time,))
+            dcpl.set_layout(h5d.COMPACT)
+
+    if alloc_time is not None:
+        dcpl.set_alloc_time(_ALLOC_TIMES[alloc_time])
+
+    if fill_time is not None:
+        if fill_time not in _FILL_TIMES:
+            raise ValueError('fill_time must be "never", "alloc" or "ifset", not %r' % (fill_time,))
+        dcpl.set_fill_time(_FILL_TIMES[fill_time])
+
     if maxshape is not None:
         maxshape = tuple(m if m is not None else h5s.UNLIMITED for m in maxshape)
 
@@ -133,13 +283,78 @@ def make_new_dset(parent, shape=None, dtype=None, data=None,
     else:
         sid = h5s.create_simple(shape, maxshape)
 
+    return tid, sid, dcpl
 
-    dset_id = h5d.create(parent.id, None, tid, sid, dcpl=dcpl)
 
-    if (data is not None) and (not isinstance(data, Empty)):
-        dset_id.write(h5s.ALL, h5s.ALL, data)
+VOCABULARY_ATTR = 'H5PY_VOCABULARY'
 
-    return dset_id
+def dictionary_encode(data, dtype=None):
+    """ Split an array of strings into integer codes and a vocabulary
+
+    Returns (codes, vocabulary, vocabulary_dtype).  The vocabulary is a
+    sorted object array of the distinct strings, and codes index into it.
+    Codes use "dtype" if given, otherwise the smallest unsigned type which
+    can hold them.
+    """
+    data = numpy.asarray(data, order="C")
+    if data.dtype.kind not in 'SUO':
+        raise TypeError("Dictionary encoding requires string data")
+    vlen = h5t.check_dtype(vlen=data.dtype)
+    if data.dtype.kind == 'O' and vlen is None and data.size > 0:
+        vlen = type(data.flat[0])
+    if data.dtype.kind == 'U' or vlen is six.text_type:
+        vtype = h5t.special_dtype(vlen=six.text_type)
+    elif data.dtype.kind == 'S' or vlen is bytes:
+        vtype = h5t.special_dtype(vlen=bytes)
+    else:
+        raise TypeError("Dictionary encoding requires string data")
+
+    vocab, codes = numpy.unique(data.ravel(), return_inverse=True)
+    if dtype is None:
+        dtype = numpy.min_scalar_type(max(len(vocab)-1, 0))
+    else:
+        dtype = numpy.dtype(dtype)
+        if dtype.kind not in 'iu':
+            raise TypeError("Dictionary codes must have an integer type")
+        if len(vocab) > 0 and len(vocab)-1 > numpy.iinfo(dtype).max:
+            raise ValueError("%d distinct strings don't fit in type %s" %
+                             (len(vocab), dtype))
+    codes = codes.astype(dtype).reshape(data.shape)
+    return codes, vocab.astype(object), vtype
+
+
+class DictionaryReader(object):
+
+    """
+        Reads a dictionary-encoded dataset back as strings.
+
+        Indexing works as for the dataset itself; the stored codes are read
+        and translated through the vocabulary with a single numpy.take.
+    """
+
+    def __init__(self, dset):
+        with phil:
+            if VOCABULARY_ATTR not in dset.attrs:
+                raise TypeError("Dataset is not dictionary-encoded")
+            self._dset = dset
+            self.vocabulary = numpy.asarray(dset.attrs[VOCABULARY_ATTR],
+                                            dtype=object)
+
+    @property
+    def codes(self):
+        """ The underlying dataset of integer codes """
+        return self._dset
+
+    @property
+    def shape(self):
+        """ Shape of the dataset """
+        return self._dset.shape
+
+    def __len__(self):
+        return len(self._dset)
+
+    def __getitem__(self, args):
+        return self.vocabulary.take(self._dset[args])
 
 
 class AstypeContext(object):
@@ -325,6 +540,9 @@ class Dataset(HLObject):
         self._filters = filters.get_filters(self._dcpl)
         self._local = local()
         self._local.astype = None
+        self._vds_reader = None
+        if vds_support and self._dcpl.get_layout() == h5d.VIRTUAL:
+            self._vds_reader = VDSReader(self.id, self._dcpl)
 
     def resize(self, size, axis=None):
         """ Resize the dataset, or the specified axis.
@@ -488,10 +706,13 @@ class Dataset(HLObject):
             # pad with ones
             mshape = (1,)*(len(self.shape)-len(mshape)) + mshape
 
-        # Perfom the actual read
-        mspace = h5s.create_simple(mshape)
-        fspace = selection.id
-        self.id.read(mspace, fspace, arr, mtype, dxpl=self._dxpl)
+        # Perfom the actual read; virtual datasets try going straight to
+        # the sources which intersect the selection first
+        reader = self._vds_reader
+        if reader is None or not reader.read(selection, arr, mtype, self._dxpl):
+            mspace = h5s.create_simple(mshape)
+            fspace = selection.id
+            self.id.read(mspace, fspace, arr, mtype, dxpl=self._dxpl)
 
         # Patch up the output for NumPy
         if len(names) == 1:
@@ -629,6 +850,180 @@ class Dataset(HLObject):
         for fspace in selection.broadcast(mshape):
             self.id.write(mspace, fspace, val, mtype, dxpl=self._dxpl)
 
+    def read(self, selection=Ellipsis, out=None, intern_strings=False):
+        """ Read a selection from the dataset, optionally into "out".
+
+        "selection" is anything accepted by __getitem__ other than field
+        names, e.g. the output of numpy.s_[<args>].  Without "out" this is
+        the same as dset[selection].
+
+        "out" may be any writable object supporting the buffer protocol
+        with the shape of the selection, including non-contiguous NumPy
+        views such as buf[:, ::2].  Data is converted to its type on the
+        fly; a buffer of bytes is taken to hold the dataset's own type.
+        Where the strides of "out" can be expressed as a hyperslab, data
+        is read in place without any temporary array.  Returns "out" as
+        an array.
+
+        If "intern_strings" is True, equal variable-length strings are read
+        as the same Python object, so columns with few distinct values take
+        memory in proportion to the number of distinct strings.
+        """
+        if intern_strings:
+            with phil:
+                _conv.start_interning()
+                try:
+                    return self.read(selection, out)
+                finally:
+                    _conv.stop_interning()
+
+        if out is None:
+            return self[selection]
+
+        with phil:
+            if is_empty_dataspace(self.id):
+                raise TypeError("Empty datasets have no numpy representation")
+
+            arr = out if isinstance(out, numpy.ndarray) else numpy.asarray(out)
+            if not arr.flags.writeable:
+                raise TypeError("Output buffer must be writable")
+            if not isinstance(out, numpy.ndarray) and arr.dtype == numpy.uint8 \
+                    and self.dtype.itemsize != 1:
+                if not arr.flags.c_contiguous:
+                    raise ValueError("Byte buffers must be contiguous")
+                arr = arr.reshape(-1).view(self.dtype)
+
+            if self.shape == ():
+                arr[...] = self[selection]
+                return arr
+
+            if not isinstance(selection, tuple):
+                selection = (selection,)
+            selection = sel.select(self.shape, selection, dsid=self.id)
+            mshape = selection.mshape
+            if mshape is None:
+                mshape = ()
+            if arr.shape != mshape:
+                if arr.size != selection.nselect or not arr.flags.c_contiguous:
+                    raise ValueError("Output shape %s doesn't match selection shape %s"
+                                     % (arr.shape, mshape))
+                arr = arr.reshape(mshape)
+            if selection.nselect == 0:
+                return arr
+
+            mtype = h5t.py_create(arr.dtype)
+            fspace = selection.id
+            if arr.flags.c_contiguous:
+                shape = (1,)*(len(self.shape) - arr.ndim) + arr.shape
+                self.id.read(h5s.create_simple(shape), fspace, arr, mtype,
+                             dxpl=self._dxpl)
+                return arr
+
+            plan = strided_mspace(arr, len(self.shape))
+            if plan is None:
+                # Strides HDF5 can't describe; go through a temporary
+                tmp = numpy.empty(arr.shape, dtype=arr.dtype)
+                self.id.read(h5s.create_simple(tmp.shape or (1,)), fspace,
+                             tmp, mtype, dxpl=self._dxpl)
+                arr[...] = tmp
+            else:
+                mspace, buf = plan
+                self.id.read(mspace, fspace, buf, mtype, dxpl=self._dxpl)
+            return arr
+
+    @with_phil
+    def read_columns(self, names=None, selection=Ellipsis):
+        """ Read fields of a compound dataset as separate arrays.
+
+        Returns an OrderedDict mapping each of "names" (default: all fields)
+        to a contiguous array of that field for the selection, which is as
+        for read().  The selection is read once, with a memory type holding
+        just the requested fields, and then split into columns.
+        """
+        if self.dtype.names is None:
+            raise TypeError("Columns can only be read from compound datasets")
+        if names is None:
+            names = self.dtype.names
+        elif isinstance(names, six.string_types):
+            names = (names,)
+        names = tuple(names)
+        if not isinstance(selection, tuple):
+            selection = (selection,)
+        arr = self[selection + names]
+        if len(names) == 1:
+            return OrderedDict(((names[0], arr),))    # Already just the field
+        if not isinstance(arr, numpy.ndarray):
+            return OrderedDict((name, arr[name]) for name in names)
+        return OrderedDict((name, numpy.ascontiguousarray(arr[name]))
+                           for name in names)
+
+    def _select_space(self, selection):
+        """ Get the file space and memory shape for a selection given as
+        for slicing, handling scalar datasets """
+        if self.shape == ():
+            return self.id.get_space(), ()
+        if not isinstance(selection, tuple):
+            selection = (selection,)
+        selection = sel.select(self.shape, selection, dsid=self.id)
+        return selection.id, selection.mshape
+
+    @with_phil
+    def read_vlen_strings(self, selection=Ellipsis, fixed=None):
+        """ Read variable-length strings without making a Python object for
+        each element.
+
+        "selection" is as for read().  By default, returns a tuple
+        (data, offsets): the strings back to back in a uint8 array, and an
+        int64 array of offsets with one more entry than there are strings,
+        in C order, so that string i is data[offsets[i]:offsets[i+1]].
+
+        If "fixed" is given, it must be a NumPy "S" or "U" dtype (e.g.
+        'S64'); strings are returned in an array of that type with the
+        shape of the selection, truncated to fit.  "U" types decode the
+        strings as UTF-8.
+        """
+        if fixed is not None:
+            fixed = numpy.dtype(fixed)
+            if fixed.kind not in ('S', 'U'):
+                raise TypeError("Fixed-width type must be of kind S or U (got %s)" % fixed)
+
+        fspace, mshape = self._select_space(selection)
+        if fixed is None:
+            return self.id.read_vlen_strings(fspace, dxpl=self._dxpl)
+
+        out = numpy.empty(mshape, dtype=fixed)
+        self.id.read_vlen_strings(fspace, out, dxpl=self._dxpl)
+        if out.shape == ():
+            return out[()]
+        return out
+
+    @with_phil
+    def read_ragged(self, selection=Ellipsis):
+        """ Read a variable-length sequence dataset as a ragged array.
+
+        "selection" is as for read().  Returns a tuple (offsets, values):
+        the sequences back to back in one contiguous array of the base type,
+        and an int64 array of offsets with one more entry than there are
+        elements, in C order, so that element i is
+        values[offsets[i]:offsets[i+1]].
+        """
+        fspace, _ = self._select_space(selection)
+        return self.id.read_vlen_ragged(fspace, dxpl=self._dxpl)
+
+    @with_phil
+    def write_ragged(self, offsets, values, selection=Ellipsis):
+        """ Write a ragged array to a variable-length sequence dataset.
+
+        Element i of the selection (in C order) is set to
+        values[offsets[i]:offsets[i+1]], so "offsets" needs one more entry
+        than there are elements selected.  The data is passed to HDF5
+        straight from "values", without making an array per element.
+        """
+        fspace, _ = self._select_space(selection)
+        offsets = numpy.ascontiguousarray(offsets, dtype=numpy.int64)
+        values = numpy.ascontiguousarray(values)
+        self.id.write_vlen_ragged(fspace, offsets, values, dxpl=self._dxpl)
+
     def read_direct(self, dest, source_sel=None, dest_sel=None):
         """ Read data directly from HDF5 into an existing NumPy array.
 
@@ -679,6 +1074,68 @@ class Dataset(HLObject):
             for fspace in dest_sel.broadcast(source_sel.mshape):
                 self.id.write(mspace, fspace, source, dxpl=self._dxpl)
 
+    @with_phil
+    def as_memmap(self, mode='r'):
+        """ Map the dataset's data in the file into memory.
+
+        Returns a numpy.memmap over the file, so no data is read up front;
+        pages are read from disk as the array is accessed.  This is only
+        possible for contiguous datasets with storage allocated in the
+        file, of fixed-size types, in files opened with the sec2 (default)
+        driver.
+
+        mode
+            r   Readonly (default)
+            r+  Read/write; changes go straight to the file, which must be
+                open for writing.
+            c   Copy-on-write; changes are kept in memory only.
+
+        Writes made through HDF5 afterwards (e.g. with __setitem__) may not
+        show up in the map until the file is flushed.  Equally, HDF5 keeps
+        its own cache of the data, so writes made through an 'r+' map are
+        not seen by reads through HDF5 (e.g. dset[0]) until the file has
+        been closed and reopened, even after the map is flushed.
+        """
+        if mode not in ('r', 'r+', 'c'):
+            raise ValueError("Invalid mode; must be one of r, r+, c")
+        if is_empty_dataspace(self.id):
+            raise TypeError("Empty datasets have no numpy representation")
+        if self._dcpl.get_layout() != h5d.CONTIGUOUS:
+            raise ValueError("Only datasets with contiguous layout can be memory-mapped")
+
+        dtype = self.dtype
+        if dtype.hasobject or self.id.get_type().get_size() != dtype.itemsize:
+            raise TypeError("Only fixed-size types can be memory-mapped (got %s)" % dtype)
+
+        f = self.file
+        if f.driver != 'sec2':
+            raise ValueError("Memory mapping requires the sec2 driver (file uses %s)" % f.driver)
+        if mode == 'r+' and f.mode != 'r+':
+            raise ValueError("Mode r+ requires the file to be open for writing")
+
+        # With a user block, HDF5 1.10 reports an offset for datasets with
+        # no storage, so check the size too
+        offset = self.id.get_offset()
+        if offset is None or self.id.get_storage_size() == 0:
+            raise ValueError("Dataset has no storage allocated in the file")
+
+        # Push data cached by HDF5 out to the file before mapping it
+        if f.mode == 'r+':
+            f.flush()
+
+        return numpy.memmap(f.filename, dtype=dtype, mode=mode,
+                            offset=offset, shape=self.shape)
+
+    @property
+    def decoded(self):
+        """ Reader giving the strings of a dictionary-encoded dataset, e.g.:
+
+        >>> labels = dataset.decoded[0:100]
+
+        See the "encoding" keyword of Group.create_dataset.
+        """
+        return DictionaryReader(self)
+
     @with_phil
     def __array__(self, dtype=None):
         """ Create a Numpy array containing the whole dataset.  DON'T THINK
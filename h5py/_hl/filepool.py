@@ -0,0 +1,166 @@
+# This file is part of h5py, a Python interface to the HDF5 library.
+#
+# http://www.h5py.org
+#
+# Copyright 2008-2013 Andrew Collette and contributors
+#
+# License:  Standard 3-clause BSD; see "license.txt" for full license terms
+#           and contributor agreement.
+
+"""
+    Implements a process-wide pool of open HDF5 files.
+
+    Workloads which reopen the same files over and over (by path, or by
+    following external links) pay for the superblock and root metadata to
+    be read and parsed on every open.  The pool keeps a bounded number of
+    low-level FileIDs open and hands them back out on request.
+"""
+
+from __future__ import absolute_import
+
+import os
+from collections import OrderedDict
+
+from .compat import fspath, fsencode
+from .base import phil, with_phil
+from .files import File, make_fapl, make_fid
+from .. import version
+
+hdf5_version = version.hdf5_version_tuple[0:3]
+
+DEFAULT_MAXSIZE = 64
+DEFAULT_ELINK_CACHE_SIZE = 16
+
+
+class FilePool(object):
+
+    """
+        Least-recently-used pool of open low-level file identifiers.
+
+        Files are keyed by their real path on disk, the access mode and the
+        file access settings (driver, libver and any other keywords accepted
+        by File).  At most "maxsize" files are kept open; when the pool is
+        full the least recently used file is dropped.  Dropping a file only
+        releases the pool's reference, so objects still using it remain
+        valid.
+
+        Files opened through the pool also enable the HDF5 external link
+        file cache, with room for "elink_cache_size" files, so targets of
+        external links stay open between traversals.  Use 0 to disable it.
+    """
+
+    def __init__(self, maxsize=DEFAULT_MAXSIZE,
+                 elink_cache_size=DEFAULT_ELINK_CACHE_SIZE):
+        self._fids = OrderedDict()
+        self._maxsize = self._check_size(maxsize, 'maxsize')
+        self._elink_cache_size = self._check_size(elink_cache_size,
+                                                  'elink_cache_size')
+
+    @staticmethod
+    def _check_size(value, name):
+        """ Validate a pool size argument """
+        try:
+            value = int(value)
+        except (TypeError, ValueError):
+            raise TypeError('"%s" must be an integer' % name)
+        if value < 0:
+            raise ValueError('"%s" must be non-negative' % name)
+        return value
+
+    @property
+    def maxsize(self):
+        """ Maximum number of files kept open by the pool """
+        return self._maxsize
+
+    @maxsize.setter
+    @with_phil
+    def maxsize(self, value):
+        # pylint: disable=missing-docstring
+        self._maxsize = self._check_size(value, 'maxsize')
+        self._evict()
+
+    @property
+    def elink_cache_size(self):
+        """ Size of the external link file cache of newly pooled files """
+        return self._elink_cache_size
+
+    def _evict(self):
+        """ Drop the least recently used files until the pool fits """
+        while len(self._fids) > self._maxsize:
+            self._fids.popitem(last=False)
+
+    def open(self, name, mode='r', driver=None, libver=None, **kwds):
+        """ Get an open low-level FileID for the named file.
+
+        Only the existing-file modes "r" and "r+" are supported.  Other
+        keywords are the same as for File, and are part of the pool key;
+        they must therefore be hashable.
+        """
+        if mode not in ('r', 'r+'):
+            raise ValueError("Pooled files must be opened with mode r or r+")
+
+        with phil:
+            path = os.path.realpath(fspath(name))
+            key = (path, mode, driver, libver, tuple(sorted(kwds.items())))
+            try:
+                fid = self._fids.pop(key, None)
+            except TypeError:
+                raise TypeError("Keyword arguments for pooled files must be hashable")
+
+            if fid is None or not fid.valid:
+                fapl = make_fapl(driver, libver, **kwds)
+                if self._elink_cache_size and hdf5_version >= (1, 8, 7):
+                    fapl.set_elink_file_cache_size(self._elink_cache_size)
+                fid = make_fid(fsencode(path), mode, None, fapl)
+
+            if self._maxsize:
+                self._fids[key] = fid
+                self._evict()
+            return fid
+
+    @with_phil
+    def clear(self):
+        """ Drop all files held by the pool """
+        self._fids.clear()
+
+    @with_phil
+    def __len__(self):
+        """ Number of files currently held open by the pool """
+        return sum(1 for fid in self._fids.values() if fid.valid)
+
+    @with_phil
+    def __contains__(self, name):
+        """ Test if a file (by path, any mode) is held open by the pool """
+        path = os.path.realpath(fspath(name))
+        return any(key[0] == path and fid.valid
+                   for key, fid in self._fids.items())
+
+    @with_phil
+    def __repr__(self):
+        return "<HDF5 file pool (%d of %d open)>" % (len(self), self._maxsize)
+
+
+default_pool = FilePool()
+
+
+def open_pooled(name, mode='r', pool=None, **kwds):
+    """ Open a File, reusing an already-open file from a pool if possible.
+
+    name
+        Name of the file on disk.
+    mode
+        r   Readonly (default)
+        r+  Read/write
+    pool
+        FilePool to use.  Defaults to the process-wide pool, whose size
+        can be changed through h5py.filepool.default_pool.maxsize.
+    Additional keywords
+        As for File (driver, libver, alignment, ...).
+
+    Closing the returned File closes the underlying file for everyone
+    sharing it; the pool will reopen it on the next request.
+    """
+    if pool is None:
+        pool = default_pool
+    with phil:
+        return File(pool.open(name, mode, **kwds))
@@ -22,8 +22,11 @@ from .compat import fsdecode
 
 import six
 
+from . import base
 from .base import phil, with_phil
 from .group import Group
+from . import index
+from . import objcache
 from .. import h5, h5f, h5p, h5i, h5fd, _objects
 from .. import version
 
@@ -41,7 +44,19 @@ libver_dict = {'earliest': h5f.LIBVER_EARLIEST, 'latest': h5f.LIBVER_LATEST}
 libver_dict_r = dict((y, x) for x, y in six.iteritems(libver_dict))
 
 
-def make_fapl(driver, libver, **kwds):
+def _check_block_size(value, name):
+    """ Validate a size (in bytes) given for one of the FAPL tuning options """
+    try:
+        value = int(value)
+    except (TypeError, ValueError):
+        raise TypeError('"%s" must be an integer' % name)
+    if value < 0:
+        raise ValueError('"%s" must be non-negative' % name)
+    return value
+
+
+def make_fapl(driver, libver, alignment=None, sieve_buf_size=None,
+              meta_block_size=None, small_data_block_size=None, **kwds):
     """ Set up a file access property list """
     plist = h5p.create(h5p.FILE_ACCESS)
 
@@ -53,6 +68,29 @@ def make_fapl(driver, libver, **kwds):
             low, high = (libver_dict[x] for x in libver)
         plist.set_libver_bounds(low, high)
 
+    if alignment is not None:
+        try:
+            threshold, align = alignment
+        except (TypeError, ValueError):
+            raise TypeError('"alignment" must be a 2-tuple (threshold, alignment)')
+        threshold = _check_block_size(threshold, 'alignment threshold')
+        align = _check_block_size(align, 'alignment')
+        if align == 0:
+            raise ValueError("Alignment must be a positive integer")
+        plist.set_alignment(threshold, align)
+
+    if sieve_buf_size is not None:
+        plist.set_sieve_buf_size(
+            _check_block_size(sieve_buf_size, 'sieve_buf_size'))
+
+    if meta_block_size is not None:
+        plist.set_meta_block_size(
+            _check_block_size(meta_block_size, 'meta_block_size'))
+
+    if small_data_block_size is not None:
+        plist.set_small_data_block_size(
+            _check_block_size(small_data_block_size, 'small_data_block_size'))
+
     if driver is None or (driver == 'windows' and sys.platform == 'win32'):
         # Prevent swallowing unused key arguments
         if kwds:
@@ -78,6 +116,15 @@ def make_fapl(driver, libver, **kwds):
     return plist
 
 
+def make_fcpl(track_order=False):
+    """ Set up a file creation property list """
+    if not track_order:
+        return None
+    fcpl = h5p.create(h5p.FILE_CREATE)
+    fcpl.set_link_creation_order(h5p.CRT_ORDER_TRACKED | h5p.CRT_ORDER_INDEXED)
+    return fcpl
+
+
 def make_fid(name, mode, userblock_size, fapl, fcpl=None, swmr=False):
     """ Get a new FileID by opening or creating a file.
     Also validates mode argument."""
@@ -230,7 +277,11 @@ class File(Group):
                 raise ValueError("It is not possible to forcibly switch SWMR mode off.")
 
     def __init__(self, name, mode=None, driver=None,
-                 libver=None, userblock_size=None, swmr=False, **kwds):
+                 libver=None, userblock_size=None, swmr=False,
+                 alignment=None, sieve_buf_size=None, meta_block_size=None,
+                 small_data_block_size=None, use_index=False,
+                 object_cache=0, track_order=False, auto_compact_threshold=0,
+                 **kwds):
         """Create a new file object.
 
         See the h5py user guide for a detailed explanation of the options.
@@ -255,11 +306,53 @@ class File(Group):
             file (mode w, w- or x).
         swmr
             Open the file in SWMR read mode. Only used when mode = 'r'.
+        alignment
+            2-tuple (threshold, alignment).  Any file object of at least
+            "threshold" bytes is placed at a multiple of "alignment" bytes,
+            e.g. the stripe size of a parallel filesystem.
+        sieve_buf_size
+            Maximum size (in bytes) of the data sieve buffer used to
+            combine small raw data reads and writes.
+        meta_block_size
+            Minimum size (in bytes) of the blocks allocated for metadata.
+        small_data_block_size
+            Size (in bytes) of the blocks used to aggregate small
+            contiguous datasets.
+        use_index
+            Use the sidecar index built by h5py.index.build(), if it is
+            up to date, to answer "in", keys() and get(getclass=True) for
+            the file without walking its metadata.  Only for mode 'r'.
+        object_cache
+            Keep up to this many objects opened through the File (e.g.
+            f['entry/data']) and return them again on repeated lookups of
+            the same path.  0 (default) disables the cache.
+        track_order
+            Track and index the creation order of the root group's
+            members, as for Group.create_group.  Only used when creating
+            a file.
+        auto_compact_threshold
+            While this File object is open, datasets created anywhere in
+            the file with at most this many bytes of fixed-size data, and
+            no need for chunking, are stored in their object headers
+            (compact layout).  At most 64000; 0 (default) disables this.
         Additional keywords
             Passed on to the selected file driver.
         """
         if swmr and not swmr_support:
             raise ValueError("The SWMR feature is not available in this version of the HDF5 library")
+        if use_index and mode != 'r':
+            raise ValueError("Sidecar indexes can only be used in mode 'r'")
+
+        self._index = None
+        self._object_cache = None
+        self._settings = None
+
+        try:
+            auto_compact_threshold = int(auto_compact_threshold)
+        except (TypeError, ValueError):
+            raise TypeError('"auto_compact_threshold" must be an integer')
+        if not 0 <= auto_compact_threshold <= 64000:
+            raise ValueError('"auto_compact_threshold" must be between 0 and 64000')
 
         with phil:
             if isinstance(name, _objects.ObjectID):
@@ -267,19 +360,95 @@ class File(Group):
             else:
                 name = fsencode(fspath(name))
 
-                fapl = make_fapl(driver, libver, **kwds)
-                fid = make_fid(name, mode, userblock_size, fapl, swmr=swmr)
+                fapl = make_fapl(driver, libver, alignment, sieve_buf_size,
+                                 meta_block_size, small_data_block_size,
+                                 **kwds)
+                fid = make_fid(name, mode, userblock_size, fapl,
+                               fcpl=make_fcpl(track_order), swmr=swmr)
+
+                if use_index:
+                    self._index = index.load(name)
 
                 if swmr_support:
                     self._swmr_mode = False
                     if swmr and mode == 'r':
                         self._swmr_mode = True
 
+            if object_cache:
+                self._object_cache = objcache.ObjectCache(fid, object_cache)
+            if auto_compact_threshold:
+                self._settings = base.FileSettings(
+                    fid, auto_compact_threshold=auto_compact_threshold)
+
             Group.__init__(self, fid)
 
+    @property
+    def index(self):
+        """ Sidecar index (h5py.index.FileIndex) in use, or None """
+        return self._index
+
+    @property
+    def object_cache(self):
+        """ Cache of opened objects (see the object_cache keyword), or None """
+        return self._object_cache
+
+    @with_phil
+    def __getitem__(self, name):
+        """ Open an object in the file """
+        if self._object_cache is None or not isinstance(name, (bytes, six.text_type)):
+            return Group.__getitem__(self, name)
+        key = objcache.normalize(self._e(name))
+        obj = self._object_cache.get(key)
+        if obj is None:
+            obj = Group.__getitem__(self, name)
+            self._object_cache.put(key, obj)
+        return obj
+
+    @with_phil
+    def __contains__(self, name):
+        """ Test if a member name exists """
+        if self._index is not None and isinstance(name, six.string_types):
+            if name in self._index:
+                return True
+            if self._index.complete:
+                return False
+        return Group.__contains__(self, name)
+
+    @with_phil
+    def __iter__(self):
+        """ Iterate over member names """
+        if self._index is None:
+            for name in Group.__iter__(self):
+                yield name
+        else:
+            for name in self._index.keys():
+                yield name
+
+    def get(self, name, default=None, getclass=False, getlink=False):
+        """ Retrieve an item or other information, as for Group.get """
+        # pylint: disable=arguments-differ
+        with phil:
+            if self._index is not None and isinstance(name, six.string_types) \
+               and getclass:
+                entry = self._index.get(name)
+                if entry is None and self._index.complete:
+                    return default
+                if entry is not None and getlink:
+                    return entry.linktype
+                if entry is not None and entry.objtype is not None:
+                    return entry.objtype
+            return Group.get(self, name, default, getclass, getlink)
+
     def close(self):
         """ Close the file.  All open objects become invalid """
         with phil:
+            if self._object_cache is not None:
+                self._object_cache.detach()
+            if self._settings is not None:
+                self._settings.detach()
+            if self.id:
+                objcache.invalidate(self.id)
+
             # We have to explicitly murder all open objects related to the file
 
             # Close file-resident objects first, then the files.
@@ -14,6 +14,8 @@
 from __future__ import absolute_import
 
 import posixpath as pp
+from collections import namedtuple, OrderedDict
+
 import six
 import numpy
 
@@ -21,11 +23,26 @@ from .compat import fsdecode
 from .compat import fsencode
 from .compat import fspath
 
-from .. import h5g, h5i, h5o, h5r, h5t, h5l, h5p
+from .. import h5, h5d, h5g, h5i, h5o, h5r, h5s, h5t, h5l, h5p
 from . import base
-from .base import HLObject, MutableMappingHDF5, phil, with_phil
+from . import filters
+from . import objcache
+from .base import HLObject, MutableMappingHDF5, phil, with_phil, Empty
 from . import dataset
 from . import datatype
+from .vds import vds_support
+
+
+GroupEntry = namedtuple('GroupEntry',
+                        ['name', 'linktype', 'objtype', 'addr', 'num_attrs'])
+
+CATALOG_FIELDS = ('shape', 'dtype', 'chunks', 'filters', 'attrs')
+
+# Parts of the object info needed by Group.entries() and Group.catalog()
+if hasattr(h5o, 'INFO_BASIC'):
+    _ENTRY_INFO = h5o.INFO_BASIC | h5o.INFO_NUM_ATTRS
+else:
+    _ENTRY_INFO = -1
 
 
 class Group(HLObject, MutableMappingHDF5):
@@ -41,15 +58,44 @@ class Group(HLObject, MutableMappingHDF5):
                 raise ValueError("%s is not a GroupID" % bind)
             HLObject.__init__(self, bind)
 
-    def create_group(self, name):
+    def create_group(self, name, track_order=False, link_storage=None,
+                     estimated_links=None, attr_storage=None):
         """ Create and return a new subgroup.
 
         Name may be absolute or relative.  Fails if the target name already
         exists.
+
+        track_order
+            Track and index the creation order of the group's members, so
+            that they are iterated in that order and can be retrieved by
+            position with get_by_index().
+        link_storage
+            "dense" to store links in an indexed heap from the start,
+            rather than in the group's header until there are more than
+            8, or a tuple (max_compact, min_dense) of thresholds.
+        estimated_links
+            Expected number of links, used to size the group's initial
+            storage (at most 65535 are taken into account).
+        attr_storage
+            As link_storage, for the group's attributes.
         """
         with phil:
             name, lcpl = self._e(name, lcpl=True)
-            gid = h5g.create(self.id, name, lcpl=lcpl)
+            gcpl = None
+            if track_order or link_storage is not None \
+               or estimated_links is not None or attr_storage is not None:
+                gcpl = h5p.create(h5p.GROUP_CREATE)
+            if track_order:
+                gcpl.set_link_creation_order(h5p.CRT_ORDER_TRACKED | h5p.CRT_ORDER_INDEXED)
+            if link_storage is not None:
+                gcpl.set_link_phase_change(*base.storage_thresholds(link_storage, 'link_storage'))
+            if estimated_links is not None:
+                # HDF5 rejects estimates of 65536 or more
+                est_name_len = gcpl.get_est_link_info()[1]
+                gcpl.set_est_link_info(min(estimated_links, 65535), est_name_len)
+            if attr_storage is not None:
+                gcpl.set_attr_phase_change(*base.storage_thresholds(attr_storage, 'attr_storage'))
+            gid = h5g.create(self.id, name, lcpl=lcpl, gcpl=gcpl)
             return Group(gid)
 
     def create_dataset(self, name, shape=None, dtype=None, data=None, **kwds):
@@ -103,14 +149,152 @@ class Group(HLObject, MutableMappingHDF5):
             (Scalar) Use this value for uninitialized parts of the dataset.
         track_times
             (T/F) Enable dataset creation timestamps.
+        layout
+            (String) 'compact' to store the data in the dataset's header
+            (at most 64 KiB, no chunking or filters), or 'contiguous'.  By
+            default, small datasets are made compact if the File was opened
+            with auto_compact_threshold.
+        alloc_time
+            (String) When space for the data is allocated in the file:
+            'early' (at creation), 'incr' (as chunks are written; the
+            default for chunked datasets) or 'late' (on first write).
+        fill_time
+            (String) When allocated space is initialized with the fill
+            value: 'alloc' (the default for chunked datasets), 'ifset' (only
+            if a fillvalue was given) or 'never'.  Unwritten parts of a
+            dataset created with 'never' read back as arbitrary data.
+        track_order
+            (T/F) Track and index the creation order of the dataset's
+            attributes.  This also gives the dataset a new-style header, so
+            attr_storage takes effect whatever the file's libver.
+        encoding
+            (String) Use 'dictionary' to store string data as integer codes,
+            with the distinct strings kept in a vocabulary attribute.  "dtype"
+            then sets the type of the codes.  Read the strings back through
+            the dataset's "decoded" reader.  The vocabulary is kept in dense
+            attribute storage, which has no 64 KiB limit.
         """
+        encoding = kwds.pop('encoding', None)
         with phil:
+            if encoding is not None:
+                if encoding != 'dictionary':
+                    raise ValueError("Unknown encoding %r" % (encoding,))
+                if data is None:
+                    raise TypeError("Dictionary encoding requires data")
+                data, vocab, vtype = dataset.dictionary_encode(data, dtype)
+                dtype = data.dtype
+                # Compact attributes must fit in a 64 KiB header message
+                kwds.setdefault('track_order', True)
+                kwds.setdefault('attr_storage', 'dense')
+            self._compact_threshold(kwds)
             dsid = dataset.make_new_dset(self, shape, dtype, data, **kwds)
             dset = dataset.Dataset(dsid)
+            if encoding is not None:
+                dset.attrs.create(dataset.VOCABULARY_ATTR, vocab, dtype=vtype)
             if name is not None:
                 self[name] = dset
             return dset
 
+    def _compact_threshold(self, kwds):
+        """ Apply the file's auto_compact_threshold to dataset keywords """
+        if kwds.get('layout') is None:
+            settings = base.file_settings(self.id)
+            if settings is not None:
+                kwds['compact_threshold'] = settings.auto_compact_threshold
+
+    def create_datasets(self, items, **kwds):
+        """ Create many datasets at once.
+
+        items
+            Mapping, or iterable of (name, data) pairs.  Each dataset takes
+            its shape, and unless "dtype" is given its type, from its data.
+
+        Other keywords are as for create_dataset (dtype, chunks,
+        compression, fillvalue, track_times...) and apply to every dataset.
+        The HDF5 type, dataspace and creation property list are built once
+        for each distinct shape and dtype, and missing parent groups are
+        created in a single pass, as by require_groups().
+
+        Nothing is returned: keeping thousands of datasets open slows HDF5
+        down, so each is closed once written.  Open them by name as needed.
+        """
+        if hasattr(items, 'items'):
+            items = items.items()
+        dtype = kwds.pop('dtype', None)
+
+        with phil:
+            items = [(self._e(name), name, data) for name, data in items]
+
+            parents = {}
+            for ename, name, data in items:
+                if b'/' in ename:
+                    parents.setdefault(ename.rpartition(b'/')[0] or b'/', None)
+            paths = list(parents)
+            for path, grp in zip(paths, self.require_groups(paths)):
+                parents[path] = grp.id
+
+            self._compact_threshold(kwds)
+            lcpls = {}
+            templates = {}
+            for ename, name, data in items:
+                shape, data = dataset.check_dset_data(None, dtype, data)
+
+                if isinstance(dtype, datatype.Datatype):
+                    dt = dtype
+                else:
+                    dt = numpy.dtype(dtype if dtype is not None else data.dtype)
+                    # Types h5py describes through dtype metadata (strings,
+                    # enums, references) don't compare reliably; rebuild them
+                    if dt.hasobject or dt.metadata is not None or dt.names is not None:
+                        dt = None
+                key = (shape, dt, isinstance(data, Empty))
+                template = templates.get(key) if dt is not None else None
+                if template is None:
+                    template = dataset.make_dset_template(shape, dtype, data, **kwds)
+                    if dt is not None:
+                        templates[key] = template
+                tid, sid, dcpl = template
+
+                if b'/' in ename:
+                    head, _, leaf = ename.rpartition(b'/')
+                    loc = parents[head or b'/']
+                else:
+                    leaf, loc = ename, self.id
+                coding = h5t.CSET_ASCII if isinstance(name, bytes) or \
+                         len(ename) == len(name) else h5t.CSET_UTF8
+                lcpl = lcpls.get(coding)
+                if lcpl is None:
+                    lcpl = lcpls[coding] = self._lcpl.copy()
+                    lcpl.set_char_encoding(coding)
+
+                dsid = h5d.create(loc, leaf, tid, sid, dcpl=dcpl, lcpl=lcpl)
+                if not isinstance(data, Empty):
+                    dsid.write(h5s.ALL, h5s.ALL, data)
+                dsid.close()
+
+    if vds_support:
+        def create_virtual_dataset(self, name, layout, fillvalue=None):
+            """ Create a new virtual dataset in this group.
+
+            name
+                Name of the dataset (absolute or relative).  Provide None to
+                make an anonymous dataset.
+            layout
+                VirtualLayout describing the dataset and the sources mapped
+                into it.
+            fillvalue
+                (Scalar) Value read from areas of the dataset which no
+                source maps to.
+
+            Requires HDF5 1.10 or later.
+            """
+            with phil:
+                dsid = layout.make_dataset(self, fillvalue=fillvalue)
+                dset = dataset.Dataset(dsid)
+                if name is not None:
+                    self[name] = dset
+                return dset
+
     def require_dataset(self, name, shape, dtype, exact=False, **kwds):
         """ Open a dataset, creating it if it doesn't exist.
 
@@ -157,6 +341,129 @@ class Group(HLObject, MutableMappingHDF5):
                 raise TypeError("Incompatible object (%s) already exists" % grp.__class__.__name__)
             return grp
 
+    def _walk_paths(self, paths, step, parents=False):
+        """ Walk the groups along many paths, sharing common prefixes.
+
+        Paths are visited in sorted order, keeping the chain of groups
+        leading to the previous path open, so each group is opened once
+        per batch rather than once per path.  step(parent, name, path) is
+        called to go from a group to its member "name" (bytes) on the way
+        along "path"; it returns the member's GroupID, or None if the walk
+        can't continue.
+
+        Returns a list, in input order, of (GroupID, last) tuples.  With
+        "parents", the walk stops at the group containing the last
+        component, which is returned as "last" (None if the path names the
+        starting group itself, or ends in "." and so must name a group).
+        Otherwise "last" is None and GroupID is the group named by the path.
+        GroupID is None if the walk stopped early; empty paths give
+        (None, None).
+        """
+        items = []
+        for idx, path in enumerate(paths):
+            name = self._e(path)
+            parts = tuple(x for x in name.split(b'/') if x)
+            isgroup = len(parts) > 0 and parts[-1] == b'.'
+            parts = tuple(x for x in parts if x != b'.')
+            items.append((name.startswith(b'/'), parts, isgroup, idx, name, path))
+        items.sort()
+
+        out = [(None, None)]*len(items)
+        chain = []      # [(parts, GroupID)] from the starting group down
+        base = None
+        for absolute, parts, isgroup, idx, name, path in items:
+            if len(name) == 0:
+                continue
+            if base != absolute:
+                base = absolute
+                root = h5o.open(self.id, b'/', lapl=self._lapl) if absolute else self.id
+                chain = [((), root)]
+
+            last = None
+            if parents and len(parts) > 0 and not isgroup:
+                parts, last = parts[:-1], parts[-1]
+
+            # Keep the part of the chain this path shares with the last one
+            depth = 1
+            while depth < len(chain) and depth <= len(parts) \
+                  and chain[depth][0][-1] == parts[depth-1]:
+                depth += 1
+            del chain[depth:]
+
+            while len(chain) <= len(parts):
+                parent = chain[-1][1]
+                gid = None
+                if parent is not None:
+                    gid = step(parent, parts[len(chain)-1], path)
+                chain.append((parts[:len(chain)], gid))
+            out[idx] = (chain[len(parts)][1], last)
+        return out
+
+    @with_phil
+    def exists_many(self, paths):
+        """ Test whether each of several paths exists.
+
+        Returns a list of bools in the same order as "paths", with the same
+        meaning as "path in group".  Paths are sorted and walked together,
+        so groups along shared prefixes are only looked up once.
+        """
+        paths = list(paths)
+        lapl = self._lapl
+
+        def step(parent, name, path):
+            """ Open the subgroup "name", if there is one """
+            if not parent.links.exists(name, lapl=lapl):
+                return None
+            try:
+                oid = h5o.open(parent, name, lapl=lapl)
+            except KeyError:
+                return None
+            return oid if isinstance(oid, h5g.GroupID) else None
+
+        out = []
+        for path, (gid, last) in zip(paths, self._walk_paths(paths, step, True)):
+            if gid is None:
+                out.append(False)
+            elif last is None:
+                out.append(True)
+            else:
+                out.append(gid.links.exists(last, lapl=lapl))
+        return out
+
+    @with_phil
+    def require_groups(self, paths):
+        """ Return groups for several paths, creating any that don't exist.
+
+        Returns a list of Group objects in the same order as "paths".  As
+        for require_group, TypeError is raised if something other than a
+        group already exists along one of the paths.  Paths are sorted and
+        walked together, so groups along shared prefixes are only looked up
+        (or created) once.
+        """
+        paths = list(paths)
+        lapl = self._lapl
+        classes = {h5i.DATASET: dataset.Dataset,
+                   h5i.DATATYPE: datatype.Datatype}
+
+        def step(parent, name, path):
+            """ Open or create the subgroup "name" """
+            if parent.links.exists(name, lapl=lapl):
+                oid = h5o.open(parent, name, lapl=lapl)
+                if not isinstance(oid, h5g.GroupID):
+                    cls = classes.get(h5i.get_type(oid), HLObject)
+                    raise TypeError("Incompatible object (%s) already exists in %r"
+                                    % (cls.__name__, path))
+                return oid
+            lcpl = self._e(path, lcpl=True)[1]
+            return h5g.create(parent, name, lcpl=lcpl)
+
+        out = []
+        for path, (gid, last) in zip(paths, self._walk_paths(paths, step)):
+            if gid is None:
+                raise ValueError("Empty group name %r" % (path,))
+            out.append(Group(gid))
+        return out
+
     @with_phil
     def __getitem__(self, name):
         """ Open an object in the file """
@@ -167,7 +474,11 @@ class Group(HLObject, MutableMappingHDF5):
                 raise ValueError("Invalid HDF5 object reference")
         else:
             oid = h5o.open(self.id, self._e(name), lapl=self._lapl)
+        return self._wrap(oid)
 
+    @staticmethod
+    def _wrap(oid):
+        """ Create the high-level object for an opened low-level ObjectID """
         otype = h5i.get_type(oid)
         if otype == h5i.GROUP:
             return Group(oid)
@@ -178,6 +489,29 @@ class Group(HLObject, MutableMappingHDF5):
         else:
             raise TypeError("Unknown object type")
 
+    @with_phil
+    def get_by_index(self, index):
+        """ Open the member at a given position in the group.
+
+        Positions follow creation order for groups created with
+        track_order=True, and name order otherwise; negative positions
+        count from the end.  IndexError is raised for positions out of
+        range.
+        """
+        n = len(self)
+        if index < 0:
+            index += n
+        if not 0 <= index < n:
+            raise IndexError("Index %d out of range for group of %d members" % (index, n))
+        flags = self.id.get_create_plist().get_link_creation_order()
+        if flags & h5p.CRT_ORDER_INDEXED:
+            idx_type = h5.INDEX_CRT_ORDER
+        else:
+            idx_type = h5.INDEX_NAME
+        oid = h5o.open_by_idx(self.id, index, idx_type=idx_type,
+                              order=h5.ITER_INC, lapl=self._lapl)
+        return self._wrap(oid)
+
     def get(self, name, default=None, getclass=False, getlink=False):
         """ Retrieve an item or other information.
 
@@ -295,6 +629,7 @@ class Group(HLObject, MutableMappingHDF5):
     def __delitem__(self, name):
         """ Delete (unlink) an item from this group. """
         self.id.unlink(self._e(name))
+        objcache.invalidate(self.id)
 
     @with_phil
     def __len__(self):
@@ -312,6 +647,41 @@ class Group(HLObject, MutableMappingHDF5):
         """ Test if a member name exists """
         return self._e(name) in self.id
 
+    @with_phil
+    def entries(self):
+        """ List the members of this group without opening them.
+
+        Returns a list of GroupEntry named tuples (name, linktype, objtype,
+        addr, num_attrs) in name order.  "linktype" is HardLink, SoftLink
+        or ExternalLink.  For hard links, "objtype" is Group, Dataset or
+        Datatype, "addr" the object's address in the file and "num_attrs"
+        its number of attributes; soft and external links are not followed,
+        and these fields are None.
+        """
+        linkclasses = {h5l.TYPE_HARD: HardLink,
+                       h5l.TYPE_SOFT: SoftLink,
+                       h5l.TYPE_EXTERNAL: ExternalLink}
+        objclasses = {h5o.TYPE_GROUP: Group,
+                      h5o.TYPE_DATASET: dataset.Dataset,
+                      h5o.TYPE_NAMED_DATATYPE: datatype.Datatype}
+        out = []
+
+        def entry_cb(name, linfo):
+            """ Callback to record each link """
+            if linfo.type == h5l.TYPE_HARD:
+                oinfo = h5o.get_info(self.id, name, lapl=self._lapl,
+                                     fields=_ENTRY_INFO)
+                entry = GroupEntry(self._d(name), HardLink,
+                                   objclasses.get(oinfo.type),
+                                   oinfo.addr, oinfo.num_attrs)
+            else:
+                entry = GroupEntry(self._d(name), linkclasses.get(linfo.type),
+                                   None, None, None)
+            out.append(entry)
+
+        self.id.links.iterate(entry_cb, info=True, order=h5.ITER_INC)
+        return out
+
     def copy(self, source, dest, name=None,
              shallow=False, expand_soft=False, expand_external=False,
              expand_refs=False, without_attrs=False):
@@ -404,6 +774,7 @@ class Group(HLObject, MutableMappingHDF5):
                 return
             self.id.links.move(self._e(source), self.id, self._e(dest),
                                lapl=self._lapl, lcpl=self._lcpl)
+            objcache.invalidate(self.id)
 
     def visit(self, func):
         """ Recursively visit all names in this group and subgroups (HDF5 1.8).
@@ -462,6 +833,81 @@ class Group(HLObject, MutableMappingHDF5):
                 return func(name, self[name])
             return h5o.visit(self.id, proxy)
 
+    @with_phil
+    def catalog(self, include=('shape', 'dtype', 'chunks', 'filters', 'attrs')):
+        """ Describe every object below this group, in one pass.
+
+        Returns an OrderedDict of equal-length lists, one entry per object,
+        suitable for e.g. pandas.DataFrame.  The columns "name" (path
+        relative to this group), "objtype" (Group, Dataset or Datatype),
+        "addr" and "num_attrs" are always present.  "include" picks any of:
+
+        shape
+            Shape of datasets
+        dtype
+            NumPy dtype of datasets and named types
+        chunks
+            Chunk shape of chunked datasets
+        filters
+            Dictionary of the filters applied to datasets, as for
+            Dataset.compression and friends
+        attrs
+            Dictionary of the attributes of every object
+
+        Columns which don't apply to an object hold None.  Objects reachable
+        through several hard links are listed once, under the first name
+        found; soft and external links are not followed.  Objects are only
+        opened when the extra columns need them, and no high-level Group or
+        Dataset instances are made.  Reading "attrs" opens every object
+        which has attributes, so leave it out of "include" when it isn't
+        needed.
+        """
+        include = tuple(include)
+        for key in include:
+            if key not in CATALOG_FIELDS:
+                raise ValueError("Unknown catalog field %r (must be one of %s)"
+                                 % (key, ', '.join(CATALOG_FIELDS)))
+
+        objclasses = {h5o.TYPE_GROUP: Group,
+                      h5o.TYPE_DATASET: dataset.Dataset,
+                      h5o.TYPE_NAMED_DATATYPE: datatype.Datatype}
+        keys = ('name', 'objtype', 'addr', 'num_attrs') + include
+        out = OrderedDict((key, []) for key in keys)
+        dset_keys = set(include) & set(CATALOG_FIELDS[:4])
+
+        def catalog_cb(name, oinfo):
+            """ Callback to record each object """
+            row = dict.fromkeys(include)
+            row['name'] = self._d(name)
+            row['objtype'] = objclasses.get(oinfo.type)
+            row['addr'] = oinfo.addr
+            row['num_attrs'] = oinfo.num_attrs
+
+            if (oinfo.type == h5o.TYPE_DATASET and dset_keys) or \
+               (oinfo.type == h5o.TYPE_NAMED_DATATYPE and 'dtype' in dset_keys) or \
+               ('attrs' in include and oinfo.num_attrs):
+                oid = h5o.open(self.id, name)
+                if oinfo.type == h5o.TYPE_DATASET:
+                    row['shape'] = oid.shape
+                    row['dtype'] = oid.dtype
+                    if 'chunks' in dset_keys or 'filters' in dset_keys:
+                        dcpl = oid.get_create_plist()
+                        if dcpl.get_layout() == h5d.CHUNKED:
+                            row['chunks'] = dcpl.get_chunk()
+                        row['filters'] = filters.get_filters(dcpl)
+                elif oinfo.type == h5o.TYPE_NAMED_DATATYPE:
+                    row['dtype'] = oid.dtype
+                if 'attrs' in include:
+                    row['attrs'] = base.HLObject(oid).attrs.read_all()
+            elif 'attrs' in include:
+                row['attrs'] = {}
+
+            for key in keys:
+                out[key].append(row.get(key))
+
+        h5o.visit(self.id, catalog_cb, info=True, fields=_ENTRY_INFO)
+        return out
+
     @with_phil
     def __repr__(self):
         if not self:
@@ -0,0 +1,431 @@
+# This file is part of h5py, a Python interface to the HDF5 library.
+#
+# http://www.h5py.org
+#
+# Copyright 2008-2013 Andrew Collette and contributors
+#
+# License:  Standard 3-clause BSD; see "license.txt" for full license terms
+#           and contributor agreement.
+
+"""
+    Implements sidecar metadata indexes for large files.
+
+    An index records every link in a file, together with the type, address,
+    shape, dtype and chunk shape of the objects they point to and the values
+    of chosen attributes.  It is kept next to the file ("<name>.h5pyidx")
+    in a flat binary format which is memory-mapped when loaded, so that
+    names can be listed and looked up without walking the file's own
+    metadata.
+
+    The index remembers the size, modification time and superblock of the
+    file it was built from, and is ignored once any of these change.
+"""
+
+from __future__ import absolute_import
+
+import os
+import json
+import base64
+import bisect
+import hashlib
+import struct
+import posixpath as pp
+from collections import namedtuple
+
+import six
+import numpy
+
+from .compat import fspath, fsencode
+from .base import phil, with_phil, HLObject
+from .group import Group, HardLink, SoftLink, ExternalLink
+from .dataset import Dataset
+from .datatype import Datatype
+from .. import h5d, h5l, h5o, h5t
+
+SUFFIX = '.h5pyidx'
+
+_MAGIC = b'H5PYIDX\x01'
+_SIGNATURE = b'\x89HDF\r\n\x1a\n'
+_ALIGN = 8
+
+IndexEntry = namedtuple('IndexEntry', ['name', 'linktype', 'objtype', 'addr',
+                                       'num_attrs', 'shape', 'dtype', 'chunks'])
+
+
+def index_name(name):
+    """ Name of the sidecar index for the HDF5 file "name" """
+    name = fspath(name)
+    if isinstance(name, bytes):
+        return name + fsencode(SUFFIX)
+    return name + SUFFIX
+
+
+def _file_state(name):
+    """ Describe the state of a file on disk, for invalidating indexes.
+
+    Returns a dictionary with the file's size, modification time and a
+    digest of the superblock, which HDF5 looks for at offset 0, 512, 1024,
+    2048, ...
+    """
+    st = os.stat(name)
+    digest = None
+    with open(name, 'rb') as f:
+        offset = 0
+        while offset < st.st_size:
+            f.seek(offset)
+            block = f.read(256)
+            if block.startswith(_SIGNATURE):
+                digest = hashlib.sha1(block).hexdigest()
+                break
+            offset = 512 if offset == 0 else offset*2
+    return {'size': st.st_size, 'mtime': st.st_mtime, 'superblock': digest}
+
+
+def _normalize(name):
+    """ Convert a path to the form used in the index (no leading slash) """
+    name = pp.normpath(name).lstrip('/')
+    return '' if name == '.' else name
+
+
+def _jsonable(value):
+    """ Convert an attribute value to something JSON can store """
+    if isinstance(value, numpy.ndarray):
+        return [_jsonable(x) for x in value.tolist()]
+    if isinstance(value, (list, tuple)):
+        return [_jsonable(x) for x in value]
+    if isinstance(value, numpy.generic):
+        return _jsonable(value.item())
+    if isinstance(value, bytes):
+        return value.decode('utf8', 'replace')
+    json.dumps(value)   # Raise TypeError now for anything else
+    return value
+
+
+def _packed(seqs):
+    """ Pack a list of integer sequences (or None) into (ndim, offsets,
+    values) arrays, with ndim -1 for None """
+    ndim = numpy.array([-1 if s is None else len(s) for s in seqs], dtype='i1')
+    lengths = numpy.maximum(ndim, 0).astype('i8')
+    offsets = numpy.zeros(len(seqs)+1, dtype='i8')
+    numpy.cumsum(lengths, out=offsets[1:])
+    values = numpy.fromiter((x for s in seqs if s is not None for x in s),
+                            dtype='i8', count=int(offsets[-1]))
+    return ndim, offsets, values
+
+
+def _align(n):
+    return (n + _ALIGN - 1) // _ALIGN * _ALIGN
+
+
+def build(name, attrs=(), path=None):
+    """ Build the sidecar index of an HDF5 file.
+
+    name
+        Name of the HDF5 file on disk.
+    attrs
+        Names of attributes whose values should be recorded, for objects
+        which have them.  Values must be numbers, strings or arrays of
+        those; they are stored as JSON, so arrays come back as lists.
+    path
+        Where to write the index.  Defaults to the file name plus
+        ".h5pyidx", which is where File(..., use_index=True) looks.
+
+    Returns the name of the index file.
+    """
+    from .files import File
+
+    if path is None:
+        path = index_name(name)
+    attrs = tuple(attrs)
+
+    with phil:
+        state = _file_state(name)
+        names, links, infos = [], [], {}
+        with File(name, 'r') as f:
+            fid = f.id
+
+            def link_cb(lname, linfo):
+                """ Record each link, and each object the first time """
+                names.append(lname)
+                if linfo.type != h5l.TYPE_HARD:
+                    links.append((linfo.type, None))
+                    return
+                addr = linfo.u
+                if addr not in infos:
+                    infos[addr] = _object_info(fid, lname, attrs)
+                links.append((linfo.type, addr))
+
+            fid.links.visit(link_cb, info=True)
+
+            # Groups with several hard links are only descended into once,
+            # and soft or external links are not followed at all, so names
+            # below them are missing
+            seen = set()
+            complete = True
+            for linktype, addr in links:
+                if linktype != h5l.TYPE_HARD:
+                    complete = False
+                elif infos[addr][0] == h5o.TYPE_GROUP:
+                    if addr in seen:
+                        complete = False
+                    seen.add(addr)
+
+    _write_index(path, state, complete, attrs, names, links, infos)
+    return path
+
+
+def _object_info(fid, name, attrs):
+    """ Get (objtype, num_attrs, shape, dtype encoding, chunks, attribute
+    values) for the object at "name" """
+    oinfo = h5o.get_info(fid, name)
+    shape = chunks = tid = None
+    values = {}
+    if oinfo.type in (h5o.TYPE_DATASET, h5o.TYPE_NAMED_DATATYPE) or \
+       (attrs and oinfo.num_attrs):
+        oid = h5o.open(fid, name)
+        if oinfo.type == h5o.TYPE_DATASET:
+            shape = oid.shape
+            tid = oid.get_type()
+            dcpl = oid.get_create_plist()
+            if dcpl.get_layout() == h5d.CHUNKED:
+                chunks = dcpl.get_chunk()
+        elif oinfo.type == h5o.TYPE_NAMED_DATATYPE:
+            tid = oid
+        if attrs and oinfo.num_attrs:
+            manager = HLObject(oid).attrs
+            for aname in attrs:
+                if aname in manager:
+                    try:
+                        values[aname] = _jsonable(manager[aname])
+                    except TypeError:
+                        pass
+    encoded = None
+    if tid is not None:
+        # Committed types can't be serialized; their copies can
+        encoded = base64.b64encode(tid.copy().encode()).decode('ascii')
+    return (oinfo.type, oinfo.num_attrs, shape, encoded, chunks, values)
+
+
+def _write_index(path, state, complete, attrs, names, links, infos):
+    """ Sort the collected links by name and write the index file """
+    order = sorted(range(len(names)), key=names.__getitem__)
+    names = [names[i] for i in order]
+    links = [links[i] for i in order]
+    rows = dict((n, i) for i, n in enumerate(names))
+
+    nodata = (-1, 0, None, None, None, {})
+    info = [nodata if addr is None else infos[addr] for _, addr in links]
+
+    dtypes = []
+    dtype_rows = {}
+    dtype_index = numpy.empty(len(names), dtype='i4')
+    for i, item in enumerate(info):
+        key = item[3]
+        if key is None:
+            dtype_index[i] = -1
+            continue
+        if key not in dtype_rows:
+            dtype_rows[key] = len(dtypes)
+            dtypes.append(key)
+        dtype_index[i] = dtype_rows[key]
+
+    encoded = [n.encode('utf8') if isinstance(n, six.text_type) else n
+               for n in names]
+    name_offsets = numpy.zeros(len(names)+1, dtype='i8')
+    numpy.cumsum([len(n) for n in encoded], out=name_offsets[1:])
+    ndim, shape_offsets, shapes = _packed([x[2] for x in info])
+    chunk_ndim, chunk_offsets, chunks = _packed([x[4] for x in info])
+
+    arrays = [
+        ('names', numpy.frombuffer(b''.join(encoded), dtype='u1')),
+        ('name_offsets', name_offsets),
+        ('parent', numpy.array([rows.get(pp.dirname(n), -1) for n in names],
+                               dtype='i8')),
+        ('linktype', numpy.array([l[0] for l in links], dtype='i2')),
+        ('objtype', numpy.array([x[0] for x in info], dtype='i1')),
+        ('addr', numpy.array([0 if a is None else a for _, a in links],
+                             dtype='u8')),
+        ('num_attrs', numpy.array([x[1] for x in info], dtype='i8')),
+        ('ndim', ndim), ('shape_offsets', shape_offsets), ('shapes', shapes),
+        ('chunk_ndim', chunk_ndim), ('chunk_offsets', chunk_offsets),
+        ('chunks', chunks),
+        ('dtype', dtype_index)]
+
+    layout = {}
+    offset = 0
+    for key, arr in arrays:
+        layout[key] = [offset, arr.dtype.str, len(arr)]
+        offset += _align(arr.nbytes)
+
+    header = {'state': state, 'complete': complete, 'count': len(names),
+              'arrays': layout, 'dtypes': dtypes, 'attr_names': list(attrs),
+              'attrs': dict((str(i), x[5]) for i, x in enumerate(info) if x[5])}
+    header = json.dumps(header).encode('utf8')
+    start = _align(len(_MAGIC) + 8 + len(header))
+
+    with open(path, 'wb') as f:
+        f.write(_MAGIC)
+        f.write(struct.pack('<Q', len(header)))
+        f.write(header)
+        for key, arr in arrays:
+            f.seek(start + layout[key][0])
+            f.write(arr.tobytes())
+        f.truncate(start + offset)
+
+
+def load(name, path=None):
+    """ Load the sidecar index of an HDF5 file.
+
+    Returns a FileIndex, or None if there is no index, or if the file has
+    changed since the index was built.  "path" is as for build().
+    """
+    if path is None:
+        path = index_name(name)
+    try:
+        with open(path, 'rb') as f:
+            if f.read(len(_MAGIC)) != _MAGIC:
+                return None
+            hlen, = struct.unpack('<Q', f.read(8))
+            header = json.loads(f.read(hlen).decode('utf8'))
+        if header['state'] != _file_state(name):
+            return None
+    except (IOError, OSError, ValueError, KeyError):
+        return None
+    start = _align(len(_MAGIC) + 8 + hlen)
+    return FileIndex(path, header, start)
+
+
+class _Names(object):
+
+    """ Sequence of the UTF-8 encoded names in an index, for bisect """
+
+    def __init__(self, data, offsets):
+        self._data = memoryview(data)
+        self._offsets = offsets.tolist()
+
+    def __len__(self):
+        return len(self._offsets) - 1
+
+    def __getitem__(self, row):
+        return self._data[self._offsets[row]:self._offsets[row+1]].tobytes()
+
+
+class FileIndex(object):
+
+    """
+        A loaded sidecar index.  Paths may be given with or without a
+        leading slash; all are relative to the root group.
+    """
+
+    def __init__(self, path, header, start):
+        self.path = path
+        self._header = header
+        self._attrs = header['attrs']
+        self._dtypes = [None]*len(header['dtypes'])
+        self.complete = header['complete']
+        self.attr_names = tuple(header['attr_names'])
+
+        buf = numpy.memmap(path, dtype='u1', mode='r')
+        for key, (offset, dtype, length) in header['arrays'].items():
+            dtype = numpy.dtype(dtype)
+            if length == 0:
+                arr = numpy.empty((0,), dtype=dtype)
+            else:
+                arr = buf[start+offset:start+offset+length*dtype.itemsize]
+                arr = arr.view(dtype)
+            setattr(self, '_' + key, arr)
+        self._encoded = _Names(self._names, self._name_offsets)
+
+    def __len__(self):
+        """ Number of links in the file """
+        return len(self._linktype)
+
+    def _name(self, row):
+        """ Name of the link at row "row" """
+        return self._encoded[row].decode('utf8')
+
+    def _row(self, name):
+        """ Row of a normalized name, or -1 """
+        if isinstance(name, six.text_type):
+            name = name.encode('utf8')
+        row = bisect.bisect_left(self._encoded, name)
+        if row < len(self) and self._encoded[row] == name:
+            return row
+        return -1
+
+    def __contains__(self, name):
+        """ Test if a link exists """
+        name = _normalize(name)
+        return name == '' or self._row(name) >= 0
+
+    def keys(self, group='/'):
+        """ Names of the members of a group, in name order """
+        group = _normalize(group)
+        if group == '':
+            parent = -1
+        else:
+            parent = self._row(group)
+            if parent < 0:
+                raise KeyError("%s is not in the index" % group)
+        rows = numpy.flatnonzero(self._parent == parent)
+        return [self._name(row).rpartition('/')[2] for row in rows]
+
+    def get(self, name, default=None):
+        """ Get an IndexEntry describing a link, or "default" """
+        row = self._row(_normalize(name))
+        if row < 0:
+            return default
+
+        linktype = int(self._linktype[row])
+        objtype = int(self._objtype[row])
+        return IndexEntry(
+            self._name(row),
+            {h5l.TYPE_HARD: HardLink, h5l.TYPE_SOFT: SoftLink,
+             h5l.TYPE_EXTERNAL: ExternalLink}.get(linktype),
+            {h5o.TYPE_GROUP: Group, h5o.TYPE_DATASET: Dataset,
+             h5o.TYPE_NAMED_DATATYPE: Datatype}.get(objtype),
+            int(self._addr[row]) if linktype == h5l.TYPE_HARD else None,
+            int(self._num_attrs[row]) if linktype == h5l.TYPE_HARD else None,
+            self._unpack(row, self._ndim, self._shape_offsets, self._shapes),
+            self._dtype_of(row),
+            self._unpack(row, self._chunk_ndim, self._chunk_offsets,
+                         self._chunks))
+
+    @staticmethod
+    def _unpack(row, ndim, offsets, values):
+        """ Get the tuple stored for a row by _packed, or None """
+        if ndim[row] < 0:
+            return None
+        return tuple(int(x) for x in values[offsets[row]:offsets[row+1]])
+
+    @with_phil
+    def _dtype_of(self, row):
+        """ Decode the dtype of a row """
+        idx = self._dtype[row]
+        if idx < 0:
+            return None
+        if self._dtypes[idx] is None:
+            blob = base64.b64decode(self._header['dtypes'][idx])
+            self._dtypes[idx] = h5t.decode(blob).dtype
+        return self._dtypes[idx]
+
+    def attrs(self, name):
+        """ Dictionary of the recorded attributes of a link's object """
+        row = self._row(_normalize(name))
+        if row < 0:
+            raise KeyError("%s is not in the index" % name)
+        return dict(self._attrs.get(str(row), {}))
+
+    def find(self, attr, value=None):
+        """ Names of all links whose object has recorded attribute "attr"
+        (equal to "value", if given), in name order """
+        if attr not in self.attr_names:
+            raise ValueError("Attribute %r was not recorded in the index" % attr)
+        value = None if value is None else _jsonable(value)
+        rows = sorted(int(row) for row, values in self._attrs.items()
+                      if attr in values and
+                      (value is None or values[attr] == value))
+        return [self._name(row) for row in rows]
+
+    def __repr__(self):
+        return "<HDF5 sidecar index (%d links)>" % len(self)
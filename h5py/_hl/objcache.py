@@ -0,0 +1,125 @@
+# This file is part of h5py, a Python interface to the HDF5 library.
+#
+# http://www.h5py.org
+#
+# Copyright 2008-2013 Andrew Collette and contributors
+#
+# License:  Standard 3-clause BSD; see "license.txt" for full license terms
+#           and contributor agreement.
+
+"""
+    Implements the per-file cache of opened objects.
+
+    Looking up a path such as "entry/data/data" walks the group hierarchy
+    and opens a new HDF5 identifier every time.  Code which does this in a
+    loop spends most of its time in the lookup rather than in I/O.  A File
+    created with object_cache=N keeps up to N of the objects it opened,
+    keyed by absolute path, and hands them straight back.
+"""
+
+from __future__ import absolute_import
+
+import weakref
+from collections import OrderedDict
+
+from .base import phil, with_phil
+
+# Caches currently attached to open files
+_caches = weakref.WeakSet()
+
+
+def normalize(name):
+    """ Absolute form of a path relative to the root group, as bytes.
+
+    Repeated slashes and "." components are dropped, which is how HDF5
+    itself interprets them.
+    """
+    parts = [p for p in name.split(b'/') if p and p != b'.']
+    return b'/' + b'/'.join(parts)
+
+
+def invalidate(oid):
+    """ Empty every cache attached to the file containing "oid".
+
+    Called whenever links are removed or moved.  Soft and external links
+    mean one change can affect paths anywhere in the file, so the whole
+    cache is dropped rather than just the paths under the changed link.
+    """
+    if not _caches:
+        return
+    with phil:
+        fileno = oid.fileno
+        for cache in list(_caches):
+            if cache.fileno == fileno:
+                cache.clear()
+
+
+class ObjectCache(object):
+
+    """
+        Least-recently-used mapping of absolute paths to open objects.
+
+        Objects are only held while their identifiers are valid; anything
+        closed behind the cache's back is reopened on the next lookup.
+    """
+
+    def __init__(self, fid, maxsize):
+        try:
+            maxsize = int(maxsize)
+        except (TypeError, ValueError):
+            raise TypeError('"object_cache" must be an integer')
+        if maxsize < 0:
+            raise ValueError('"object_cache" must be non-negative')
+        self._objects = OrderedDict()
+        self._maxsize = maxsize
+        self.fileno = fid.fileno
+        _caches.add(self)
+
+    @property
+    def maxsize(self):
+        """ Maximum number of objects kept open """
+        return self._maxsize
+
+    @with_phil
+    def get(self, key):
+        """ Cached object for an absolute path, or None """
+        obj = self._objects.pop(key, None)
+        if obj is not None and obj.id.valid:
+            self._objects[key] = obj
+            return obj
+        return None
+
+    @with_phil
+    def put(self, key, obj):
+        """ Remember the object at an absolute path """
+        self._objects[key] = obj
+        while len(self._objects) > self._maxsize:
+            self._objects.popitem(last=False)
+
+    @with_phil
+    def clear(self):
+        """ Drop all cached objects """
+        self._objects.clear()
+
+    @with_phil
+    def detach(self):
+        """ Drop all cached objects and stop tracking the file """
+        self._objects.clear()
+        _caches.discard(self)
+
+    @with_phil
+    def __len__(self):
+        """ Number of objects currently cached """
+        return len(self._objects)
+
+    @with_phil
+    def __contains__(self, name):
+        """ Test if the object at a path is cached """
+        if not isinstance(name, bytes):
+            name = name.encode('utf8')
+        obj = self._objects.get(normalize(name))
+        return obj is not None and obj.id.valid
+
+    @with_phil
+    def __repr__(self):
+        return "<HDF5 object cache (%d of %d)>" % (len(self), self._maxsize)
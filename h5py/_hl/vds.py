@@ -0,0 +1,401 @@
+# This file is part of h5py, a Python interface to the HDF5 library.
+#
+# http://www.h5py.org
+#
+# Copyright 2008-2013 Andrew Collette and contributors
+#
+# License:  Standard 3-clause BSD; see "license.txt" for full license terms
+#           and contributor agreement.
+
+"""
+    High-level interface for creating and reading HDF5 virtual datasets
+"""
+
+from __future__ import absolute_import
+
+import os
+from copy import copy
+from collections import namedtuple
+
+import numpy
+
+try:
+    from math import gcd
+except ImportError:
+    from fractions import gcd
+
+from .compat import fspath, fsencode, fsdecode
+from .. import h5, h5s, h5t, h5d, h5p, h5i, h5f
+from .. import version
+from .selections import select, SimpleSelection
+
+hdf5_version = version.hdf5_version_tuple[0:3]
+
+vds_support = False
+if hdf5_version >= h5.get_config().vds_min_hdf5_version:
+    vds_support = True
+
+
+class VDSmap(namedtuple('VDSmap', ('vspace', 'file_name',
+                                   'dset_name', 'src_space'))):
+    """ Defines a region in a virtual dataset mapping to part of a source
+    dataset.
+    """
+
+
+class VirtualSource(object):
+
+    """
+        Source definition for virtual datasets.
+
+        Instances of this class represent a source dataset, or a selection
+        within it, to be mapped into a VirtualLayout.  They can be made from
+        an open Dataset, or from the name of a file and of a dataset inside
+        it (which need not exist yet), together with its shape:
+
+        >>> vsource = VirtualSource(f['data'])
+        >>> vsource = VirtualSource('raw_0.h5', 'data', shape=(100, 256))
+
+        Index a source with the usual slicing syntax to map only part of it:
+
+        >>> layout[0] = vsource[0, :]
+
+        Slicing always applies to the whole source dataset.
+    """
+
+    def __init__(self, path_or_dataset, name=None, shape=None, dtype=None):
+        from .dataset import Dataset
+        if isinstance(path_or_dataset, Dataset):
+            if any(x is not None for x in (name, shape, dtype)):
+                raise TypeError("If a Dataset is given, name, shape and "
+                                "dtype may not be specified")
+            dset = path_or_dataset
+            path = dset.file.filename
+            name = dset.name
+            shape = dset.shape
+            dtype = dset.dtype
+        else:
+            path = fspath(path_or_dataset)
+            if name is None:
+                raise TypeError("The name of the source dataset is required")
+            if shape is None:
+                raise TypeError("The shape of the source dataset is required")
+            shape = tuple(shape)
+
+        self.path = path
+        self.name = name
+        self.dtype = None if dtype is None else numpy.dtype(dtype)
+        self.sel = SimpleSelection(shape)
+
+    @property
+    def shape(self):
+        """ Shape of the whole source dataset """
+        return self.sel.shape
+
+    def __getitem__(self, key):
+        tmp = copy(self)
+        tmp.sel = select(self.shape, key, None)
+        return tmp
+
+
+class VirtualLayout(object):
+
+    """
+        Describes a virtual dataset, before it is created.
+
+        Map sources into the layout by assigning VirtualSource instances (or
+        Datasets) to slices of it; each assignment becomes one mapping.  The
+        number of elements selected on both sides must match:
+
+        >>> layout = VirtualLayout(shape=(4, 100), dtype='i4')
+        >>> for n in range(4):
+        ...     layout[n] = VirtualSource('raw_%d.h5' % n, 'data', shape=(100,))
+        >>> f.create_virtual_dataset('data', layout, fillvalue=-1)
+
+        Areas of the layout with no source mapped to them read as the fill
+        value.
+    """
+
+    def __init__(self, shape, dtype, maxshape=None):
+        self.shape = tuple(shape)
+        self.dtype = numpy.dtype(dtype)
+        if maxshape is not None:
+            maxshape = tuple(maxshape)
+            if len(maxshape) != len(self.shape):
+                raise ValueError('"maxshape" must have same rank as shape')
+        self.maxshape = maxshape
+        self.sources = []
+
+    def __setitem__(self, key, source):
+        if not isinstance(source, VirtualSource):
+            source = VirtualSource(source)
+        sel = select(self.shape, key, None)
+        if sel.nselect != source.sel.nselect:
+            raise ValueError("Mismatched number of elements: %d in layout, "
+                             "%d in source" % (sel.nselect, source.sel.nselect))
+        self.sources.append(VDSmap(sel.id, source.path, source.name,
+                                   source.sel.id))
+
+    def make_dataset(self, parent, fillvalue=None):
+        """ Return a new low-level dataset identifier for a virtual dataset
+
+        Only creates anonymous datasets.
+        """
+        dcpl = h5p.create(h5p.DATASET_CREATE)
+        if fillvalue is not None:
+            dcpl.set_fill_value(numpy.array([fillvalue], dtype=self.dtype))
+
+        if self.maxshape is not None:
+            maxshape = tuple(m if m is not None else h5s.UNLIMITED
+                             for m in self.maxshape)
+        else:
+            maxshape = None
+        virt_dspace = h5s.create_simple(self.shape, maxshape)
+
+        parent_path = os.path.realpath(parent.file.filename)
+        for vspace, fpath, dset_name, src_dspace in self.sources:
+            # Sources in the same file are referred to as "."
+            if os.path.realpath(fpath) == parent_path:
+                fpath = '.'
+            if not isinstance(dset_name, bytes):
+                dset_name = dset_name.encode('utf-8')
+            dcpl.set_virtual(vspace, fsencode(fpath), dset_name, src_dspace)
+
+        tid = h5t.py_create(self.dtype, logical=1)
+        return h5d.create(parent.id, None, tid, virt_dspace, dcpl=dcpl)
+
+
+class _Mapping(namedtuple('_Mapping', ('vlattice', 'slattice', 'axes',
+                                       'file_name', 'dset_name'))):
+    """ A parsed virtual mapping.  The lattices are (start, step, count)
+    per axis; "axes" pairs up the virtual and source axes with a count
+    above 1, which correspond to each other in order.
+    """
+
+
+def _lattice(space):
+    """ Describe the selection of a dataspace as one (start, step, count)
+    triple per axis, or return None if that's not possible.
+    """
+    seltype = space.get_select_type()
+    if seltype == h5s.SEL_ALL:
+        return [(0, 1, n) for n in space.shape]
+    if seltype != h5s.SEL_HYPERSLABS or not space.is_regular_hyperslab():
+        return None
+
+    lattice = []
+    for start, stride, count, block in zip(*space.get_regular_hyperslab()):
+        if count == h5s.UNLIMITED or block == h5s.UNLIMITED:
+            return None
+        if count == 1:
+            lattice.append((start, 1, block))
+        elif block == 1:
+            lattice.append((start, stride, count))
+        elif block == stride:
+            lattice.append((start, 1, count*block))
+        else:
+            return None
+    return lattice
+
+
+def _intersect(start, step, count, mstart, mstep, mcount):
+    """ Intersect the positions start + step*i (i < count) read along an
+    axis with the positions mstart + mstep*j (j < mcount) of a mapping.
+
+    Returns (i0, di, j0, dj, n), so that the common positions are at
+    i = i0 + di*k and j = j0 + dj*k for k < n, or None if there are none.
+    """
+    lo = max(start, mstart)
+    hi = min(start + step*(count - 1), mstart + mstep*(mcount - 1))
+    if lo > hi:
+        return None
+
+    # Common positions repeat every lcm(step, mstep), i.e. every "period"
+    # user positions, so the first one (if any) is found within a period.
+    period = mstep // gcd(step, mstep)
+    first = -(-(lo - start) // step)
+    for i in range(first, first + period):
+        pos = start + step*i
+        if pos > hi:
+            return None
+        if (pos - mstart) % mstep == 0:
+            break
+    else:
+        return None
+
+    n = (hi - pos) // (step*period) + 1
+    return i, period, (pos - mstart) // mstep, (step*period) // mstep, n
+
+
+class VDSReader(object):
+
+    """
+        Reads simple selections from a virtual dataset straight from its
+        source datasets.
+
+        The virtual mappings are parsed once, on the first read.  Each read
+        only touches the mappings which intersect the selection; the rest of
+        the output is set to the fill value without any I/O.  Source files
+        are opened through a FilePool, with the same intent as the file
+        holding the virtual dataset, and source datasets stay open for the
+        lifetime of the reader.
+
+        Mappings which can't be resolved the way HDF5 would (printf-style
+        source names, unlimited selections, non-regular hyperslabs or a
+        HDF5_VDS_PREFIX in the environment) disable the reader, and read()
+        returns False so the caller can use the library's own mapping.
+    """
+
+    def __init__(self, dsid, dcpl):
+        self._dsid = dsid
+        self._dcpl = dcpl
+        self._parsed = False
+        self._mappings = None
+        self._fill = None
+        self._pool = None
+        self._sources = {}
+
+    def _parse(self):
+        """ Parse the virtual mappings; None if any is unsupported """
+        if os.environ.get('HDF5_VDS_PREFIX'):
+            return None
+
+        dcpl = self._dcpl
+        mappings = []
+        for idx in range(dcpl.get_virtual_count()):
+            file_name = dcpl.get_virtual_filename(idx)
+            dset_name = dcpl.get_virtual_dsetname(idx)
+            if b'%' in file_name or b'%' in dset_name:
+                return None
+            vlattice = _lattice(dcpl.get_virtual_vspace(idx))
+            slattice = _lattice(dcpl.get_virtual_srcspace(idx))
+            if vlattice is None or slattice is None:
+                return None
+            vaxes = [ax for ax, lat in enumerate(vlattice) if lat[2] > 1]
+            saxes = [ax for ax, lat in enumerate(slattice) if lat[2] > 1]
+            if [vlattice[ax][2] for ax in vaxes] != \
+               [slattice[ax][2] for ax in saxes]:
+                return None
+            mappings.append(_Mapping(vlattice, slattice,
+                                     tuple(zip(vaxes, saxes)),
+                                     file_name, dset_name))
+
+        self._fill = numpy.zeros((1,), dtype=self._dsid.dtype)
+        dcpl.get_fill_value(self._fill)
+        return mappings
+
+    def _find_file(self, name):
+        """ Locate a source file, as HDF5 does without a prefix set """
+        if os.path.isabs(name):
+            if os.path.exists(name):
+                return name
+            name = os.path.basename(name)
+        vds_dir = os.path.dirname(fsdecode(h5f.get_name(self._dsid)))
+        for path in (os.path.join(vds_dir, name), name):
+            if os.path.exists(path):
+                return path
+        return None
+
+    def _source(self, idx, mapping):
+        """ Get the source DatasetID of a mapping, or None if the source
+        doesn't exist (it then reads as the fill value).
+        """
+        dsid = self._sources.get(idx)
+        if dsid is not None and dsid.valid:
+            return dsid
+
+        fid = h5i.get_file_id(self._dsid)
+        if mapping.file_name != b'.':
+            path = self._find_file(fsdecode(mapping.file_name))
+            if path is None:
+                return None
+            if self._pool is None:
+                # Imported here as filepool depends on this module
+                from .filepool import FilePool
+                names = set(m.file_name for m in self._mappings)
+                self._pool = FilePool(maxsize=len(names), elink_cache_size=0)
+            mode = 'r+' if fid.get_intent() & h5f.ACC_RDWR else 'r'
+            fid = self._pool.open(path, mode)
+
+        try:
+            dsid = h5d.open(fid, mapping.dset_name)
+        except KeyError:
+            return None
+        self._sources[idx] = dsid
+        return dsid
+
+    def read(self, selection, arr, mtype, dxpl=None):
+        """ Read a selection into "arr", which must be C-contiguous with
+        the selection's memory shape.
+
+        Returns True on success.  Returns False, having read nothing, if
+        the selection can't be handled here.
+        """
+        if not self._parsed:
+            self._mappings = self._parse()
+            self._parsed = True
+        if self._mappings is None or not isinstance(selection, SimpleSelection):
+            return False
+        if arr.dtype.hasobject or arr.shape != (selection.mshape or (1,)):
+            return False
+        if arr.dtype.names is not None and arr.dtype != self._fill.dtype:
+            return False
+
+        start, count, step, _ = selection._sel
+        nselect = selection.nselect
+
+        # Plan everything first, so a fallback happens before any I/O
+        plan = []
+        fill_needed = True
+        try:
+            for idx, mapping in enumerate(self._mappings):
+                hits = []
+                for ax, lattice in enumerate(mapping.vlattice):
+                    hit = _intersect(start[ax], step[ax], count[ax], *lattice)
+                    if hit is None:
+                        break
+                    hits.append(hit)
+                else:
+                    src = self._source(idx, mapping)
+                    if src is None:
+                        continue
+
+                    src_start = [lat[0] for lat in mapping.slattice]
+                    src_stride = [1]*len(src_start)
+                    src_count = [1]*len(src_start)
+                    for vax, sax in mapping.axes:
+                        i0, di, j0, dj, n = hits[vax]
+                        sstart, sstep, _ = mapping.slattice[sax]
+                        src_start[sax] = sstart + sstep*j0
+                        src_stride[sax] = sstep*dj
+                        src_count[sax] = n
+
+                    # Sources smaller than their mapping read as fill
+                    # partially; leave that to HDF5.
+                    src_shape = src.shape
+                    if len(src_shape) != len(src_start):
+                        return False
+                    if any(s + d*(c - 1) >= limit for s, d, c, limit
+                           in zip(src_start, src_stride, src_count, src_shape)):
+                        return False
+
+                    if numpy.product([h[4] for h in hits]) == nselect:
+                        fill_needed = False
+                    plan.append((src, hits, src_start, src_stride, src_count))
+        except (IOError, OSError):
+            return False
+
+        if fill_needed:
+            arr[...] = self._fill[0]
+
+        view = arr.reshape(count)
+        for src, hits, src_start, src_stride, src_count in plan:
+            mspace = h5s.create_simple(count)
+            mspace.select_hyperslab(tuple(h[0] for h in hits),
+                                    tuple(h[4] for h in hits),
+                                    tuple(h[1] for h in hits))
+            fspace = src.get_space()
+            fspace.select_hyperslab(tuple(src_start), tuple(src_count),
+                                    tuple(src_stride))
+            src.read(mspace, fspace, view, mtype, dxpl=dxpl)
+        return True
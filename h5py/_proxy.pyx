@@ -13,6 +13,12 @@
     Proxy functions for read/write, to work around the HDF5 bogus type issue.
 """
 
+include "config.pxi"
+
+from h5 cimport H5PYConfig, get_config
+
+cdef H5PYConfig cfg = get_config()
+
 cdef enum copy_dir:
     H5PY_SCATTER = 0,
     H5PY_GATHER
@@ -140,6 +146,12 @@ cdef herr_t dset_rw(hid_t dset, hid_t mtype, hid_t mspace, hid_t fspace,
                 fspace = mspace = dspace = H5Dget_space(dset)
 
             npoints = H5Sget_select_npoints(mspace)
+
+            if can_strip(mspace, fspace, npoints, dstype, mtype):
+                dset_rw_strips(dset, dstype, mtype, fspace, dxpl, progbuf, read,
+                               npoints)
+                return 0
+
             cspace = H5Screate_simple(1, &npoints, NULL)
 
             conv_buf = create_buffer(H5Tget_size(dstype), H5Tget_size(mtype), npoints)
@@ -177,6 +189,129 @@ cdef herr_t dset_rw(hid_t dset, hid_t mtype, hid_t mspace, hid_t fspace,
     return 0
 
 
+cdef size_t strip_points(hid_t dstype, hid_t mtype):
+    # Number of elements which fit in the conversion buffer, or 0 for no limit
+    cdef size_t elsize = max(H5Tget_size(dstype), H5Tget_size(mtype))
+    if cfg._conv_buffer_size == 0:
+        return 0
+    return max(cfg._conv_buffer_size // elsize, 1)
+
+
+cdef int can_strip(hid_t mspace, hid_t fspace, hsize_t npoints,
+                   hid_t dstype, hid_t mtype) except -1:
+    # Strips must be contiguous runs of both selections.  That's the case
+    # for a memory space with everything selected, and a file hyperslab,
+    # as both are traversed in row-major order.
+    cdef size_t maxpoints = strip_points(dstype, mtype)
+    cdef H5S_sel_type ftype
+
+    if maxpoints == 0 or npoints <= maxpoints:
+        return 0
+    if H5Sget_select_type(mspace) != H5S_SEL_ALL:
+        return 0
+    ftype = H5Sget_select_type(fspace)
+    if ftype != H5S_SEL_ALL and ftype != H5S_SEL_HYPERSLABS:
+        return 0
+    return H5Sget_simple_extent_ndims(fspace) > 0
+
+
+cdef herr_t dset_rw_strips(hid_t dset, hid_t dstype, hid_t mtype, hid_t fspace,
+                           hid_t dxpl, void* progbuf, int read,
+                           hsize_t npoints) except -1:
+    # Read or write a selection in strips of whole rows along the first
+    # axis, sized to hold about strip_points() elements.  The memory buffer
+    # is contiguous, and each strip covers the next run of it.
+
+    cdef int rank, i
+    cdef hsize_t *start = NULL
+    cdef hsize_t *end = NULL
+    cdef hsize_t *count = NULL
+    cdef hsize_t row, nrows, n, done = 0
+    cdef hid_t strip = -1
+    cdef hid_t cspace = -1
+    cdef size_t msize, maxpoints, capacity = 0
+    cdef htri_t need_bkg
+    cdef void* conv_buf = NULL
+    cdef void* back_buf = NULL
+    cdef char* membuf
+
+    msize = H5Tget_size(mtype)
+    maxpoints = strip_points(dstype, mtype)
+    if read:
+        need_bkg = needs_bkg_buffer(dstype, mtype)
+    else:
+        need_bkg = needs_bkg_buffer(mtype, dstype)
+
+    rank = H5Sget_simple_extent_ndims(fspace)
+    try:
+        start = <hsize_t*>malloc(sizeof(hsize_t)*rank)
+        end = <hsize_t*>malloc(sizeof(hsize_t)*rank)
+        count = <hsize_t*>malloc(sizeof(hsize_t)*rank)
+        if start == NULL or end == NULL or count == NULL:
+            raise MemoryError("Failed to allocate selection bounds")
+        H5Sget_select_bounds(fspace, start, end)
+        for i from 0 <= i < rank:
+            count[i] = end[i] - start[i] + 1
+
+        # Guess the rows per strip from the average row, then adjust
+        nrows = max(maxpoints // max(npoints // count[0], 1), 1)
+
+        row = start[0]
+        while row <= end[0]:
+            start[0] = row
+            count[0] = min(nrows, end[0] - row + 1)
+            strip = H5Scopy(fspace)
+            H5Sselect_hyperslab(strip, H5S_SELECT_AND, start, NULL, count, NULL)
+            n = H5Sget_select_npoints(strip)
+
+            if n > 0:
+                if n > capacity:
+                    free(conv_buf)
+                    free(back_buf)
+                    conv_buf = back_buf = NULL
+                    capacity = n
+                    conv_buf = create_buffer(H5Tget_size(dstype), msize, capacity)
+                    if need_bkg:
+                        back_buf = create_buffer(H5Tget_size(dstype), msize, capacity)
+
+                membuf = (<char*>progbuf) + done*msize
+                if need_bkg:
+                    memcpy(back_buf, membuf, n*msize)
+
+                cspace = H5Screate_simple(1, &n, NULL)
+                if read:
+                    H5PY_H5Dread(dset, dstype, cspace, strip, dxpl, conv_buf)
+                    H5Tconvert(dstype, mtype, n, conv_buf, back_buf, dxpl)
+                    memcpy(membuf, conv_buf, n*msize)
+                else:
+                    memcpy(conv_buf, membuf, n*msize)
+                    H5Tconvert(mtype, dstype, n, conv_buf, back_buf, dxpl)
+                    H5PY_H5Dwrite(dset, dstype, cspace, strip, dxpl, conv_buf)
+                    H5Dvlen_reclaim(dstype, cspace, H5P_DEFAULT, conv_buf)
+                H5Sclose(cspace)
+                cspace = -1
+
+                done += n
+                nrows = max(nrows*maxpoints // n, 1)
+
+            H5Sclose(strip)
+            strip = -1
+            row += count[0]
+
+    finally:
+        free(start)
+        free(end)
+        free(count)
+        free(conv_buf)
+        free(back_buf)
+        if strip > 0:
+            H5Sclose(strip)
+        if cspace > 0:
+            H5Sclose(cspace)
+
+    return 0
+
+
 cdef hid_t make_reduced_type(hid_t mtype, hid_t dstype):
     # Go through dstype, pick out the fields which also appear in mtype, and
     # return a new compound type with the fields packed together
@@ -279,6 +414,105 @@ cdef herr_t h5py_gather_cb(void* elem, hid_t type_id, unsigned ndim,
 
     return 0
 
+cdef inline void copy_run(char* contig, char* noncontig, size_t nbytes,
+                          copy_dir op):
+    if op == H5PY_SCATTER:
+        memcpy(noncontig, contig, nbytes)
+    else:
+        memcpy(contig, noncontig, nbytes)
+
+# Fast path for h5py_copy: selections of everything, or regular hyperslabs,
+# are copied a run of contiguous elements at a time rather than through a
+# callback per element.  Returns 0 if the selection is of another kind.
+cdef int copy_blocks(size_t elsize, hid_t space, char* contig, char* noncontig,
+                     copy_dir op) except -1:
+
+    cdef H5S_sel_type seltype
+    cdef int rank, i, k
+    cdef hsize_t* buf = NULL
+    cdef hsize_t *dims, *start, *stride, *count, *block, *q, *b
+    cdef hsize_t nruns, runlen, runstep, j
+    cdef size_t offset, rowbytes
+
+    seltype = H5Sget_select_type(space)
+    if seltype == H5S_SEL_ALL:
+        copy_run(contig, noncontig, elsize*H5Sget_select_npoints(space), op)
+        return 1
+    if seltype != H5S_SEL_HYPERSLABS:
+        return 0
+    rank = H5Sget_simple_extent_ndims(space)
+    if rank < 1:
+        return 0
+
+    buf = <hsize_t*>malloc(sizeof(hsize_t)*rank*7)
+    if buf == NULL:
+        raise MemoryError("Failed to allocate selection buffer")
+    dims = buf
+    start = buf + rank
+    stride = buf + 2*rank
+    count = buf + 3*rank
+    block = buf + 4*rank
+    q = buf + 5*rank
+    b = buf + 6*rank
+
+    try:
+        IF HDF5_VERSION >= VDS_MIN_HDF5_VERSION:
+            if H5Sis_regular_hyperslab(space) <= 0:
+                return 0
+            H5Sget_regular_hyperslab(space, start, stride, count, block)
+        ELSE:
+            if H5Sget_select_hyper_nblocks(space) != 1:
+                return 0
+            H5Sget_select_bounds(space, start, block)
+            for i from 0 <= i < rank:
+                block[i] = block[i] - start[i] + 1
+                stride[i] = count[i] = 1
+        H5Sget_simple_extent_dims(space, dims, NULL)
+
+        # Runs of contiguous elements along the last axis
+        k = rank - 1
+        if count[k] == 1 or stride[k] == block[k]:
+            nruns = 1
+            runlen = count[k]*block[k]
+        else:
+            nruns = count[k]
+            runlen = block[k]
+        runstep = stride[k]*elsize
+        rowbytes = runlen*elsize
+
+        for i from 0 <= i < rank:
+            q[i] = b[i] = 0
+
+        # Odometer over the selected coordinates of the other axes
+        while True:
+            offset = 0
+            for i from 0 <= i < k:
+                offset = (offset + start[i] + q[i]*stride[i] + b[i])*dims[i+1]
+            offset = (offset + start[k])*elsize
+
+            for j from 0 <= j < nruns:
+                copy_run(contig, noncontig + offset + j*runstep, rowbytes, op)
+                contig += rowbytes
+
+            i = k - 1
+            while i >= 0:
+                b[i] += 1
+                if b[i] < block[i]:
+                    break
+                b[i] = 0
+                q[i] += 1
+                if q[i] < count[i]:
+                    break
+                q[i] = 0
+                i -= 1
+            if i < 0:
+                break
+
+        return 1
+
+    finally:
+        free(buf)
+
 # Copy between a contiguous and non-contiguous buffer, with the layout
 # of the latter specified by a dataspace selection.
 cdef herr_t h5py_copy(hid_t tid, hid_t space, void* contig, void* noncontig,
@@ -289,6 +523,9 @@ cdef herr_t h5py_copy(hid_t tid, hid_t space, void* contig, void* noncontig,
 
     elsize = H5Tget_size(tid)
 
+    if copy_blocks(elsize, space, <char*>contig, <char*>noncontig, op):
+        return 0
+
     info.i = 0
     info.elsize = elsize
     info.buf = contig
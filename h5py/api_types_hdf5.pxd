@@ -296,6 +296,14 @@ cdef extern from "hdf5.h":
   unsigned int H5O_COPY_PRESERVE_NULL_FLAG        # (0x0020u) Copy NULL messages (empty space)
   unsigned int H5O_COPY_ALL                       # (0x003Fu) All object copying flags (for internal checking)
 
+  IF HDF5_VERSION >= (1, 10, 3):
+    unsigned int H5O_INFO_BASIC         # (0x0001u) Fill in fileno, addr, type and rc
+    unsigned int H5O_INFO_TIME          # (0x0002u) Fill in atime, mtime, ctime and btime
+    unsigned int H5O_INFO_NUM_ATTRS     # (0x0004u) Fill in num_attrs
+    unsigned int H5O_INFO_HDR           # (0x0008u) Fill in hdr
+    unsigned int H5O_INFO_META_SIZE     # (0x0010u) Fill in meta_size
+    unsigned int H5O_INFO_ALL           # All of the above
+
   # --- Components for the H5O_info_t struct ----------------------------------
 
   ctypedef struct space:
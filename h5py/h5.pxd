@@ -18,6 +18,7 @@ cdef class H5PYConfig:
     cdef readonly object API_16
     cdef readonly object API_18
     cdef readonly object _bytestrings
+    cdef readonly size_t _conv_buffer_size
 
 cpdef H5PYConfig get_config()
 
@@ -49,6 +49,11 @@ cdef class H5PYConfig:
         bool_names (tuple, r/w)
             Settable 2-tuple controlling the HDF5 enum names used for boolean
             values.  Defaults to ('FALSE', 'TRUE') for values 0 and 1.
+
+        conv_buffer_size (int, r/w)
+            Size in bytes of the buffers used to convert variable-length
+            and reference data when reading and writing datasets.
+            Defaults to 8 MiB; 0 means no limit.
     """
 
     def __init__(self):
@@ -57,6 +62,7 @@ cdef class H5PYConfig:
         self._f_name = b'FALSE'
         self._t_name = b'TRUE'
         self._bytestrings = ByteStringContext()
+        self._conv_buffer_size = 8*1024*1024
 
     property complex_names:
         """ Settable 2-tuple controlling how complex numbers are saved.
@@ -111,6 +117,25 @@ cdef class H5PYConfig:
                 self._f_name = f
                 self._t_name = t
 
+    property conv_buffer_size:
+        """ Size in bytes of the buffers used to convert data types which
+        h5py handles itself (variable-length and reference types) when
+        reading or writing datasets.
+
+        Larger selections are processed in strips of whole rows along the
+        first axis, each converted separately, so memory use stays bounded.
+        Use 0 to convert whole selections at once.  Defaults to 8 MiB.
+        """
+        def __get__(self):
+            with phil:
+                return self._conv_buffer_size
+
+        def __set__(self, val):
+            with phil:
+                if val < 0:
+                    raise ValueError("conv_buffer_size must be non-negative")
+                self._conv_buffer_size = val
+
     property read_byte_strings:
         """ Returns a context manager which forces all strings to be returned
         as byte strings. """
@@ -25,6 +25,8 @@ from _proxy cimport dset_rw
 from h5py import _objects
 from ._objects import phil, with_phil
 
+import numpy
+
 # Initialization
 import_array()
 
@@ -56,6 +58,42 @@ IF HDF5_VERSION >= VDS_MIN_HDF5_VERSION:
     VDS_FIRST_MISSING   = H5D_VDS_FIRST_MISSING
     VDS_LAST_AVAILABLE  = H5D_VDS_LAST_AVAILABLE
 
+cdef Py_ssize_t utf8_to_ucs4(unsigned char* src, size_t length,
+                             uint32_t* dest, Py_ssize_t maxchars) except -1:
+    # Decode at most maxchars code points of UTF-8 into dest, returning
+    # how many were written.
+    cdef size_t i = 0
+    cdef Py_ssize_t n = 0
+    cdef uint32_t c
+    cdef int extra, j
+
+    while i < length and n < maxchars:
+        c = src[i]
+        if c < 0x80:
+            extra = 0
+        elif (c & 0xE0) == 0xC0:
+            c &= 0x1F
+            extra = 1
+        elif (c & 0xF0) == 0xE0:
+            c &= 0x0F
+            extra = 2
+        elif (c & 0xF8) == 0xF0:
+            c &= 0x07
+            extra = 3
+        else:
+            raise ValueError("String is not valid UTF-8")
+        if i + extra >= length:
+            raise ValueError("String is not valid UTF-8")
+        for j from 1 <= j <= extra:
+            if (src[i+j] & 0xC0) != 0x80:
+                raise ValueError("String is not valid UTF-8")
+            c = (c << 6) | (src[i+j] & 0x3F)
+        dest[n] = c
+        n += 1
+        i += extra + 1
+    return n
+
+
 # === Dataset operations ======================================================
 
 @with_phil
@@ -181,6 +219,247 @@ cdef class DatasetID(ObjectID):
         dset_rw(self_id, mtype_id, mspace_id, fspace_id, plist_id, data, 1)
 
 
+    @with_phil
+    def read_vlen_strings(self, SpaceID fspace not None, ndarray out=None,
+                          PropID dxpl=None):
+        """ (SpaceID fspace, NDARRAY out=None, PropDXID dxpl=None)
+            => (NDARRAY data, NDARRAY offsets) or None
+
+            Read the selected elements of a variable-length string dataset
+            without creating a Python object for each one.
+
+            If "out" is not given, the strings are returned back to back in
+            a uint8 array "data", along with an int64 array of n+1 offsets
+            into it: string i is data[offsets[i]:offsets[i+1]].
+
+            Otherwise "out" must be a writable, C-contiguous NumPy array of
+            kind "S" or "U" (native byte order) with one element per
+            selected point, and None is returned.  Strings are truncated or
+            zero-padded to fit, and decoded from UTF-8 for kind "U".
+        """
+        cdef hid_t ftype = -1
+        cdef hid_t mtype = -1
+        cdef hid_t mspace = -1
+        cdef hsize_t npoints
+        cdef char** ptrs = NULL
+        cdef size_t i, length, width
+        cdef Py_ssize_t nchars
+        cdef ndarray data, offsets
+        cdef int64_t* offs
+        cdef char* buf
+
+        ftype = H5Dget_type(self.id)
+        try:
+            if not H5Tis_variable_str(ftype):
+                raise TypeError("Dataset is not of variable-length string type")
+
+            npoints = H5Sget_select_npoints(fspace.id)
+            if out is not None:
+                check_numpy_write(out, -1)
+                if out.dtype.kind not in ('S', 'U') or not out.dtype.isnative:
+                    raise TypeError("Output array must be of kind S or U, in native byte order")
+                if <hsize_t>out.size != npoints:
+                    raise ValueError("Output array has %d elements for %d selected points" % (out.size, npoints))
+
+            mtype = H5Tcopy(H5T_C_S1)
+            H5Tset_size(mtype, H5T_VARIABLE)
+            H5Tset_cset(mtype, H5Tget_cset(ftype))
+            mspace = H5Screate_simple(1, &npoints, NULL)
+
+            if npoints > 0:
+                ptrs = <char**>emalloc(npoints*sizeof(char*))
+                memset(ptrs, 0, npoints*sizeof(char*))
+            try:
+                if npoints > 0:
+                    H5Dread(self.id, mtype, mspace, fspace.id, pdefault(dxpl), ptrs)
+
+                if out is None:
+                    offsets = numpy.empty((npoints + 1,), dtype=numpy.int64)
+                    offs = <int64_t*>PyArray_DATA(offsets)
+                    offs[0] = 0
+                    for i from 0 <= i < npoints:
+                        length = strlen(ptrs[i]) if ptrs[i] != NULL else 0
+                        offs[i+1] = offs[i] + length
+                    data = numpy.empty((offs[npoints],), dtype=numpy.uint8)
+                    buf = <char*>PyArray_DATA(data)
+                    for i from 0 <= i < npoints:
+                        length = offs[i+1] - offs[i]
+                        if length:
+                            memcpy(buf + offs[i], ptrs[i], length)
+                    return data, offsets
+
+                buf = <char*>PyArray_DATA(out)
+                if out.dtype.kind == 'S':
+                    width = out.dtype.itemsize
+                    for i from 0 <= i < npoints:
+                        length = strlen(ptrs[i]) if ptrs[i] != NULL else 0
+                        if length > width:
+                            length = width
+                        memcpy(buf + i*width, ptrs[i], length)
+                        memset(buf + i*width + length, 0, width - length)
+                else:
+                    width = out.dtype.itemsize // 4
+                    for i from 0 <= i < npoints:
+                        length = strlen(ptrs[i]) if ptrs[i] != NULL else 0
+                        nchars = utf8_to_ucs4(<unsigned char*>ptrs[i], length,
+                                              <uint32_t*>(buf + i*width*4), width)
+                        memset(buf + (i*width + <size_t>nchars)*4, 0,
+                               (width - <size_t>nchars)*4)
+                return None
+
+            finally:
+                if ptrs != NULL:
+                    H5Dvlen_reclaim(mtype, mspace, H5P_DEFAULT, ptrs)
+                    efree(ptrs)
+        finally:
+            if mspace >= 0:
+                H5Sclose(mspace)
+            if mtype >= 0:
+                H5Tclose(mtype)
+            H5Tclose(ftype)
+
+
+    @with_phil
+    def read_vlen_ragged(self, SpaceID fspace not None, PropID dxpl=None):
+        """ (SpaceID fspace, PropDXID dxpl=None)
+            => (NDARRAY offsets, NDARRAY values)
+
+            Read the selected elements of a variable-length (non-string)
+            dataset as a ragged array, without creating an array per
+            element.
+
+            All the sequences are returned back to back in one array
+            "values" of the base type, along with an int64 array of n+1
+            offsets into it: element i is values[offsets[i]:offsets[i+1]].
+        """
+        cdef hid_t ftype = -1
+        cdef hid_t vltype = -1
+        cdef hid_t mspace = -1
+        cdef hsize_t npoints
+        cdef hvl_t* vl = NULL
+        cdef size_t i, itemsize
+        cdef TypeID mtype
+        cdef ndarray offsets, values
+        cdef int64_t* offs
+        cdef char* buf
+
+        ftype = H5Dget_type(self.id)
+        try:
+            if H5Tget_class(ftype) != H5T_VLEN:
+                raise TypeError("Dataset is not of variable-length sequence type")
+            base = typewrap(H5Tget_super(ftype)).dtype
+            if base.hasobject:
+                raise TypeError("Ragged reads need a fixed-size base type (got %s)" % base)
+            mtype = py_create(base)
+            itemsize = base.itemsize
+
+            npoints = H5Sget_select_npoints(fspace.id)
+            vltype = H5Tvlen_create(mtype.id)
+            mspace = H5Screate_simple(1, &npoints, NULL)
+
+            if npoints > 0:
+                vl = <hvl_t*>emalloc(npoints*sizeof(hvl_t))
+                memset(vl, 0, npoints*sizeof(hvl_t))
+            try:
+                if npoints > 0:
+                    H5Dread(self.id, vltype, mspace, fspace.id, pdefault(dxpl), vl)
+
+                offsets = numpy.empty((npoints + 1,), dtype=numpy.int64)
+                offs = <int64_t*>PyArray_DATA(offsets)
+                offs[0] = 0
+                for i from 0 <= i < npoints:
+                    offs[i+1] = offs[i] + vl[i].len
+                values = numpy.empty((offs[npoints],), dtype=base)
+                buf = <char*>PyArray_DATA(values)
+                for i from 0 <= i < npoints:
+                    if vl[i].len:
+                        memcpy(buf + offs[i]*itemsize, vl[i].p, vl[i].len*itemsize)
+                return offsets, values
+
+            finally:
+                if vl != NULL:
+                    H5Dvlen_reclaim(vltype, mspace, H5P_DEFAULT, vl)
+                    efree(vl)
+        finally:
+            if mspace >= 0:
+                H5Sclose(mspace)
+            if vltype >= 0:
+                H5Tclose(vltype)
+            H5Tclose(ftype)
+
+
+    @with_phil
+    def write_vlen_ragged(self, SpaceID fspace not None, ndarray offsets not None,
+                          ndarray values not None, PropID dxpl=None):
+        """ (SpaceID fspace, NDARRAY offsets, NDARRAY values,
+             PropDXID dxpl=None)
+
+            Write a ragged array to the selected elements of a
+            variable-length (non-string) dataset.  Element i is set to
+            values[offsets[i]:offsets[i+1]].
+
+            "offsets" must be a C-contiguous int64 array with one more entry
+            than there are selected points, and non-decreasing; "values" a
+            C-contiguous 1D array, whose type is converted to the dataset's
+            base type by HDF5.  The data is written straight from "values".
+        """
+        cdef hid_t ftype = -1
+        cdef hid_t vltype = -1
+        cdef hid_t mspace = -1
+        cdef hsize_t npoints
+        cdef hvl_t* vl = NULL
+        cdef size_t i, itemsize
+        cdef TypeID mtype
+        cdef int64_t* offs
+        cdef char* buf
+
+        check_numpy_read(offsets, -1)
+        check_numpy_read(values, -1)
+        if offsets.dtype != numpy.dtype(numpy.int64) or offsets.ndim != 1:
+            raise TypeError("Offsets must be a 1D int64 array")
+        if values.ndim != 1 or values.dtype.hasobject:
+            raise TypeError("Values must be a 1D array of a fixed-size type")
+
+        ftype = H5Dget_type(self.id)
+        try:
+            if H5Tget_class(ftype) != H5T_VLEN:
+                raise TypeError("Dataset is not of variable-length sequence type")
+
+            npoints = H5Sget_select_npoints(fspace.id)
+            if <hsize_t>offsets.shape[0] != npoints + 1:
+                raise ValueError("Need %d offsets for %d selected points (got %d)"
+                                 % (npoints + 1, npoints, offsets.shape[0]))
+            offs = <int64_t*>PyArray_DATA(offsets)
+            if offs[0] < 0 or offs[npoints] > values.shape[0]:
+                raise ValueError("Offsets out of range for %d values" % values.shape[0])
+            for i from 0 <= i < npoints:
+                if offs[i+1] < offs[i]:
+                    raise ValueError("Offsets must be non-decreasing")
+
+            mtype = py_create(values.dtype)
+            itemsize = values.dtype.itemsize
+            buf = <char*>PyArray_DATA(values)
+
+            vltype = H5Tvlen_create(mtype.id)
+            mspace = H5Screate_simple(1, &npoints, NULL)
+            if npoints > 0:
+                vl = <hvl_t*>emalloc(npoints*sizeof(hvl_t))
+            try:
+                for i from 0 <= i < npoints:
+                    vl[i].len = offs[i+1] - offs[i]
+                    vl[i].p = buf + offs[i]*itemsize
+                if npoints > 0:
+                    H5Dwrite(self.id, vltype, mspace, fspace.id, pdefault(dxpl), vl)
+            finally:
+                efree(vl)
+        finally:
+            if mspace >= 0:
+                H5Sclose(mspace)
+            if vltype >= 0:
+                H5Tclose(vltype)
+            H5Tclose(ftype)
+
+
     @with_phil
     def write(self, SpaceID mspace not None, SpaceID fspace not None,
                     ndarray arr_obj not None, TypeID mtype=None,
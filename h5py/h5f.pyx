@@ -364,6 +364,19 @@ cdef class FileID(GroupID):
         H5Fget_vfd_handle(self.id, H5Fget_access_plist(self.id), <void**>&handle)
         return handle[0]
 
+    IF HDF5_VERSION >= (1, 8, 7):
+
+        @with_phil
+        def clear_elink_file_cache(self):
+            """()
+
+            Close all files held open by the external link file cache of
+            this file.
+
+            Feature requires: 1.8.7
+            """
+            H5Fclear_elink_file_cache(self.id)
+
     IF HDF5_VERSION >= (1, 8, 9):
 
         @with_phil
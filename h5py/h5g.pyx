@@ -16,7 +16,7 @@ include "config.pxi"
 # Compile-time imports
 from _objects cimport pdefault
 from utils cimport emalloc, efree
-from h5p cimport PropID
+from h5p cimport PropID, propwrap
 cimport _hdf5 # to implement container testing for 1.6
 from _errors cimport set_error_handler, err_cookie
 
@@ -84,6 +84,9 @@ cdef class GroupIter:
     """
         Iterator over the names of group members.  After this iterator is
         exhausted, it releases its reference to the group ID.
+
+        All names are retrieved when iteration starts, in creation order
+        for groups which track it and in name order otherwise.
     """
 
     cdef unsigned long idx
@@ -113,7 +116,14 @@ cdef class GroupIter:
             raise StopIteration
 
         if self.idx == 0:
-            self.grp.links.iterate(self.names.append)
+            # HDF5 refuses creation order for groups which don't track it;
+            # trying is cheaper than looking at the creation property list
+            try:
+                self.grp.links.iterate(self.names.append,
+                                       idx_type=H5_INDEX_CRT_ORDER)
+            except RuntimeError:
+                del self.names[:]
+                self.grp.links.iterate(self.names.append)
 
         retval = self.names[self.idx]
         self.idx += 1
@@ -311,6 +321,16 @@ cdef class GroupID(ObjectID):
         H5Gmove2(self.id, current_name, remote_id, new_name)
 
 
+    @with_phil
+    def get_create_plist(self):
+        """ () => PropGCID
+
+            Create and return a new copy of the group creation property list
+            used when this group was created.
+        """
+        return propwrap(H5Gget_create_plist(self.id))
+
+
     @with_phil
     def get_num_objs(self):
         """() => INT number_of_objects
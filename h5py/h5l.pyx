@@ -225,6 +225,42 @@ cdef class LinkProxy:
         return info
 
 
+    @with_phil
+    def get_name_by_idx(self, hsize_t idx, *, int idx_type=H5_INDEX_NAME,
+                        int order=H5_ITER_INC, char* obj_name='.',
+                        PropID lapl=None):
+        """(INT idx, **kwds) => STRING
+
+        Get the name of the link at position "idx" in a group, as ordered
+        by the given index.
+
+        INT idx_type (h5.INDEX_NAME)
+            h5.INDEX_CRT_ORDER requires the group to track creation order
+
+        INT order (h5.ITER_INC)
+
+        STRING obj_name (".")
+            Look in this subgroup instead
+
+        PropLAID lapl (None)
+            Link access property list for "obj_name"
+        """
+        cdef ssize_t size
+        cdef char* buf = NULL
+
+        size = H5Lget_name_by_idx(self.id, obj_name, <H5_index_t>idx_type,
+                    <H5_iter_order_t>order, idx, NULL, 0, pdefault(lapl))
+
+        buf = <char*>emalloc(sizeof(char)*(size+1))
+        try:
+            H5Lget_name_by_idx(self.id, obj_name, <H5_index_t>idx_type,
+                <H5_iter_order_t>order, idx, buf, size+1, pdefault(lapl))
+            pystring = buf
+            return pystring
+        finally:
+            efree(buf)
+
+
     @with_phil
     def visit(self, object func, *,
               int idx_type=H5_INDEX_NAME, int order=H5_ITER_NATIVE,
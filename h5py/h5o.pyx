@@ -36,6 +36,14 @@ COPY_EXPAND_REFERENCE_FLAG  = H5O_COPY_EXPAND_REFERENCE_FLAG
 COPY_WITHOUT_ATTR_FLAG      = H5O_COPY_WITHOUT_ATTR_FLAG
 COPY_PRESERVE_NULL_FLAG     = H5O_COPY_PRESERVE_NULL_FLAG
 
+IF HDF5_VERSION >= (1, 10, 3):
+    INFO_BASIC      = H5O_INFO_BASIC
+    INFO_TIME       = H5O_INFO_TIME
+    INFO_NUM_ATTRS  = H5O_INFO_NUM_ATTRS
+    INFO_HDR        = H5O_INFO_HDR
+    INFO_META_SIZE  = H5O_INFO_META_SIZE
+    INFO_ALL        = H5O_INFO_ALL
+
 # === Giant H5O_info_t structure ==============================================
 
 cdef class _ObjInfoBase:
@@ -105,6 +113,9 @@ cdef class _ObjInfo(_ObjInfoBase):
     property rc:
         def __get__(self):
             return self.istr[0].rc
+    property num_attrs:
+        def __get__(self):
+            return self.istr[0].num_attrs
 
     def _hash(self):
         return hash((self.fileno, self.addr, self.type, self.rc))
@@ -136,7 +147,7 @@ cdef class ObjInfo(_ObjInfo):
 @with_phil
 def get_info(ObjectID loc not None, char* name=NULL, int index=-1, *,
         char* obj_name='.', int index_type=H5_INDEX_NAME, int order=H5_ITER_NATIVE,
-        PropID lapl=None):
+        PropID lapl=None, int fields=-1):
     """(ObjectID loc, STRING name=, INT index=, **kwds) => ObjInfo
 
     Get information describing an object in an HDF5 file.  Provide the object
@@ -152,19 +163,38 @@ def get_info(ObjectID loc not None, char* name=NULL, int index=-1, *,
     INT index_type (h5.INDEX_NAME)
 
     INT order (h5.ITER_NATIVE)
+
+    INT fields (-1)
+        With HDF5 1.10.3 or later, a combination of INFO_* flags giving
+        the parts of the structure to fill in; the rest are left zero.
+        Skipping INFO_META_SIZE avoids walking the chunk index of chunked
+        datasets.  Ignored for earlier versions, which fill in everything.
     """
     cdef ObjInfo info
     info = ObjInfo()
 
     if name != NULL and index >= 0:
         raise TypeError("At most one of name or index may be specified")
-    elif name != NULL and index < 0:
-        H5Oget_info_by_name(loc.id, name, &info.infostruct, pdefault(lapl))
-    elif name == NULL and index >= 0:
-        H5Oget_info_by_idx(loc.id, obj_name, <H5_index_t>index_type,
-            <H5_iter_order_t>order, index, &info.infostruct, pdefault(lapl))
-    else:
-        H5Oget_info(loc.id, &info.infostruct)
+
+    IF HDF5_VERSION >= (1, 10, 3):
+        cdef unsigned int ufields = H5O_INFO_ALL if fields < 0 else fields
+        if name != NULL and index < 0:
+            H5Oget_info_by_name2(loc.id, name, &info.infostruct, ufields,
+                pdefault(lapl))
+        elif name == NULL and index >= 0:
+            H5Oget_info_by_idx2(loc.id, obj_name, <H5_index_t>index_type,
+                <H5_iter_order_t>order, index, &info.infostruct, ufields,
+                pdefault(lapl))
+        else:
+            H5Oget_info2(loc.id, &info.infostruct, ufields)
+    ELSE:
+        if name != NULL and index < 0:
+            H5Oget_info_by_name(loc.id, name, &info.infostruct, pdefault(lapl))
+        elif name == NULL and index >= 0:
+            H5Oget_info_by_idx(loc.id, obj_name, <H5_index_t>index_type,
+                <H5_iter_order_t>order, index, &info.infostruct, pdefault(lapl))
+        else:
+            H5Oget_info(loc.id, &info.infostruct)
 
     return info
 
@@ -190,6 +220,19 @@ def open(ObjectID loc not None, char* name, PropID lapl=None):
     return wrap_identifier(H5Oopen(loc.id, name, pdefault(lapl)))
 
 
+@with_phil
+def open_by_idx(ObjectID loc not None, hsize_t idx, *,
+                int idx_type=H5_INDEX_NAME, int order=H5_ITER_INC,
+                char* obj_name='.', PropID lapl=None):
+    """(ObjectID loc, INT idx, **kwds) => ObjectID
+
+    Open the object at position "idx" in a group, as ordered by the given
+    index.  Keywords are as for h5l.LinkProxy.get_name_by_idx.
+    """
+    return wrap_identifier(H5Oopen_by_idx(loc.id, obj_name,
+        <H5_index_t>idx_type, <H5_iter_order_t>order, idx, pdefault(lapl)))
+
+
 @with_phil
 def link(ObjectID obj not None, GroupID loc not None, char* name,
     PropID lcpl=None, PropID lapl=None):
@@ -309,7 +352,7 @@ cdef herr_t cb_obj_simple(hid_t obj, const char* name, const H5O_info_t *info, v
 @with_phil
 def visit(ObjectID loc not None, object func, *,
           int idx_type=H5_INDEX_NAME, int order=H5_ITER_NATIVE,
-          char* obj_name=".", PropID lapl=None, bint info=0):
+          char* obj_name=".", PropID lapl=None, bint info=0, int fields=-1):
     """(ObjectID loc, CALLABLE func, **kwds) => <Return value from func>
 
     Iterate a function or callable object over all objects below the
@@ -339,6 +382,9 @@ def visit(ObjectID loc not None, object func, *,
     INT order (h5.ITER_NATIVE)
         Order in which iteration occurs
 
+    INT fields (-1)
+        Parts of the ObjInfo to fill in, as for get_info()
+
     Compatibility note:  No callback is executed for the starting path ("."),
     as some versions of HDF5 don't correctly handle a return value for this
     case.  This differs from the behavior of the native H5Ovisit, which
@@ -352,8 +398,13 @@ def visit(ObjectID loc not None, object func, *,
     else:
         cfunc = cb_obj_simple
 
-    H5Ovisit_by_name(loc.id, obj_name, <H5_index_t>idx_type,
-        <H5_iter_order_t>order, cfunc, <void*>visit, pdefault(lapl))
+    IF HDF5_VERSION >= (1, 10, 3):
+        cdef unsigned int ufields = H5O_INFO_ALL if fields < 0 else fields
+        H5Ovisit_by_name2(loc.id, obj_name, <H5_index_t>idx_type,
+            <H5_iter_order_t>order, cfunc, <void*>visit, ufields, pdefault(lapl))
+    ELSE:
+        H5Ovisit_by_name(loc.id, obj_name, <H5_index_t>idx_type,
+            <H5_iter_order_t>order, cfunc, <void*>visit, pdefault(lapl))
 
     return visit.retval
 
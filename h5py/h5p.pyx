@@ -801,7 +801,7 @@ cdef class PropDCID(PropOCID):
             name = <char*>emalloc(size+1)
             try:
                 H5Pget_virtual_dsetname(self.id, index, name, <size_t>size+1)
-                src_dset_name = name
+                src_dset_name = <bytes>name
             finally:
                 efree(name)
 
@@ -817,11 +817,11 @@ cdef class PropDCID(PropOCID):
             cdef char* name = NULL
             cdef ssize_t size
 
-            size = H5Pget_virtual_dsetname(self.id, index, NULL, 0)
+            size = H5Pget_virtual_filename(self.id, index, NULL, 0)
             name = <char*>emalloc(size+1)
             try:
                 H5Pget_virtual_filename(self.id, index, name, <size_t>size+1)
-                src_fname = name
+                src_fname = <bytes>name
             finally:
                 efree(name)
 
@@ -1058,6 +1058,52 @@ cdef class PropFAID(PropInstanceID):
         return size
 
 
+    @with_phil
+    def set_meta_block_size(self, hsize_t size):
+        """ (UINT size)
+
+        Set the minimum size (in bytes) of the blocks allocated for
+        metadata.  Larger blocks keep metadata together in the file, so
+        that it can be read with fewer, larger I/O operations.  The
+        default is 2k.
+        """
+        H5Pset_meta_block_size(self.id, size)
+
+
+    @with_phil
+    def get_meta_block_size(self):
+        """ () => UINT size
+
+        Get the current minimum metadata block size (in bytes).
+        """
+        cdef hsize_t size
+        H5Pget_meta_block_size(self.id, &size)
+        return size
+
+
+    @with_phil
+    def set_small_data_block_size(self, hsize_t size):
+        """ (UINT size)
+
+        Set the size (in bytes) of the blocks reserved for "small" raw
+        data, i.e. contiguous datasets which are smaller than the block.
+        Aggregating small datasets reduces the number of separate I/O
+        operations needed to read them.  The default is 2k.
+        """
+        H5Pset_small_data_block_size(self.id, size)
+
+
+    @with_phil
+    def get_small_data_block_size(self):
+        """ () => UINT size
+
+        Get the current small raw data block size (in bytes).
+        """
+        cdef hsize_t size
+        H5Pget_small_data_block_size(self.id, &size)
+        return size
+
+
     @with_phil
     def set_libver_bounds(self, int low, int high):
         """ (INT low, INT high)
@@ -1165,6 +1211,35 @@ cdef class PropFAID(PropInstanceID):
         """
         H5Pset_alignment(self.id, threshold, alignment)
 
+    IF HDF5_VERSION >= (1, 8, 7):
+
+        @with_phil
+        def set_elink_file_cache_size(self, unsigned int efc_size):
+            """ (UINT efc_size)
+
+            Set the number of files held open in the external link file
+            cache of files opened with this list.  Files which are the
+            targets of external links are then kept open between
+            traversals, rather than reopened each time.  A size of 0
+            (the default) disables the cache.
+
+            Feature requires: 1.8.7
+            """
+            H5Pset_elink_file_cache_size(self.id, efc_size)
+
+
+        @with_phil
+        def get_elink_file_cache_size(self):
+            """ () => UINT efc_size
+
+            Get the size of the external link file cache.
+
+            Feature requires: 1.8.7
+            """
+            cdef unsigned int efc_size
+            H5Pget_elink_file_cache_size(self.id, &efc_size)
+            return efc_size
+
     IF HDF5_VERSION >= (1, 8, 9):
 
         @with_phil
@@ -1359,6 +1434,53 @@ cdef class PropGCID(PropOCID):
         return flags
 
 
+    @with_phil
+    def set_link_phase_change(self, unsigned int max_compact, unsigned int min_dense):
+        """ (UINT max_compact, UINT min_dense)
+
+        Set the thresholds for switching between compact and dense storage
+        of links.  Groups with more than max_compact links use dense
+        storage; they return to compact storage below min_dense links.
+        Use max_compact=0 for dense storage from the start.
+        """
+        H5Pset_link_phase_change(self.id, max_compact, min_dense)
+
+
+    @with_phil
+    def get_link_phase_change(self):
+        """ () -> TUPLE (UINT max_compact, UINT min_dense)
+
+        Get the thresholds for switching between compact and dense storage
+        of links.
+        """
+        cdef unsigned int max_compact
+        cdef unsigned int min_dense
+        H5Pget_link_phase_change(self.id, &max_compact, &min_dense)
+        return (max_compact, min_dense)
+
+
+    @with_phil
+    def set_est_link_info(self, unsigned int est_num_entries, unsigned int est_name_len):
+        """ (UINT est_num_entries, UINT est_name_len)
+
+        Set the estimated number of links in the group and the average
+        length of their names, used to size the group's initial storage.
+        """
+        H5Pset_est_link_info(self.id, est_num_entries, est_name_len)
+
+
+    @with_phil
+    def get_est_link_info(self):
+        """ () -> TUPLE (UINT est_num_entries, UINT est_name_len)
+
+        Get the estimated number of links and average name length.
+        """
+        cdef unsigned int est_num_entries
+        cdef unsigned int est_name_len
+        H5Pget_est_link_info(self.id, &est_num_entries, &est_name_len)
+        return (est_num_entries, est_name_len)
+
+
 # Object creation property list
 cdef class PropOCID(PropCreateID):
     """ Object creation property list
@@ -1388,6 +1510,56 @@ cdef class PropOCID(PropCreateID):
         return track_times
 
 
+    @with_phil
+    def set_attr_phase_change(self, unsigned int max_compact, unsigned int min_dense):
+        """ (UINT max_compact, UINT min_dense)
+
+        Set the thresholds for switching between compact and dense storage
+        of attributes.  Objects with more than max_compact attributes use
+        dense storage; they return to compact storage below min_dense
+        attributes.  Use max_compact=0 for dense storage from the start.
+        """
+        H5Pset_attr_phase_change(self.id, max_compact, min_dense)
+
+
+    @with_phil
+    def get_attr_phase_change(self):
+        """ () -> TUPLE (UINT max_compact, UINT min_dense)
+
+        Get the thresholds for switching between compact and dense storage
+        of attributes.
+        """
+        cdef unsigned int max_compact
+        cdef unsigned int min_dense
+        H5Pget_attr_phase_change(self.id, &max_compact, &min_dense)
+        return (max_compact, min_dense)
+
+
+    @with_phil
+    def set_attr_creation_order(self, unsigned int flags):
+        """ (UINT flags)
+
+        Set tracking and indexing of creation order for attributes of this
+        object.  Tracking makes HDF5 use new-style object headers, which can
+        hold attributes in dense storage.
+
+        flags -- h5p.CRT_ORDER_TRACKED, h5p.CRT_ORDER_INDEXED
+        """
+        H5Pset_attr_creation_order(self.id, flags)
+
+
+    @with_phil
+    def get_attr_creation_order(self):
+        """ () -> UINT flags
+
+        Get tracking and indexing of creation order for attributes of this
+        object.
+        """
+        cdef unsigned int flags
+        H5Pget_attr_creation_order(self.id, &flags)
+        return flags
+
+
 # Dataset access
 cdef class PropDAID(PropInstanceID):
 
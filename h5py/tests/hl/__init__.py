@@ -7,7 +7,10 @@ from . import  (test_dataset_getitem,
                 test_file, 
                 test_attribute_create,
                 test_threads,
-                test_datatype, )
+                test_datatype,
+                test_filepool,
+                test_vds,
+                test_index, )
                 
 MODULES = ( test_dataset_getitem, 
             test_dataset_swmr, 
@@ -15,4 +18,7 @@ MODULES = ( test_dataset_getitem,
             test_file,
             test_attribute_create, 
             test_threads,
-            test_datatype, )
+            test_datatype,
+            test_filepool,
+            test_vds,
+            test_index, )
@@ -0,0 +1,119 @@
+# This file is part of h5py, a Python interface to the HDF5 library.
+#
+# http://www.h5py.org
+#
+# Copyright 2008-2013 Andrew Collette and contributors
+#
+# License:  Standard 3-clause BSD; see "license.txt" for full license terms
+#           and contributor agreement.
+
+"""
+    Tests the h5py.FilePool class and h5py.open_pooled.
+"""
+
+from __future__ import absolute_import
+
+import h5py
+from h5py import FilePool, open_pooled
+
+from ..common import ut, TestCase
+
+
+class BasePool(TestCase):
+
+    def setUp(self):
+        self.names = []
+        for idx in range(3):
+            name = self.mktemp()
+            with h5py.File(name, 'w') as f:
+                f['x'] = idx
+            self.names.append(name)
+        self.pool = FilePool(maxsize=2)
+
+    def tearDown(self):
+        self.pool.clear()
+
+
+class TestPool(BasePool):
+
+    """
+        Feature: Repeated opens of the same file share one FileID
+    """
+
+    def test_reuse(self):
+        """ Opening the same file twice returns the pooled FileID """
+        fid1 = self.pool.open(self.names[0])
+        fid2 = self.pool.open(self.names[0])
+        self.assertIs(fid1, fid2)
+        self.assertEqual(len(self.pool), 1)
+        self.assertIn(self.names[0], self.pool)
+
+    def test_key(self):
+        """ Mode and access settings are part of the pool key """
+        fid1 = self.pool.open(self.names[0])
+        fid2 = self.pool.open(self.names[0], libver='latest')
+        self.assertIsNot(fid1, fid2)
+
+    def test_lru(self):
+        """ Least recently used files are dropped first """
+        fid0 = self.pool.open(self.names[0])
+        self.pool.open(self.names[1])
+        self.pool.open(self.names[0])
+        self.pool.open(self.names[2])
+        self.assertEqual(len(self.pool), 2)
+        self.assertIn(self.names[0], self.pool)
+        self.assertNotIn(self.names[1], self.pool)
+        # Dropped files stay usable by whoever still holds them
+        self.assertTrue(fid0.valid)
+
+    def test_maxsize(self):
+        """ Shrinking the pool evicts files """
+        for name in self.names[:2]:
+            self.pool.open(name)
+        self.pool.maxsize = 1
+        self.assertEqual(len(self.pool), 1)
+        self.assertIn(self.names[1], self.pool)
+        with self.assertRaises(ValueError):
+            self.pool.maxsize = -1
+
+    def test_closed(self):
+        """ Files closed elsewhere are transparently reopened """
+        f = open_pooled(self.names[0], pool=self.pool)
+        f.close()
+        f = open_pooled(self.names[0], pool=self.pool)
+        self.assertEqual(f['x'][()], 0)
+
+    def test_mode(self):
+        """ Only r and r+ are allowed """
+        with self.assertRaises(ValueError):
+            self.pool.open(self.names[0], 'w')
+
+
+class TestOpenPooled(BasePool):
+
+    """
+        Feature: open_pooled returns File objects backed by the pool
+    """
+
+    def test_file(self):
+        """ open_pooled returns a usable File """
+        f = open_pooled(self.names[1], pool=self.pool)
+        self.assertIsInstance(f, h5py.File)
+        self.assertEqual(f['x'][()], 1)
+        self.assertEqual(f.mode, 'r')
+        self.assertEqual(f.id, open_pooled(self.names[1], pool=self.pool).id)
+
+    @ut.skipIf(h5py.version.hdf5_version_tuple < (1, 8, 7),
+               "External link file cache requires HDF5 >= 1.8.7")
+    def test_external_link(self):
+        """ Pooled files cache the targets of external links """
+        name = self.mktemp()
+        with h5py.File(name, 'w') as f:
+            f['ext'] = h5py.ExternalLink(self.names[2], '/x')
+        f = open_pooled(name, pool=self.pool)
+        fapl = f.id.get_access_plist()
+        self.assertEqual(fapl.get_elink_file_cache_size(),
+                         self.pool.elink_cache_size)
+        self.assertEqual(f['ext'][()], 2)
+        self.assertEqual(f['ext'][()], 2)
+        f.id.clear_elink_file_cache()
@@ -0,0 +1,192 @@
+# This file is part of h5py, a Python interface to the HDF5 library.
+#
+# http://www.h5py.org
+#
+# Copyright 2008-2013 Andrew Collette and contributors
+#
+# License:  Standard 3-clause BSD; see "license.txt" for full license terms
+#           and contributor agreement.
+
+"""
+    Tests the sidecar metadata index, h5py.index.
+"""
+
+from __future__ import absolute_import
+
+import os
+
+import numpy as np
+import h5py
+from h5py import index
+
+from ..common import ut, TestCase
+
+
+class BaseIndex(TestCase):
+
+    def setUp(self):
+        self.fname = self.mktemp()
+        with h5py.File(self.fname, 'w') as f:
+            grp = f.create_group('grp')
+            grp.attrs['kind'] = b'raw'
+            dset = grp.create_dataset('data', (20, 30), dtype='i2',
+                                      chunks=(10, 10))
+            dset.attrs['units'] = u'm'
+            dset.attrs['scale'] = np.array([1.5, 2.0])
+            f['other'] = np.arange(3.0)
+            f['other'].attrs['units'] = u's'
+            f['vlen'] = np.array([b'a'], dtype=h5py.special_dtype(vlen=bytes))
+            f['type'] = np.dtype('<u4')
+            f['soft'] = h5py.SoftLink('/grp/data')
+        self.iname = index.build(self.fname, attrs=('units', 'kind', 'scale'))
+
+    def tearDown(self):
+        if os.path.exists(self.iname):
+            os.remove(self.iname)
+
+
+class TestBuild(BaseIndex):
+
+    """
+        Feature: Indexes describe every link in a file
+    """
+
+    def test_name(self):
+        """ The index lives next to the file """
+        self.assertEqual(self.iname, self.fname + '.h5pyidx')
+        self.assertTrue(os.path.exists(self.iname))
+
+    def test_entries(self):
+        """ Links are described """
+        idx = index.load(self.fname)
+        self.assertEqual(len(idx), 6)
+        self.assertFalse(idx.complete)   # Soft links aren't followed
+        self.assertIn('/grp/data', idx)
+        self.assertIn('grp', idx)
+        self.assertNotIn('grp/missing', idx)
+        entry = idx.get('grp/data')
+        self.assertEqual(entry.name, 'grp/data')
+        self.assertIs(entry.linktype, h5py.HardLink)
+        self.assertIs(entry.objtype, h5py.Dataset)
+        self.assertEqual(entry.shape, (20, 30))
+        self.assertEqual(entry.chunks, (10, 10))
+        self.assertEqual(entry.dtype, np.dtype('i2'))
+        self.assertEqual(entry.num_attrs, 2)
+        self.assertEqual(idx.get('other').chunks, None)
+        self.assertEqual(h5py.check_dtype(vlen=idx.get('vlen').dtype), bytes)
+        self.assertEqual(idx.get('type').dtype, np.dtype('<u4'))
+        self.assertIs(idx.get('type').objtype, h5py.Datatype)
+        soft = idx.get('soft')
+        self.assertIs(soft.linktype, h5py.SoftLink)
+        self.assertIsNone(soft.objtype)
+        self.assertIsNone(soft.shape)
+        self.assertIsNone(idx.get('nothing'))
+
+    def test_keys(self):
+        """ Group members are listed """
+        idx = index.load(self.fname)
+        self.assertEqual(idx.keys(), ['grp', 'other', 'soft', 'type', 'vlen'])
+        self.assertEqual(idx.keys('/grp'), ['data'])
+        with self.assertRaises(KeyError):
+            idx.keys('nothing')
+
+    def test_attrs(self):
+        """ Chosen attributes are recorded and searchable """
+        idx = index.load(self.fname)
+        self.assertEqual(idx.attrs('grp/data'),
+                         {'units': u'm', 'scale': [1.5, 2.0]})
+        self.assertEqual(idx.attrs('grp'), {'kind': u'raw'})
+        self.assertEqual(idx.find('units'), ['grp/data', 'other'])
+        self.assertEqual(idx.find('units', u's'), ['other'])
+        with self.assertRaises(ValueError):
+            idx.find('colour')
+
+    def test_stale(self):
+        """ Indexes are ignored once the file changes """
+        with h5py.File(self.fname, 'a') as f:
+            f['new'] = 1
+        self.assertIsNone(index.load(self.fname))
+
+    def test_missing(self):
+        """ Missing indexes load as None """
+        os.remove(self.iname)
+        self.assertIsNone(index.load(self.fname))
+
+    def test_complete(self):
+        """ Indexes of files with only hard links are complete """
+        fname = self.mktemp()
+        with h5py.File(fname, 'w') as f:
+            f['grp/x'] = 1
+        iname = index.build(fname)
+        try:
+            self.assertTrue(index.load(fname).complete)
+        finally:
+            os.remove(iname)
+
+    def test_empty(self):
+        """ Files without links are indexed """
+        fname = self.mktemp()
+        h5py.File(fname, 'w').close()
+        iname = index.build(fname)
+        try:
+            idx = index.load(fname)
+            self.assertEqual(len(idx), 0)
+            self.assertEqual(idx.keys(), [])
+        finally:
+            os.remove(iname)
+
+
+class TestFileIndex(BaseIndex):
+
+    """
+        Feature: Files opened with use_index answer queries from the index
+    """
+
+    def test_file(self):
+        """ Membership, keys and classes come from the index """
+        with h5py.File(self.fname, 'r', use_index=True) as f:
+            self.assertIsInstance(f.index, index.FileIndex)
+            self.assertEqual(list(f), ['grp', 'other', 'soft', 'type', 'vlen'])
+            self.assertIn('grp/data', f)
+            self.assertNotIn('grp/nothing', f)
+            self.assertIs(f.get('grp', getclass=True), h5py.Group)
+            self.assertIs(f.get('soft', getclass=True), h5py.Dataset)
+            self.assertIs(f.get('soft', getclass=True, getlink=True),
+                          h5py.SoftLink)
+            self.assertIsNone(f.get('nothing', getclass=True))
+            self.assertEqual(f['other'][1], 1.0)
+
+    def test_stale(self):
+        """ Stale indexes are not used """
+        with h5py.File(self.fname, 'a') as f:
+            f['new'] = 1
+        with h5py.File(self.fname, 'r', use_index=True) as f:
+            self.assertIsNone(f.index)
+            self.assertIn('new', f)
+
+    def test_mode(self):
+        """ Indexes are only used read-only """
+        with self.assertRaises(ValueError):
+            h5py.File(self.fname, 'a', use_index=True)
+
+    def test_links(self):
+        """ Paths through soft and external links are found """
+        fname = self.mktemp()
+        ename = self.mktemp()
+        with h5py.File(ename, 'w') as f:
+            f['y'] = 2
+        with h5py.File(fname, 'w') as f:
+            f['grp/x'] = 1
+            f['alias'] = h5py.SoftLink('/grp')
+            f['ext'] = h5py.ExternalLink(ename, '/')
+        iname = index.build(fname)
+        try:
+            with h5py.File(fname, 'r', use_index=True) as f:
+                self.assertFalse(f.index.complete)
+                self.assertIn('alias/x', f)
+                self.assertIs(f.get('alias/x', getclass=True), h5py.Dataset)
+                self.assertIn('ext/y', f)
+                self.assertIs(f.get('ext/y', getclass=True), h5py.Dataset)
+                self.assertNotIn('alias/nothing', f)
+        finally:
+            os.remove(iname)
@@ -0,0 +1,185 @@
+# This file is part of h5py, a Python interface to the HDF5 library.
+#
+# http://www.h5py.org
+#
+# Copyright 2008-2013 Andrew Collette and contributors
+#
+# License:  Standard 3-clause BSD; see "license.txt" for full license terms
+#           and contributor agreement.
+
+"""
+    Tests the high-level virtual dataset (VDS) interface.
+"""
+
+from __future__ import absolute_import
+
+import os.path
+
+import numpy as np
+import h5py
+from h5py import h5s, VirtualLayout, VirtualSource
+from h5py._hl.vds import vds_support
+
+from ..common import ut, TestCase
+
+
+@ut.skipUnless(vds_support, "VDS requires HDF5 >= 1.9.233")
+class TestVirtualDataset(TestCase):
+
+    """
+        Feature: Virtual datasets stitch source datasets together
+    """
+
+    def setUp(self):
+        TestCase.setUp(self)
+        self.fnames = []
+        for n in range(4):
+            fname = self.mktemp()
+            with h5py.File(fname, 'w') as f:
+                f['data'] = np.arange(10, dtype='i4') + 10*n
+            self.fnames.append(fname)
+
+    def test_stack(self):
+        """ Source files are stacked along a new axis """
+        layout = VirtualLayout((4, 10), 'i4')
+        for n, fname in enumerate(self.fnames):
+            layout[n] = VirtualSource(fname, 'data', shape=(10,))
+        dset = self.f.create_virtual_dataset('vds', layout, fillvalue=-1)
+
+        self.assertEqual(dset.shape, (4, 10))
+        self.assertEqual(dset.dtype, np.dtype('i4'))
+        self.assertArrayEqual(dset[...], np.arange(40, dtype='i4').reshape((4, 10)))
+        self.assertArrayEqual(self.f['vds'][2, 3:5], np.array([23, 24], dtype='i4'))
+
+    def test_fillvalue(self):
+        """ Unmapped regions read as the fill value """
+        layout = VirtualLayout((5, 10), 'i4')
+        layout[1] = VirtualSource(self.fnames[1], 'data', shape=(10,))
+        dset = self.f.create_virtual_dataset('vds', layout, fillvalue=-1)
+
+        self.assertArrayEqual(dset[0], np.full((10,), -1, dtype='i4'))
+        self.assertArrayEqual(dset[1], np.arange(10, 20, dtype='i4'))
+
+    def test_source_selection(self):
+        """ Parts of a source are mapped using slicing syntax """
+        layout = VirtualLayout((20,), 'i4')
+        with h5py.File(self.fnames[0], 'r') as f:
+            src = VirtualSource(f['data'])
+        self.assertEqual(src.shape, (10,))
+        layout[0:5] = src[::2]
+        layout[5:10] = src[1::2]
+        dset = self.f.create_virtual_dataset('vds', layout)
+
+        self.assertArrayEqual(dset[:10], np.array([0, 2, 4, 6, 8,
+                                                   1, 3, 5, 7, 9], dtype='i4'))
+        self.assertArrayEqual(dset[10:], np.zeros((10,), dtype='i4'))
+
+    def test_same_file(self):
+        """ Sources in the same file are mapped """
+        self.f['a'] = np.arange(5, dtype='f8')
+        layout = VirtualLayout((2, 5), 'f8')
+        layout[0] = self.f['a']
+        layout[1] = VirtualSource(self.f['a'])
+        dset = self.f.create_virtual_dataset('vds', layout)
+
+        dcpl = dset.id.get_create_plist()
+        self.assertEqual(dcpl.get_virtual_filename(0), b'.')
+        self.assertArrayEqual(dset[1], np.arange(5, dtype='f8'))
+
+    def test_mismatch(self):
+        """ Selections of different sizes are rejected """
+        layout = VirtualLayout((4, 10), 'i4')
+        with self.assertRaises(ValueError):
+            layout[0, :5] = VirtualSource(self.fnames[0], 'data', shape=(10,))
+
+    def test_missing_args(self):
+        """ Name and shape are required for sources given by path """
+        with self.assertRaises(TypeError):
+            VirtualSource(self.fnames[0], 'data')
+        with self.assertRaises(TypeError):
+            VirtualSource(self.fnames[0], shape=(10,))
+
+    def test_mapping_info(self):
+        """ Mappings are recorded in the dataset creation property list """
+        layout = VirtualLayout((4, 10), 'i4')
+        for n, fname in enumerate(self.fnames):
+            layout[n] = VirtualSource(fname, 'data', shape=(10,))
+        dset = self.f.create_virtual_dataset('vds', layout)
+
+        dcpl = dset.id.get_create_plist()
+        self.assertEqual(dcpl.get_virtual_count(), 4)
+        self.assertEqual(os.path.basename(dcpl.get_virtual_filename(3)),
+                         os.path.basename(self.fnames[3]).encode('utf8'))
+        self.assertEqual(dcpl.get_virtual_dsetname(3), b'data')
+
+
+@ut.skipUnless(vds_support, "VDS requires HDF5 >= 1.9.233")
+class TestVirtualRead(TestCase):
+
+    """
+        Feature: Simple selections of virtual datasets are read straight
+        from the sources they intersect
+    """
+
+    def setUp(self):
+        TestCase.setUp(self)
+        self.fnames = []
+        for n in range(4):
+            fname = self.mktemp()
+            with h5py.File(fname, 'w') as f:
+                f['data'] = np.arange(20, dtype='i4').reshape((2, 10)) + 100*n
+            self.fnames.append(fname)
+
+        # Sources interleaved along the last axis, leaving rows 4 and 5
+        # unmapped
+        layout = VirtualLayout((6, 40), 'i4')
+        for n, fname in enumerate(self.fnames):
+            src = VirtualSource(fname, 'data', shape=(2, 10))
+            layout[n // 2 * 2:n // 2 * 2 + 2, n % 2:20:2] = src
+        self.dset = self.f.create_virtual_dataset('vds', layout, fillvalue=-1)
+
+    def library_read(self):
+        """ Read everything using only the HDF5 library's own mapping """
+        out = np.empty(self.dset.shape, dtype=self.dset.dtype)
+        self.dset.id.read(h5s.ALL, h5s.ALL, out)
+        return out
+
+    def test_slices(self):
+        """ Slicing matches the library's mapping """
+        expected = self.library_read()
+        for key in (Ellipsis, np.s_[1], np.s_[:, 3], np.s_[1, 3],
+                    np.s_[1:5, 1:30:3], np.s_[::2, ::5], np.s_[4:, :],
+                    np.s_[0:3, 17:25]):
+            self.assertArrayEqual(self.dset[key], expected[key])
+
+    def test_reuse(self):
+        """ Source datasets are opened once """
+        self.dset[0]
+        sources = dict(self.dset._vds_reader._sources)
+        self.assertEqual(len(sources), 2)
+        self.dset[0]
+        self.assertEqual(self.dset._vds_reader._sources, sources)
+
+    def test_unmapped(self):
+        """ Unmapped regions read as the fill value without opening sources """
+        self.assertArrayEqual(self.dset[4:, :5], np.full((2, 5), -1, dtype='i4'))
+        self.assertArrayEqual(self.dset[:, 30:], np.full((6, 10), -1, dtype='i4'))
+        self.assertEqual(self.dset._vds_reader._sources, {})
+
+    def test_missing_source(self):
+        """ Missing source files read as the fill value """
+        os.remove(self.fnames[1])
+        expected = np.full((2, 10), -1, dtype='i4')
+        self.assertArrayEqual(self.dset[0:2, 1:20:2], expected)
+        self.assertArrayEqual(self.dset[0:2, 0:20:2],
+                              np.arange(20, dtype='i4').reshape((2, 10)))
+
+    def test_fallback(self):
+        """ Mappings the reader can't resolve use the library's mapping """
+        os.environ['HDF5_VDS_PREFIX'] = os.path.dirname(self.fnames[0])
+        try:
+            dset = self.f['vds']
+            self.assertArrayEqual(dset[0], self.library_read()[0])
+            self.assertIsNone(dset._vds_reader._mappings)
+        finally:
+            del os.environ['HDF5_VDS_PREFIX']
@@ -141,6 +141,56 @@ class TestCreate(BaseAttrs):
         self.assertTrue(htype.committed())
 
 
+class TestReadAll(BaseAttrs):
+
+    """
+        Feature: All attributes are read into a dictionary in one pass
+    """
+
+    def test_read_all(self):
+        """ Values match those read one at a time """
+        self.f['type'] = np.dtype('u8')
+        self.f.attrs['a'] = 1
+        self.f.attrs['b'] = np.arange(6.0).reshape((2, 3))
+        self.f.attrs['c'] = u'text'
+        self.f.attrs['d'] = u'more text'
+        self.f.attrs.create('e', np.ones((2, 3), 'i2'), dtype='(3,)i2')
+        self.f.attrs.create('f', 42, dtype=self.f['type'])
+        self.f.attrs['g'] = 2
+        out = self.f.attrs.read_all()
+        self.assertEqual(sorted(out), sorted(self.f.attrs))
+        for name in out:
+            self.assertTrue(np.array_equal(out[name], self.f.attrs[name]))
+            self.assertEqual(type(out[name]), type(self.f.attrs[name]))
+        self.assertEqual(out['d'], u'more text')
+        self.assertEqual(out['g'], 2)
+
+    def test_empty(self):
+        """ Objects without attributes give an empty dictionary """
+        self.assertEqual(self.f.attrs.read_all(), {})
+
+
+class TestUpdate(BaseAttrs):
+
+    """
+        Feature: Several attributes are set at once
+    """
+
+    def test_update(self):
+        """ New attributes are created and existing ones overwritten """
+        self.f.attrs['a'] = 1
+        self.f.attrs.update({'a': u'one', 'b': np.arange(3)}, c=2.5)
+        self.assertEqual(sorted(self.f.attrs), ['a', 'b', 'c'])
+        self.assertEqual(self.f.attrs['a'], u'one')
+        self.assertArrayEqual(self.f.attrs['b'], np.arange(3))
+        self.assertEqual(self.f.attrs['c'], 2.5)
+
+    def test_pairs(self):
+        """ Sequences of (name, value) pairs are accepted """
+        self.f.attrs.update([('x', 1), ('y', 2)])
+        self.assertEqual(self.f.attrs.read_all(), {'x': 1, 'y': 2})
+
+
 class TestMutableMapping(BaseAttrs):
     '''Tests if the registration of AttributeManager as a MutableMapping
     behaves as expected
@@ -27,6 +27,7 @@ import numpy as np
 from .common import ut, TestCase
 from h5py.highlevel import File, Group, Dataset
 from h5py._hl.base import is_empty_dataspace
+from h5py._hl.dataset import strided_mspace
 from h5py import h5t
 import h5py
 
@@ -152,6 +153,110 @@ class TestCreateData(BaseDataset):
         self.assertTrue(is_empty_dataspace(self.f['foo'].id))
 
 
+class TestCreateMany(BaseDataset):
+
+    """
+        Feature: Many datasets can be created in one call
+    """
+
+    def test_create(self):
+        """ Datasets are created from a mapping, including parent groups """
+        data = {'ckpt/a/w': np.arange(6, dtype='f4').reshape((2, 3)),
+                'ckpt/a/b': np.arange(3, dtype='f4'),
+                'ckpt/b/w': np.arange(6, dtype='f4').reshape((2, 3)) + 10,
+                '/top': 5,
+                six.u('ckpt/\u03b1'): [1, 2]}
+        self.assertIsNone(self.f.create_datasets(data))
+        for name, value in data.items():
+            dset = self.f[name]
+            self.assertIsInstance(dset, Dataset)
+            self.assertTrue(np.array_equal(dset[()], value))
+            self.assertEqual(dset.dtype, np.asarray(value).dtype)
+
+    def test_pairs(self):
+        """ Pairs can be given, with options common to all datasets """
+        items = [('x%d' % idx, np.arange(100) * idx) for idx in range(5)]
+        self.f.create_datasets(items, dtype='i2', chunks=(10,),
+                               compression='gzip')
+        self.assertEqual(list(self.f), ['x%d' % idx for idx in range(5)])
+        for idx in range(5):
+            dset = self.f['x%d' % idx]
+            self.assertEqual(dset.dtype, np.dtype('i2'))
+            self.assertEqual(dset.chunks, (10,))
+            self.assertEqual(dset.compression, 'gzip')
+            self.assertArrayEqual(dset[...], np.arange(100, dtype='i2') * idx)
+
+    def test_special_types(self):
+        """ String data and empty datasets are supported """
+        dt = h5py.special_dtype(vlen=six.text_type)
+        data = {'s': np.array([six.u('a'), six.u('bc')], dtype=dt),
+                'b': np.array([b'x', b'yz'], dtype=h5py.special_dtype(vlen=bytes)),
+                'e': h5py.Empty('f')}
+        self.f.create_datasets(data)
+        self.assertEqual(list(self.f['s'][...]), [six.u('a'), six.u('bc')])
+        self.assertEqual(h5py.check_dtype(vlen=self.f['b'].dtype), bytes)
+        self.assertTrue(is_empty_dataspace(self.f['e'].id))
+
+    def test_exists(self):
+        """ Existing names can't be reused """
+        self.f['x'] = 1
+        with self.assertRaises(ValueError):
+            self.f.create_datasets({'x': 2})
+
+
+class TestCompact(BaseDataset):
+
+    """
+        Feature: Small datasets can be stored in their object headers
+    """
+
+    def layout(self, dset):
+        return dset.id.get_create_plist().get_layout()
+
+    def test_compact(self):
+        """ layout='compact' stores the data in the header """
+        dset = self.f.create_dataset('x', data=np.arange(10), layout='compact')
+        self.assertEqual(self.layout(dset), h5py.h5d.COMPACT)
+        self.assertArrayEqual(dset[...], np.arange(10))
+
+    def test_invalid(self):
+        """ Unknown layouts and compact chunked datasets are rejected """
+        with self.assertRaises(ValueError):
+            self.f.create_dataset('x', (10,), layout='chunked')
+        with self.assertRaises(ValueError):
+            self.f.create_dataset('x', (10,), layout='compact', compression='gzip')
+
+    def test_auto(self):
+        """ Files can make small fixed-size datasets compact by default """
+        with File(self.mktemp(), 'w', auto_compact_threshold=100) as f:
+            grp = f.create_group('g')
+            small = grp.create_dataset('small', data=np.arange(10, dtype='i4'))
+            big = f.create_dataset('big', data=np.arange(100, dtype='i4'))
+            chunked = f.create_dataset('chunked', (10,), maxshape=(None,))
+            vlen = f.create_dataset('vlen', data=np.array([b'a'], dtype=object),
+                                    dtype=h5py.special_dtype(vlen=bytes))
+            forced = f.create_dataset('forced', (10,), layout='contiguous')
+            f.create_datasets({'many/a': [1, 2], 'many/b': np.zeros(100)})
+
+            self.assertEqual(self.layout(small), h5py.h5d.COMPACT)
+            self.assertEqual(self.layout(big), h5py.h5d.CONTIGUOUS)
+            self.assertEqual(self.layout(chunked), h5py.h5d.CHUNKED)
+            self.assertEqual(self.layout(vlen), h5py.h5d.CONTIGUOUS)
+            self.assertEqual(self.layout(forced), h5py.h5d.CONTIGUOUS)
+            self.assertEqual(self.layout(f['many/a']), h5py.h5d.COMPACT)
+            self.assertEqual(self.layout(f['many/b']), h5py.h5d.CONTIGUOUS)
+            self.assertArrayEqual(small[...], np.arange(10, dtype='i4'))
+
+        # Other files are unaffected
+        self.assertEqual(self.layout(self.f.create_dataset('x', (1,))),
+                         h5py.h5d.CONTIGUOUS)
+
+    def test_threshold_range(self):
+        """ Thresholds beyond the size of an object header are rejected """
+        with self.assertRaises(ValueError):
+            File(self.mktemp(), 'w', auto_compact_threshold=65536)
+
+
 class TestCreateRequire(BaseDataset):
 
     """
@@ -269,6 +374,67 @@ class TestCreateFillvalue(BaseDataset):
                     dtype=[('a', 'i'), ('b', 'f')], fillvalue=42)
 
 
+class TestCreateAllocFill(BaseDataset):
+
+    """
+        Feature: Space allocation and fill times can be chosen
+    """
+
+    def test_default(self):
+        """ Chunked datasets still fill newly allocated chunks by default """
+        dset = self.f.create_dataset('x', (100,), chunks=(10,))
+        dcpl = dset.id.get_create_plist()
+        self.assertEqual(dcpl.get_fill_time(), h5py.h5d.FILL_TIME_ALLOC)
+        self.assertEqual(dcpl.get_alloc_time(), h5py.h5d.ALLOC_TIME_INCR)
+
+    def test_options(self):
+        """ alloc_time and fill_time set the creation property list """
+        dset = self.f.create_dataset('x', (100,), chunks=(10,),
+                                     alloc_time='early', fill_time='never')
+        dcpl = dset.id.get_create_plist()
+        self.assertEqual(dcpl.get_alloc_time(), h5py.h5d.ALLOC_TIME_EARLY)
+        self.assertEqual(dcpl.get_fill_time(), h5py.h5d.FILL_TIME_NEVER)
+        self.assertEqual(dset.id.get_storage_size(), 400)
+
+        dset = self.f.create_dataset('y', (100,), alloc_time='late',
+                                     fill_time='ifset', fillvalue=3)
+        dcpl = dset.id.get_create_plist()
+        self.assertEqual(dcpl.get_alloc_time(), h5py.h5d.ALLOC_TIME_LATE)
+        self.assertEqual(dcpl.get_fill_time(), h5py.h5d.FILL_TIME_IFSET)
+        self.assertEqual(dset[5], 3)
+
+    def test_invalid(self):
+        """ Unknown settings are rejected """
+        with self.assertRaises(ValueError):
+            self.f.create_dataset('x', (10,), alloc_time='soon')
+        with self.assertRaises(ValueError):
+            self.f.create_dataset('x', (10,), fill_time='always')
+
+    def test_compact(self):
+        """ Late allocation overrides automatic compact layout """
+        with File(self.mktemp(), 'w', auto_compact_threshold=1000) as f:
+            for alloc_time in ('late', 'incr'):
+                dset = f.create_dataset(alloc_time, data=np.arange(10),
+                                        alloc_time=alloc_time)
+                layout = dset.id.get_create_plist().get_layout()
+                self.assertEqual(layout, h5py.h5d.CONTIGUOUS)
+                self.assertArrayEqual(dset[...], np.arange(10))
+            f.create_datasets({'many/a': [1, 2]}, alloc_time='incr')
+            self.assertArrayEqual(f['many/a'][...], np.array([1, 2]))
+            dset = f.create_dataset('early', data=np.arange(10),
+                                    alloc_time='early')
+            layout = dset.id.get_create_plist().get_layout()
+            self.assertEqual(layout, h5py.h5d.COMPACT)
+
+    def test_compact_late(self):
+        """ Explicit compact layout can't be allocated late """
+        for alloc_time in ('late', 'incr'):
+            with self.assertRaises(ValueError):
+                self.f.create_dataset('x', (10,), layout='compact',
+                                      alloc_time=alloc_time)
+        self.assertNotIn('x', self.f)
+
+
 class TestCreateNamedType(BaseDataset):
 
     """
@@ -876,6 +1042,26 @@ class TestTrackTimes(BaseDataset):
         self.assertEqual(0, ds_mtime)
 
 
+class TestAttrStorage(BaseDataset):
+
+    """
+        Feature: Datasets can use dense attribute storage from the start
+    """
+
+    def test_dense(self):
+        """ attr_storage='dense' sets the attribute phase change """
+        ds = self.f.create_dataset('foo', (4,), attr_storage='dense')
+        self.assertEqual(ds.id.get_create_plist().get_attr_phase_change(), (0, 0))
+        for idx in range(20):
+            ds.attrs['a%d' % idx] = idx
+        self.assertEqual(ds.attrs['a13'], 13)
+
+    def test_invalid(self):
+        """ Anything else than "dense" or a pair of thresholds is rejected """
+        with self.assertRaises(ValueError):
+            self.f.create_dataset('foo', (4,), attr_storage='sparse')
+
+
 class TestZeroShape(BaseDataset):
 
     """
@@ -943,6 +1129,169 @@ class TestAstype(BaseDataset):
             self.assertTrue(np.all(dset[...] == np.arange(100)))
 
 
+class TestMemmap(BaseDataset):
+
+    """
+        Feature: Contiguous datasets can be memory-mapped
+    """
+
+    def test_read(self):
+        """ Mapped data matches the dataset """
+        data = np.arange(60, dtype='>i4').reshape((3, 20))
+        dset = self.f.create_dataset('x', data=data)
+        arr = dset.as_memmap()
+        self.assertIsInstance(arr, np.memmap)
+        self.assertEqual(arr.dtype, np.dtype('>i4'))
+        self.assertArrayEqual(arr, data)
+        with self.assertRaises(ValueError):
+            arr[0, 0] = 1
+
+    def test_compound(self):
+        """ Compound types are mapped """
+        dt = np.dtype([('a', 'i2'), ('b', 'f8')])
+        data = np.array([(1, 2.5), (3, 4.5)], dtype=dt)
+        dset = self.f.create_dataset('x', data=data)
+        self.assertTrue(np.all(dset.as_memmap() == data))
+
+    def test_write(self):
+        """ Mode r+ writes through to the dataset """
+        dset = self.f.create_dataset('x', data=np.zeros((10,), dtype='f8'))
+        arr = dset.as_memmap('r+')
+        arr[3] = 42
+        arr.flush()
+        del arr
+        fname = self.f.filename
+        self.f.close()
+        with File(fname, 'r') as f:
+            self.assertEqual(f['x'][3], 42)
+
+    def test_write_reopen(self):
+        """ Writes through the map are read by HDF5 after reopening """
+        fname = self.f.filename
+        dset = self.f.create_dataset('x', data=np.zeros((10,), dtype='f8'))
+        self.assertEqual(dset[0], 0)
+        arr = dset.as_memmap('r+')
+        arr[0] = -1
+        arr.flush()
+        del arr
+        self.f.close()
+        self.f = File(fname, 'r+')
+        self.assertEqual(self.f['x'][0], -1)
+
+    def test_userblock(self):
+        """ Offsets account for the user block """
+        fname = self.mktemp()
+        with File(fname, 'w', userblock_size=512) as f:
+            f['x'] = np.arange(10)
+        with File(fname, 'r') as f:
+            self.assertArrayEqual(f['x'].as_memmap(), np.arange(10))
+
+    def test_chunked(self):
+        """ Chunked datasets are rejected """
+        dset = self.f.create_dataset('x', (10,), chunks=(5,))
+        with self.assertRaises(ValueError):
+            dset.as_memmap()
+
+    def test_unallocated(self):
+        """ Datasets never written to are rejected """
+        dset = self.f.create_dataset('x', (10,))
+        with self.assertRaises(ValueError):
+            dset.as_memmap()
+        with File(self.mktemp(), 'w', userblock_size=1024) as f:
+            dset = f.create_dataset('x', (10,))
+            with self.assertRaises(ValueError):
+                dset.as_memmap()
+
+    def test_vlen(self):
+        """ Variable-length types are rejected """
+        dset = self.f.create_dataset('x', data=[b'a', b'bc'],
+                                     dtype=h5py.special_dtype(vlen=bytes))
+        with self.assertRaises(TypeError):
+            dset.as_memmap()
+
+    def test_driver(self):
+        """ Files not using the sec2 driver are rejected """
+        with File(self.mktemp(), 'w', driver='core', backing_store=False) as f:
+            dset = f.create_dataset('x', data=np.arange(10))
+            with self.assertRaises(ValueError):
+                dset.as_memmap()
+
+    def test_mode(self):
+        """ Mode r+ needs a writable file; unknown modes are rejected """
+        dset = self.f.create_dataset('x', data=np.arange(10))
+        with self.assertRaises(ValueError):
+            dset.as_memmap('w+')
+        fname = self.f.filename
+        self.f.close()
+        with File(fname, 'r') as f:
+            with self.assertRaises(ValueError):
+                f['x'].as_memmap('r+')
+
+
+class TestReadOut(BaseDataset):
+
+    """
+        Feature: Dataset.read fills caller-provided buffers
+    """
+
+    def setUp(self):
+        BaseDataset.setUp(self)
+        self.data = np.arange(200, dtype='i4').reshape((10, 20))
+        self.dset = self.f.create_dataset('x', data=self.data)
+
+    def test_no_out(self):
+        """ Without out, read is the same as slicing """
+        self.assertArrayEqual(self.dset.read(np.s_[2:4, ::3]), self.data[2:4, ::3])
+        self.assertArrayEqual(self.dset.read(), self.data)
+
+    def test_contiguous(self):
+        """ Contiguous arrays are filled in place, with type conversion """
+        out = np.zeros((2, 20), dtype='f8')
+        result = self.dset.read(np.s_[3:5], out=out)
+        self.assertIs(result, out)
+        self.assertArrayEqual(out, self.data[3:5].astype('f8'))
+
+    def test_strided(self):
+        """ Strided views are filled in place """
+        buf = np.zeros((10, 40), dtype='i4')
+        self.dset.read(out=buf[:, ::2])
+        self.assertArrayEqual(buf[:, ::2], self.data)
+        self.assertArrayEqual(buf[:, 1::2], np.zeros((10, 20), dtype='i4'))
+
+        # Odd-sized middle axis, so the layout can't use its full length
+        data = np.arange(120, dtype='i4').reshape((3, 4, 10))
+        dset = self.f.create_dataset('y', data=data)
+        buf = np.zeros((5, 7, 30), dtype='i4')
+        view = buf[1:4, ::2, 5:15]
+        self.assertIsNotNone(strided_mspace(view, 3))
+        dset.read(out=view)
+        expected = np.zeros((5, 7, 30), dtype='i4')
+        expected[1:4, ::2, 5:15] = data
+        self.assertArrayEqual(buf, expected)
+
+    def test_reversed(self):
+        """ Views HDF5 can't describe are still filled """
+        buf = np.zeros((10, 20), dtype='i4')
+        self.assertIsNone(strided_mspace(buf[::-1], 2))
+        self.dset.read(out=buf[::-1])
+        self.assertArrayEqual(buf, self.data[::-1])
+
+    def test_bytes(self):
+        """ Byte buffers are taken to hold the dataset's type """
+        buf = bytearray(4*20)
+        self.dset.read(np.s_[5], out=buf)
+        self.assertArrayEqual(np.frombuffer(buf, dtype='i4'), self.data[5])
+
+    def test_errors(self):
+        """ Mismatched shapes and read-only buffers are rejected """
+        with self.assertRaises(ValueError):
+            self.dset.read(np.s_[0:2], out=np.zeros((3, 20), dtype='i4'))
+        out = np.zeros((10, 20), dtype='i4')
+        out.flags.writeable = False
+        with self.assertRaises(TypeError):
+            self.dset.read(out=out)
+
+
 class TestScalarCompound(BaseDataset):
 
     """
@@ -1080,6 +1429,379 @@ class TestVlen(BaseDataset):
         self._help_float_testing(np_dt)
 
 
+class TestInternStrings(BaseDataset):
+
+    """
+        Feature: Repeated vlen strings can be read as shared objects
+    """
+
+    def setUp(self):
+        BaseDataset.setUp(self)
+        self.values = [u'alpha', u'beta', u'', u'caf\xe9']
+        data = np.array(self.values*50, dtype=object)
+        dt = h5py.special_dtype(vlen=six.text_type)
+        self.dset = self.f.create_dataset('x', data=data, dtype=dt)
+
+    def test_shared(self):
+        """ Equal strings are the same object """
+        out = self.dset.read(intern_strings=True)
+        self.assertEqual(out.tolist(), self.values*50)
+        self.assertIs(out[0], out[4])
+        self.assertIs(out[3], out[199])
+        self.assertEqual(len(set(id(x) for x in out)), 4)
+
+    def test_bytes(self):
+        """ ASCII strings are interned as bytes """
+        dt = h5py.special_dtype(vlen=bytes)
+        dset = self.f.create_dataset('y', data=[b'a', b'b', b'a'], dtype=dt)
+        out = dset.read(np.s_[:], intern_strings=True)
+        self.assertEqual(out.tolist(), [b'a', b'b', b'a'])
+        self.assertIs(out[0], out[2])
+
+    def test_mixed_cset(self):
+        """ Equal ASCII and UTF-8 strings keep their own types """
+        dt = np.dtype([('a', h5py.special_dtype(vlen=bytes)),
+                       ('u', h5py.special_dtype(vlen=six.text_type))])
+        data = np.array([(b'abc', u'abc')]*3, dtype=dt)
+        dset = self.f.create_dataset('y', data=data)
+        out = dset.read(intern_strings=True)
+        self.assertEqual(out['a'].tolist(), [b'abc']*3)
+        self.assertEqual(out['u'].tolist(), [u'abc']*3)
+        self.assertIsInstance(out[0]['u'], six.text_type)
+        self.assertIs(out[0]['u'], out[2]['u'])
+
+        # Across datasets read in one session
+        ascii = self.f.create_dataset('a', data=data['a'], dtype=dt['a'])
+        utf8 = self.f.create_dataset('u', data=data['u'], dtype=dt['u'])
+        h5py._conv.start_interning()
+        try:
+            first = ascii.read(intern_strings=True)
+            second = utf8.read(intern_strings=True)
+        finally:
+            h5py._conv.stop_interning()
+        self.assertIsInstance(first[0], bytes)
+        self.assertIsInstance(second[0], six.text_type)
+
+    def test_off(self):
+        """ Interning only applies to the read asking for it """
+        self.dset.read(intern_strings=True)
+        out = self.dset[...]
+        self.assertEqual(out.tolist(), self.values*50)
+        self.assertIsNot(out[0], out[4])
+
+
+class TestReadColumns(BaseDataset):
+
+    """
+        Feature: Compound fields are read as separate contiguous arrays
+    """
+
+    def setUp(self):
+        BaseDataset.setUp(self)
+        self.dt = np.dtype([('a', 'i4'), ('b', 'f8'), ('c', ('i2', (3,)))])
+        self.data = np.zeros((10, 4), dtype=self.dt)
+        self.data['a'] = np.arange(40).reshape((10, 4))
+        self.data['b'] = self.data['a'] / 2.0
+        self.data['c'] = np.arange(120).reshape((10, 4, 3))
+        self.dset = self.f.create_dataset('x', data=self.data)
+
+    def test_all(self):
+        """ All fields are read in order by default """
+        cols = self.dset.read_columns()
+        self.assertEqual(list(cols), ['a', 'b', 'c'])
+        for name in cols:
+            self.assertTrue(cols[name].flags.c_contiguous)
+            self.assertArrayEqual(cols[name], self.data[name])
+        self.assertEqual(cols['c'].shape, (10, 4, 3))
+
+    def test_selection(self):
+        """ Fields and selections can be given """
+        cols = self.dset.read_columns(['b', 'a'], np.s_[2:8:3, 1])
+        self.assertEqual(list(cols), ['b', 'a'])
+        self.assertArrayEqual(cols['a'], self.data['a'][2:8:3, 1])
+        self.assertTrue(cols['a'].flags.c_contiguous)
+        cols = self.dset.read_columns('a', (3, 2))
+        self.assertEqual(cols['a'], 14)
+        cols = self.dset.read_columns(['a', 'c'], (3, 2))
+        self.assertEqual(cols['a'], 14)
+        self.assertArrayEqual(cols['c'], self.data['c'][3, 2])
+
+    def test_chunked(self):
+        """ Columns of filtered datasets are read in one pass """
+        dset = self.f.create_dataset('y', data=self.data, chunks=(5, 4),
+                                     shuffle=True)
+        cols = dset.read_columns(['c', 'b'], np.s_[1:9])
+        self.assertEqual(list(cols), ['c', 'b'])
+        self.assertArrayEqual(cols['c'], self.data['c'][1:9])
+        self.assertArrayEqual(cols['b'], self.data['b'][1:9])
+        self.assertTrue(cols['c'].flags.c_contiguous)
+
+    def test_errors(self):
+        """ Unknown fields and non-compound datasets are rejected """
+        with self.assertRaises(ValueError):
+            self.dset.read_columns(['d'])
+        dset = self.f.create_dataset('y', data=np.arange(3))
+        with self.assertRaises(TypeError):
+            dset.read_columns()
+
+
+class TestDictionaryEncoding(BaseDataset):
+
+    """
+        Feature: String data can be stored as codes plus a vocabulary
+    """
+
+    def test_unicode(self):
+        """ Unicode data round-trips through the decoded reader """
+        data = np.array([u'cat', u'dog', u'', u'caf\xe9', u'dog'] * 20)
+        dset = self.f.create_dataset('x', data=data, encoding='dictionary')
+        self.assertEqual(dset.dtype, np.dtype('u1'))
+        self.assertEqual(dset.shape, (100,))
+        self.assertEqual(dset.decoded.vocabulary.tolist(),
+                         [u'', u'caf\xe9', u'cat', u'dog'])
+        out = dset.decoded[...]
+        self.assertEqual(out.dtype, np.dtype('O'))
+        self.assertEqual(out.tolist(), data.tolist())
+        self.assertEqual(dset.decoded[3], u'caf\xe9')
+        self.assertEqual(self.f['x'].decoded[5:8].tolist(),
+                         [u'cat', u'dog', u''])
+
+    def test_bytes(self):
+        """ Byte strings stay bytes, and multidimensional shapes are kept """
+        data = np.array([[b'a', b'b'], [b'b', b'c']])
+        dset = self.f.create_dataset('x', data=data, encoding='dictionary')
+        self.assertEqual(dset[...].tolist(), [[0, 1], [1, 2]])
+        self.assertEqual(dset.decoded[...].tolist(), data.tolist())
+
+    def test_vlen(self):
+        """ Object arrays of strings are encoded """
+        data = np.array([u'x', u'y', u'x'], dtype=object)
+        dset = self.f.create_dataset('x', data=data, encoding='dictionary')
+        self.assertEqual(dset.decoded[...].tolist(), [u'x', u'y', u'x'])
+
+    def test_dtype(self):
+        """ dtype sets the type of the codes """
+        data = [u'a', u'b'] * 2
+        dset = self.f.create_dataset('x', data=data, dtype='i4',
+                                     encoding='dictionary', chunks=(2,))
+        self.assertEqual(dset.dtype, np.dtype('i4'))
+        self.assertEqual(dset.chunks, (2,))
+        with self.assertRaises(ValueError):
+            self.f.create_dataset('y', data=[u'%d' % i for i in range(300)],
+                                  dtype='u1', encoding='dictionary')
+        with self.assertRaises(TypeError):
+            self.f.create_dataset('y', data=data, dtype='f4',
+                                  encoding='dictionary')
+
+    def test_large_vocabulary(self):
+        """ Vocabularies larger than a header message are stored """
+        labels = [u'label %05d' % i for i in range(5000)]
+        data = np.array(labels[::-1]*2, dtype=object)
+        dset = self.f.create_dataset('x', data=data, encoding='dictionary')
+        self.assertEqual(dset.dtype, np.dtype('u2'))
+        self.assertEqual(len(dset.decoded.vocabulary), 5000)
+        self.assertEqual(self.f['x'].decoded[...].tolist(), data.tolist())
+
+    def test_errors(self):
+        """ Encoding needs string data, and a known encoding name """
+        with self.assertRaises(TypeError):
+            self.f.create_dataset('x', data=[1, 2], encoding='dictionary')
+        with self.assertRaises(TypeError):
+            self.f.create_dataset('x', (10,), encoding='dictionary')
+        with self.assertRaises(ValueError):
+            self.f.create_dataset('x', data=[u'a'], encoding='rle')
+        dset = self.f.create_dataset('x', data=[1, 2])
+        with self.assertRaises(TypeError):
+            dset.decoded
+
+
+class TestVlenStringsBulk(BaseDataset):
+
+    """
+        Feature: Variable-length strings are read into NumPy arrays in bulk
+    """
+
+    def setUp(self):
+        BaseDataset.setUp(self)
+        self.strings = [u'a', u'', u'bc', u'caf\xe9', u'\u20ac\u20ac', u'xyz']
+        dt = h5py.special_dtype(vlen=six.text_type)
+        self.dset = self.f.create_dataset('x', (6,), dtype=dt)
+        self.dset[...] = self.strings
+
+    def test_offsets(self):
+        """ Strings are returned as bytes plus offsets """
+        data, offsets = self.dset.read_vlen_strings()
+        self.assertEqual(data.dtype, np.dtype('u1'))
+        self.assertEqual(offsets.dtype, np.dtype('i8'))
+        self.assertEqual(len(offsets), 7)
+        raw = data.tobytes()
+        for idx, expected in enumerate(self.strings):
+            value = raw[offsets[idx]:offsets[idx+1]].decode('utf8')
+            self.assertEqual(value, expected)
+
+    def test_fixed_bytes(self):
+        """ Strings are truncated into fixed-width byte strings """
+        out = self.dset.read_vlen_strings(np.s_[2:6], fixed='S3')
+        self.assertEqual(out.dtype, np.dtype('S3'))
+        self.assertEqual(list(out), [b'bc', b'caf', b'\xe2\x82\xac', b'xyz'])
+
+    def test_fixed_unicode(self):
+        """ Strings are decoded into fixed-width unicode strings """
+        out = self.dset.read_vlen_strings(fixed='U4')
+        self.assertEqual(list(out), self.strings)
+        out = self.dset.read_vlen_strings(np.s_[4], fixed='U1')
+        self.assertEqual(out, u'\u20ac')
+
+    def test_unwritten(self):
+        """ Unwritten elements read as empty strings """
+        dset = self.f.create_dataset('y', (3,), dtype=h5py.special_dtype(vlen=bytes))
+        data, offsets = dset.read_vlen_strings()
+        self.assertEqual(len(data), 0)
+        self.assertArrayEqual(offsets, np.zeros((4,), dtype='i8'))
+        self.assertEqual(list(dset.read_vlen_strings(fixed='S2')), [b'']*3)
+
+    def test_errors(self):
+        """ Only vlen string datasets and S or U types are allowed """
+        dset = self.f.create_dataset('y', (3,), dtype='S5')
+        with self.assertRaises(TypeError):
+            dset.read_vlen_strings()
+        with self.assertRaises(TypeError):
+            self.dset.read_vlen_strings(fixed='i4')
+
+
+class TestRagged(BaseDataset):
+
+    """
+        Feature: Vlen sequence datasets are read and written as ragged arrays
+    """
+
+    def setUp(self):
+        BaseDataset.setUp(self)
+        dt = h5py.special_dtype(vlen=np.dtype('f4'))
+        self.dset = self.f.create_dataset('x', (4,), dtype=dt)
+        self.rows = [np.arange(n, dtype='f4') + n for n in (3, 0, 1, 5)]
+        for idx, row in enumerate(self.rows):
+            self.dset[idx] = row
+
+    def test_read(self):
+        """ Rows come back as offsets into one values array """
+        offsets, values = self.dset.read_ragged()
+        self.assertArrayEqual(offsets, np.array([0, 3, 3, 4, 9], dtype='i8'))
+        self.assertArrayEqual(values, np.concatenate(self.rows))
+
+        offsets, values = self.dset.read_ragged(np.s_[2:])
+        self.assertArrayEqual(offsets, np.array([0, 1, 6], dtype='i8'))
+        self.assertArrayEqual(values, np.concatenate(self.rows[2:]))
+
+    def test_write(self):
+        """ Ragged arrays are written, with type conversion """
+        values = np.arange(6, dtype='i8')
+        self.dset.write_ragged([0, 2, 2, 5, 6], values)
+        self.assertArrayEqual(self.dset[0], np.array([0, 1], dtype='f4'))
+        self.assertEqual(len(self.dset[1]), 0)
+        self.assertArrayEqual(self.dset[3], np.array([5], dtype='f4'))
+
+        self.dset.write_ragged([0, 1], [42], np.s_[1])
+        self.assertArrayEqual(self.dset[1], np.array([42], dtype='f4'))
+
+    def test_errors(self):
+        """ Bad offsets and non-sequence datasets are rejected """
+        with self.assertRaises(ValueError):
+            self.dset.write_ragged([0, 1, 2], np.arange(2))
+        with self.assertRaises(ValueError):
+            self.dset.write_ragged([0, 2, 1, 3, 4], np.arange(4))
+        with self.assertRaises(ValueError):
+            self.dset.write_ragged([0, 1, 2, 3, 5], np.arange(4))
+        dset = self.f.create_dataset('y', (4,), dtype='f4')
+        with self.assertRaises(TypeError):
+            dset.read_ragged()
+        dset = self.f.create_dataset('z', (4,), dtype=h5py.special_dtype(vlen=bytes))
+        with self.assertRaises(TypeError):
+            dset.read_ragged()
+
+
+class TestConvStrips(BaseDataset):
+
+    """
+        Feature: Converted reads and writes are done in bounded strips
+    """
+
+    def setUp(self):
+        BaseDataset.setUp(self)
+        cfg = h5py.get_config()
+        self.addCleanup(setattr, cfg, 'conv_buffer_size', cfg.conv_buffer_size)
+        # Room for a few vlen elements per strip
+        cfg.conv_buffer_size = 64
+
+        self.strings = np.array([u'item %d' % n * (n % 4) for n in range(300)],
+                                dtype=object).reshape((30, 10))
+        dt = h5py.special_dtype(vlen=six.text_type)
+        self.dset = self.f.create_dataset('x', (30, 10), dtype=dt)
+        self.dset[...] = self.strings
+
+    def test_read(self):
+        """ Strided selections read the same as without strips """
+        for key in (Ellipsis, np.s_[3:25:3, 1::2], np.s_[:, 4], np.s_[7]):
+            out = self.dset[key]
+            self.assertEqual(out.tolist(), self.strings[key].tolist())
+
+    def test_write(self):
+        """ Strips are written in the right order """
+        new = np.array([u'new %d' % n for n in range(50)],
+                       dtype=object).reshape((10, 5))
+        self.dset[5:25:2, ::2] = new
+        self.strings[5:25:2, ::2] = new
+        h5py.get_config().conv_buffer_size = 0
+        self.assertEqual(self.dset[...].tolist(), self.strings.tolist())
+
+    def test_compound(self):
+        """ Compound types needing a background buffer """
+        dt = np.dtype([('a', 'i4'), ('b', h5py.special_dtype(vlen=bytes))])
+        data = np.array([(n, b'x' * n) for n in range(100)], dtype=dt)
+        dset = self.f.create_dataset('y', data=data)
+        out = dset[10:90:3]
+        self.assertEqual(out['a'].tolist(), data['a'][10:90:3].tolist())
+        self.assertEqual(out['b'].tolist(), data['b'][10:90:3].tolist())
+        self.assertEqual(dset['b'][5:8].tolist(), [b'xxxxx', b'x'*6, b'x'*7])
+
+
+class TestProxyCopy(BaseDataset):
+
+    """
+        Feature: Converted data is copied to and from memory selections
+    """
+
+    def setUp(self):
+        BaseDataset.setUp(self)
+        dt = h5py.special_dtype(vlen=bytes)
+        self.data = np.array([b'%d' % n for n in range(12)],
+                             dtype=object).reshape((3, 4))
+        self.dset = self.f.create_dataset('x', data=self.data, dtype=dt)
+
+    def test_read_hyperslab(self):
+        """ Reads into a strided memory selection """
+        out = np.zeros((7, 10), dtype=object)
+        self.dset.read_direct(out, dest_sel=np.s_[1:6:2, 2:10:2])
+        expected = np.zeros((7, 10), dtype=object)
+        expected[1:6:2, 2:10:2] = self.data
+        self.assertEqual(out.tolist(), expected.tolist())
+
+    def test_write_hyperslab(self):
+        """ Writes from a strided memory selection """
+        src = np.zeros((3, 8), dtype=object)
+        src[:, 1::2] = np.array([b'w%d' % n for n in range(12)]).reshape((3, 4))
+        self.dset.write_direct(src, source_sel=np.s_[:, 1::2])
+        self.assertEqual(self.dset[...].tolist(), src[:, 1::2].tolist())
+
+    def test_points(self):
+        """ Point selections still work """
+        out = np.zeros((3, 4), dtype=object)
+        mask = np.zeros((3, 4), dtype=bool)
+        mask[0, 1] = mask[2, 3] = True
+        self.dset.read_direct(out, dest_sel=mask, source_sel=np.s_[0, :2])
+        self.assertEqual(out[mask].tolist(), [b'0', b'1'])
+
+
 class TestLowOpen(BaseDataset):
 
     def test_get_access_list(self):
@@ -297,6 +297,53 @@ class TestLibver(TestCase):
         self.assertEqual(f.libver, ('earliest', 'latest'))
         f.close()
 
+class TestAccessTuning(TestCase):
+
+    """
+        Feature: Alignment and block sizes can be specified when opening
+        a file.
+    """
+
+    def test_alignment(self):
+        """ Alignment is applied to the file access property list """
+        fname = self.mktemp()
+        with File(fname, 'w', alignment=(1024, 4096)) as f:
+            fapl = f.id.get_access_plist()
+            self.assertEqual(fapl.get_alignment(), (1024, 4096))
+            dset = f.create_dataset('x', (10000,), dtype='i1')
+            dset[...] = 1
+            self.assertEqual(dset.id.get_offset() % 4096, 0)
+
+    def test_block_sizes(self):
+        """ Sieve buffer, metadata and small data block sizes """
+        with File(self.mktemp(), 'w', sieve_buf_size=1024*1024,
+                  meta_block_size=8192, small_data_block_size=4096) as f:
+            fapl = f.id.get_access_plist()
+            self.assertEqual(fapl.get_sieve_buf_size(), 1024*1024)
+            self.assertEqual(fapl.get_meta_block_size(), 8192)
+            self.assertEqual(fapl.get_small_data_block_size(), 4096)
+
+    def test_invalid(self):
+        """ Invalid tuning options are rejected """
+        fname = self.mktemp()
+        with self.assertRaises(TypeError):
+            File(fname, 'w', alignment=4096)
+        with self.assertRaises(ValueError):
+            File(fname, 'w', alignment=(0, 0))
+        with self.assertRaises(ValueError):
+            File(fname, 'w', sieve_buf_size=-1)
+        with self.assertRaises(TypeError):
+            File(fname, 'w', meta_block_size='big')
+
+    def test_driver_kwds(self):
+        """ Tuning options can be combined with driver keywords """
+        with File(self.mktemp(), 'w', driver='core', backing_store=False,
+                  meta_block_size=4096) as f:
+            self.assertEqual(f.driver, 'core')
+            fapl = f.id.get_access_plist()
+            self.assertEqual(fapl.get_meta_block_size(), 4096)
+
+
 class TestUserblock(TestCase):
 
     """
@@ -553,6 +600,81 @@ class TestCloseInvalidatesOpenObjectIDs(TestCase):
             self.assertFalse(bool(f1.id))
             self.assertFalse(bool(g1.id))
 
+class TestObjectCache(TestCase):
+
+    """
+        Feature: Files opened with object_cache reuse opened objects
+    """
+
+    def setUp(self):
+        self.f = File(self.mktemp(), 'w', object_cache=2)
+        self.f.create_dataset('entry/data/data', data=[1, 2, 3])
+        self.f.create_dataset('entry/other', data=[4])
+
+    def tearDown(self):
+        if self.f:
+            self.f.close()
+
+    def test_reuse(self):
+        """ Repeated lookups of a path return the same object """
+        dset = self.f['entry/data/data']
+        self.assertIs(self.f['/entry//data/./data'], dset)
+        self.assertIs(self.f[b'entry/data/data'], dset)
+        self.assertIn('entry/data/data', self.f.object_cache)
+        self.assertEqual(len(self.f.object_cache), 1)
+
+    def test_disabled(self):
+        """ The cache is off by default """
+        with File(self.mktemp(), 'w') as f:
+            f['x'] = 1
+            self.assertIsNone(f.object_cache)
+            self.assertIsNot(f['x'], f['x'])
+
+    def test_lru(self):
+        """ Least recently used objects are dropped first """
+        data = self.f['entry/data/data']
+        self.f['entry']
+        self.f['entry/data/data']
+        self.f['entry/other']
+        self.assertEqual(len(self.f.object_cache), 2)
+        self.assertNotIn('entry', self.f.object_cache)
+        self.assertIs(self.f['entry/data/data'], data)
+
+    def test_delete(self):
+        """ Deleting a link anywhere in the file empties the cache """
+        self.f['entry/data/data']
+        del self.f['entry']['data']
+        self.assertEqual(len(self.f.object_cache), 0)
+        with self.assertRaises(KeyError):
+            self.f['entry/data/data']
+
+    def test_move(self):
+        """ Moving a link empties the cache """
+        self.f['entry/other']
+        self.f['entry'].move('other', 'moved')
+        self.assertEqual(len(self.f.object_cache), 0)
+        self.assertNotIn('entry/other', self.f)
+        self.assertEqual(self.f['entry/moved'][0], 4)
+
+    def test_closed_object(self):
+        """ Objects closed elsewhere are reopened """
+        dset = self.f['entry/other']
+        dset.id._close()
+        self.assertEqual(self.f['entry/other'][0], 4)
+
+    def test_close(self):
+        """ Closing the file empties the cache """
+        self.f['entry/other']
+        cache = self.f.object_cache
+        self.f.close()
+        self.assertEqual(len(cache), 0)
+
+    def test_size(self):
+        """ The cache size must be a non-negative integer """
+        with self.assertRaises(ValueError):
+            File(self.mktemp(), 'w', object_cache=-1)
+
+
 @ut.skipIf(pathlib is None, "pathlib module not installed")
 class TestPathlibSupport(TestCase):
 
@@ -104,6 +104,31 @@ class TestCreate(BaseGroup):
         self.assertEqual(group.name, name)
         self.assertEqual(group.id.links.get_info(name.encode('utf8')).cset, h5t.CSET_ASCII)
 
+    def test_link_storage(self):
+        """ Groups can use dense link storage from the start """
+        with File(self.mktemp(), 'w', libver='latest') as f:
+            grp = f.create_group('foo', link_storage='dense', estimated_links=100)
+            gcpl = grp.id.get_create_plist()
+            self.assertEqual(gcpl.get_link_phase_change(), (0, 0))
+            self.assertEqual(gcpl.get_est_link_info()[0], 100)
+            for idx in range(20):
+                grp[str(idx)] = idx
+            self.assertEqual(len(grp), 20)
+            self.assertEqual(grp['7'][()], 7)
+
+    def test_attr_storage(self):
+        """ Thresholds for attribute storage can be given """
+        with File(self.mktemp(), 'w', libver='latest') as f:
+            grp = f.create_group('foo', attr_storage=(4, 2))
+            self.assertEqual(grp.id.get_create_plist().get_attr_phase_change(), (4, 2))
+
+    def test_storage_invalid(self):
+        """ Storage settings other than "dense" or valid thresholds fail """
+        with self.assertRaises(ValueError):
+            self.f.create_group('bar', link_storage='compact')
+        with self.assertRaises(ValueError):
+            self.f.create_group('bar', link_storage=(2, 4))
+
     def test_appropriate_low_level_id(self):
         " Binding a group to a non-group identifier fails with ValueError "
         dset = self.f.create_dataset('foo', [1])
@@ -160,6 +185,54 @@ class TestRequire(BaseGroup):
         with self.assertRaises(TypeError):
             self.f.require_group('foo')
 
+class TestRequireGroups(BaseGroup):
+
+    """
+        Feature: Many groups can be required, or tested for, in one call
+    """
+
+    def test_create(self):
+        """ Missing groups, including intermediates, are created """
+        existing = self.f.create_group('a/b')
+        paths = ['a/b/c', 'x', '/a/b', u'a/b/\u03b1', 'a//b/./d', 'a/b/c']
+        groups = self.f.require_groups(paths)
+        self.assertEqual([g.name for g in groups],
+                         ['/a/b/c', '/x', '/a/b', u'/a/b/\u03b1', '/a/b/d', '/a/b/c'])
+        self.assertEqual(groups[2], existing)
+        self.assertIsInstance(groups[0], Group)
+
+    def test_relative(self):
+        """ Relative paths start from the group """
+        grp = self.f.create_group('base')
+        groups = grp.require_groups(['x/y', '/z'])
+        self.assertEqual([g.name for g in groups], ['/base/x/y', '/z'])
+
+    def test_conflict(self):
+        """ Non-group objects along a path result in TypeError """
+        self.f.create_dataset('a/data', (1,), 'f')
+        with self.assertRaises(TypeError):
+            self.f.require_groups(['a/b', 'a/data'])
+        with self.assertRaises(TypeError):
+            self.f.require_groups(['a/data/b'])
+
+    def test_empty(self):
+        """ Empty names are rejected """
+        with self.assertRaises(ValueError):
+            self.f.require_groups([''])
+
+    def test_exists_many(self):
+        """ Results match the "in" operator """
+        self.f.create_group('a/b')
+        self.f.create_dataset('a/data', (1,), 'f')
+        self.f['a/soft'] = SoftLink('/missing')
+        paths = ['a', 'a/b', '/a/b/', 'a/c', 'a/data', 'a/data/x', 'a/soft',
+                 'a/soft/x', 'q/r', '/', '.', '', 'a/./b', 'a/b/.', 'a/b/./',
+                 'a/data/.', 'a/soft/.', 'a/c/.', './a', '/.']
+        self.assertEqual(self.f.exists_many(paths),
+                         [name in self.f for name in paths])
+        self.assertEqual(self.f['a'].exists_many(x for x in ['b', 'c']),
+                         [True, False])
+
 class TestDelete(BaseGroup):
 
     """
@@ -395,6 +468,54 @@ class TestIter(BaseMapping):
         finally:
             hfile.close()
 
+class TestTrackOrder(BaseGroup):
+
+    """
+        Feature: Groups can track the creation order of their members
+    """
+
+    names = ['c', 'a', 'd', 'b']
+
+    def populate(self, grp):
+        for idx, name in enumerate(self.names):
+            grp[name] = idx
+
+    def test_iter(self):
+        """ Members are iterated in creation order """
+        grp = self.f.create_group('tracked', track_order=True)
+        self.populate(grp)
+        self.assertEqual(list(grp), self.names)
+        self.assertEqual(list(grp.keys()), self.names)
+
+    def test_untracked(self):
+        """ Small untracked groups iterate in name order """
+        grp = self.f.create_group('untracked')
+        self.populate(grp)
+        self.assertEqual(list(grp), sorted(self.names))
+
+    def test_get_by_index(self):
+        """ Members can be opened by position """
+        grp = self.f.create_group('tracked', track_order=True)
+        self.populate(grp)
+        self.assertEqual(grp.get_by_index(1).name, '/tracked/a')
+        self.assertEqual(grp.get_by_index(-1)[()], 3)
+        with self.assertRaises(IndexError):
+            grp.get_by_index(4)
+
+    def test_get_by_index_untracked(self):
+        """ Positions in other groups follow name order """
+        grp = self.f.create_group('untracked')
+        self.populate(grp)
+        self.assertEqual(grp.get_by_index(0).name, '/untracked/a')
+
+    def test_file(self):
+        """ The root group of a new file can track order """
+        with File(self.mktemp(), 'w', track_order=True) as f:
+            self.populate(f)
+            self.assertEqual(list(f), self.names)
+            self.assertEqual(f.get_by_index(2).name, '/d')
+
+
 @ut.skipIf(sys.version_info[0] != 2, "Py2")
 class TestPy2Dict(BaseMapping):
 
@@ -614,6 +735,90 @@ class TestGet(BaseGroup):
         self.assertEqual(out_el._path, el._path)
         self.assertEqual(out_el._filename, el._filename)
 
+class TestEntries(BaseGroup):
+
+    """
+        Feature: Group members are listed without being opened
+    """
+
+    def test_entries(self):
+        """ Links and objects are described """
+        self.f.create_group('a')
+        self.f['b'] = np.arange(3)
+        self.f['b'].attrs['x'] = 1
+        self.f['b'].attrs['y'] = 2
+        self.f['c'] = np.dtype('f4')
+        self.f['d'] = SoftLink('/b')
+        self.f['e'] = ExternalLink('missing.hdf5', '/')
+        entries = self.f.entries()
+        self.assertEqual([e.name for e in entries], ['a', 'b', 'c', 'd', 'e'])
+        self.assertEqual([e.linktype for e in entries],
+                         [HardLink, HardLink, HardLink, SoftLink, ExternalLink])
+        self.assertEqual([e.objtype for e in entries],
+                         [Group, Dataset, Datatype, None, None])
+        self.assertEqual(entries[1].num_attrs, 2)
+        self.assertEqual(entries[0].num_attrs, 0)
+        self.assertEqual(entries[1].addr, h5py.h5o.get_info(self.f['b'].id).addr)
+        self.assertIsNone(entries[3].addr)
+
+    def test_empty(self):
+        """ Empty groups have no entries """
+        self.assertEqual(self.f.create_group('x').entries(), [])
+
+
+class TestCatalog(BaseGroup):
+
+    """
+        Feature: All objects in a file are described in one pass
+    """
+
+    def setUp(self):
+        BaseGroup.setUp(self)
+        grp = self.f.create_group('a')
+        grp.attrs['x'] = 1
+        grp.create_dataset('b', (10, 4), dtype='i2', chunks=(5, 2),
+                           compression='gzip')
+        self.f['t'] = np.dtype('f4')
+        self.f['c'] = np.arange(3)
+        self.f['hard'] = self.f['c']
+        self.f['soft'] = SoftLink('/c')
+
+    def test_default(self):
+        """ Default columns """
+        cat = self.f.catalog()
+        self.assertEqual(list(cat), ['name', 'objtype', 'addr', 'num_attrs',
+                                     'shape', 'dtype', 'chunks', 'filters',
+                                     'attrs'])
+        self.assertEqual(sorted(cat['name']), ['a', 'a/b', 'c', 't'])
+        rows = dict((name, i) for i, name in enumerate(cat['name']))
+        b, t, a = rows['a/b'], rows['t'], rows['a']
+        self.assertIs(cat['objtype'][b], Dataset)
+        self.assertIs(cat['objtype'][a], Group)
+        self.assertIs(cat['objtype'][t], Datatype)
+        self.assertEqual(cat['shape'][b], (10, 4))
+        self.assertEqual(cat['dtype'][b], np.dtype('i2'))
+        self.assertEqual(cat['dtype'][t], np.dtype('f4'))
+        self.assertEqual(cat['chunks'][b], (5, 2))
+        self.assertEqual(cat['filters'][b]['gzip'], 4)
+        self.assertEqual(cat['num_attrs'][a], 1)
+        self.assertIsNone(cat['shape'][a])
+        self.assertIsNone(cat['chunks'][rows['c']])
+        self.assertEqual(cat['attrs'][a], {'x': 1})
+        self.assertEqual(cat['attrs'][b], {})
+
+    def test_include(self):
+        """ Columns are chosen with include """
+        cat = self.f['a'].catalog(include=['attrs'])
+        self.assertEqual(list(cat), ['name', 'objtype', 'addr', 'num_attrs',
+                                     'attrs'])
+        self.assertEqual(cat['name'], ['b'])
+        self.assertEqual(cat['attrs'], [{}])
+        cat = self.f.catalog(include=('attrs',))
+        self.assertEqual(cat['attrs'][cat['name'].index('a')], {'x': 1})
+        with self.assertRaises(ValueError):
+            self.f.catalog(include=('size',))
+
+
 class TestVisit(TestCase):
 
     """
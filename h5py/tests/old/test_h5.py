@@ -45,6 +45,16 @@ class TestH5(ut.TestCase):
             cfg.complex_names = ('q','i','v')
         self.assertEqual(cfg.complex_names, ('r','i'))
 
+    def test_conv_buffer_size(self):
+        cfg = h5.get_config()
+        old = cfg.conv_buffer_size
+        self.addCleanup(setattr, cfg, 'conv_buffer_size', old)
+        self.assertEqual(old, 8*1024*1024)
+        cfg.conv_buffer_size = 0
+        self.assertEqual(cfg.conv_buffer_size, 0)
+        with self.assertRaises(ValueError):
+            cfg.conv_buffer_size = -1
+
     def test_repr(self):
         cfg = h5.get_config()
         repr(cfg)
@@ -66,6 +66,16 @@ class TestFA(ut.TestCase):
         self.assertEqual((threshold, alignment),
                          falist.get_alignment())
 
+    def test_block_sizes(self):
+        '''test get/set metadata and small data block sizes '''
+        falist = h5p.create(h5p.FILE_ACCESS)
+
+        falist.set_meta_block_size(8192)
+        self.assertEqual(8192, falist.get_meta_block_size())
+
+        falist.set_small_data_block_size(4096)
+        self.assertEqual(4096, falist.get_small_data_block_size())
+
 
 class TestPL(ut.TestCase):
     def test_obj_track_times(self):
@@ -113,3 +123,32 @@ class TestPL(ut.TestCase):
         fcpl.set_link_creation_order(flags)
         self.assertEqual(flags, fcpl.get_link_creation_order())
 
+
+    def test_link_phase_change(self):
+        """
+        tests the link storage thresholds and size estimates set/get
+        """
+        gcid = h5p.create(h5p.GROUP_CREATE)
+        gcid.set_link_phase_change(16, 10)
+        self.assertEqual((16, 10), gcid.get_link_phase_change())
+
+        gcid.set_est_link_info(1000, 12)
+        self.assertEqual((1000, 12), gcid.get_est_link_info())
+
+    def test_attr_phase_change(self):
+        """
+        tests the attribute storage thresholds set/get
+        """
+        for plist in (h5p.create(h5p.DATASET_CREATE),
+                      h5p.create(h5p.GROUP_CREATE)):
+            plist.set_attr_phase_change(0, 0)
+            self.assertEqual((0, 0), plist.get_attr_phase_change())
+
+    def test_attr_creation_order(self):
+        """
+        tests the attribute creation order flags set/get
+        """
+        flags = h5p.CRT_ORDER_TRACKED | h5p.CRT_ORDER_INDEXED
+        dcid = h5p.create(h5p.DATASET_CREATE)
+        dcid.set_attr_creation_order(flags)
+        self.assertEqual(flags, dcid.get_attr_creation_order())
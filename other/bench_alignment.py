@@ -0,0 +1,62 @@
+# This file is part of h5py, a Python interface to the HDF5 library.
+#
+# http://www.h5py.org
+#
+# Copyright 2008-2013 Andrew Collette and contributors
+#
+# License:  Standard 3-clause BSD; see "license.txt" for full license terms
+#           and contributor agreement.
+
+"""
+    Compares chunked write throughput with and without file alignment.
+
+    Usage: python bench_alignment.py [directory]
+
+    Point the directory at the filesystem you care about; the effect of
+    alignment is small on local disks and large on striped parallel
+    filesystems.
+"""
+
+import os
+import sys
+import time
+import tempfile
+
+import numpy as np
+
+import h5py
+
+NCHUNKS = 256
+CHUNK = (256, 1024)     # 1 MiB of float32 per chunk
+ALIGN = 1024*1024
+
+CONFIGS = [
+    ("default", {}),
+    ("aligned", dict(alignment=(64*1024, ALIGN))),
+    ("aligned + sieve", dict(alignment=(64*1024, ALIGN),
+                             sieve_buf_size=ALIGN,
+                             meta_block_size=ALIGN)),
+]
+
+
+def bench(dirname, name, kwds):
+    fname = os.path.join(dirname, 'bench_alignment.hdf5')
+    data = np.random.random(CHUNK).astype('f4')
+    shape = (CHUNK[0]*NCHUNKS, CHUNK[1])
+
+    start = time.time()
+    with h5py.File(fname, 'w', **kwds) as f:
+        dset = f.create_dataset('data', shape, dtype='f4', chunks=CHUNK)
+        for idx in range(NCHUNKS):
+            dset[idx*CHUNK[0]:(idx+1)*CHUNK[0]] = data
+    elapsed = time.time() - start
+
+    nbytes = data.nbytes*NCHUNKS
+    print("%-16s %8.3f s  %8.1f MB/s" % (name, elapsed, nbytes/elapsed/1e6))
+    os.unlink(fname)
+
+
+if __name__ == '__main__':
+    dirname = sys.argv[1] if len(sys.argv) > 1 else tempfile.gettempdir()
+    for name, kwds in CONFIGS:
+        bench(dirname, name, kwds)
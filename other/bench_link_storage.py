@@ -0,0 +1,78 @@
+# This file is part of h5py, a Python interface to the HDF5 library.
+#
+# http://www.h5py.org
+#
+# Copyright 2008-2013 Andrew Collette and contributors
+#
+# License:  Standard 3-clause BSD; see "license.txt" for full license terms
+#           and contributor agreement.
+
+"""
+    Compares link insertion and lookup in groups with 10k and 100k members,
+    for each way of storing the links.
+
+    Usage: python bench_link_storage.py [directory]
+
+    Links are hard links to a single dataset, inserted with h5o.link and
+    looked up with links.exists, so the times are those of the group's link
+    storage rather than of object creation.
+"""
+
+import os
+import sys
+import time
+import shutil
+import tempfile
+
+import h5py
+from h5py import h5o
+
+SIZES = (10000, 100000)
+LOOKUPS = 10000
+
+# (description, File keywords, create_group keywords)
+CASES = [
+    ("earliest (B-tree)", {}, {}),
+    ("latest, default", {'libver': 'latest'}, {}),
+    ("latest, dense", {'libver': 'latest'}, {'link_storage': 'dense'}),
+    ("latest, dense + estimated",
+     {'libver': 'latest'}, {'link_storage': 'dense', 'estimated_links': None}),
+    ("latest, compact",
+     {'libver': 'latest'}, {'link_storage': (65535, 65534)}),
+]
+
+
+def bench(dirname, name, nlinks, fkwds, gkwds):
+    if 'estimated_links' in gkwds:
+        gkwds = dict(gkwds, estimated_links=nlinks)
+    fname = os.path.join(dirname, 'links.h5')
+    names = [('link_%08d' % idx).encode('ascii') for idx in range(nlinks)]
+    with h5py.File(fname, 'w', **fkwds) as f:
+        target = f.create_dataset('target', (1,)).id
+        gid = f.create_group('grp', **gkwds).id
+
+        start = time.time()
+        for lname in names:
+            h5o.link(target, gid, lname)
+        insert = time.time() - start
+
+        step = max(nlinks // LOOKUPS, 1)
+        sample = names[::step]
+        start = time.time()
+        for lname in sample:
+            gid.links.exists(lname)
+        lookup = (time.time() - start)/len(sample)
+    os.remove(fname)
+    print("%-28s %7d links   insert %8.3f s   lookup %6.2f us"
+          % (name, nlinks, insert, lookup*1e6))
+
+
+if __name__ == '__main__':
+    parent = sys.argv[1] if len(sys.argv) > 1 else tempfile.gettempdir()
+    dirname = tempfile.mkdtemp(dir=parent)
+    try:
+        for nlinks in SIZES:
+            for name, fkwds, gkwds in CASES:
+                bench(dirname, name, nlinks, fkwds, gkwds)
+    finally:
+        shutil.rmtree(dirname)
@@ -0,0 +1,80 @@
+# This file is part of h5py, a Python interface to the HDF5 library.
+#
+# http://www.h5py.org
+#
+# Copyright 2008-2013 Andrew Collette and contributors
+#
+# License:  Standard 3-clause BSD; see "license.txt" for full license terms
+#           and contributor agreement.
+
+"""
+    Compares reads from a virtual dataset over 100 source files, using the
+    high-level reader and the HDF5 library's own mapping.
+
+    Usage: python bench_vds.py [directory]
+
+    Each source holds one frame of the virtual dataset; the benchmark reads
+    single frames, a region crossing every frame, and an unmapped area.
+"""
+
+import os
+import sys
+import time
+import shutil
+import tempfile
+
+import numpy as np
+
+import h5py
+from h5py import h5s
+
+NSOURCES = 100
+FRAME = (256, 256)
+REPEAT = 20
+
+
+def make_vds(dirname):
+    layout = h5py.VirtualLayout((NSOURCES + 10,) + FRAME, 'f4')
+    for idx in range(NSOURCES):
+        fname = os.path.join(dirname, 'source_%d.h5' % idx)
+        with h5py.File(fname, 'w') as f:
+            f['data'] = np.random.random(FRAME).astype('f4')
+        layout[idx] = h5py.VirtualSource(fname, 'data', shape=FRAME)
+    fname = os.path.join(dirname, 'vds.h5')
+    with h5py.File(fname, 'w') as f:
+        f.create_virtual_dataset('data', layout, fillvalue=-1)
+    return fname
+
+
+def library_read(dset, key):
+    """ Read through H5Dread and the library's mapping only """
+    selection = h5py._hl.selections.select(dset.shape, key, dsid=dset.id)
+    out = np.empty(selection.mshape, dtype=dset.dtype)
+    mspace = h5s.create_simple(selection.mshape)
+    dset.id.read(mspace, selection.id, out)
+    return out
+
+
+def bench(fname, name, key):
+    times = []
+    for reader in (library_read, lambda dset, key: dset[key]):
+        # Reopen every time, so neither side keeps sources open
+        start = time.time()
+        for _ in range(REPEAT):
+            with h5py.File(fname, 'r') as f:
+                reader(f['data'], key)
+        times.append((time.time() - start)/REPEAT)
+    print("%-16s library %8.2f ms   h5py %8.2f ms" % (name, times[0]*1e3, times[1]*1e3))
+
+
+if __name__ == '__main__':
+    parent = sys.argv[1] if len(sys.argv) > 1 else tempfile.gettempdir()
+    dirname = tempfile.mkdtemp(dir=parent)
+    try:
+        fname = make_vds(dirname)
+        bench(fname, "one frame", np.s_[50])
+        bench(fname, "all frames", np.s_[:, 100:110, 100:110])
+        bench(fname, "unmapped", np.s_[NSOURCES:])
+        bench(fname, "everything", np.s_[...])
+    finally:
+        shutil.rmtree(dirname)